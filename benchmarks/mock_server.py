@@ -0,0 +1,156 @@
+"""Local stand-in for the Cobo API used by the benchmarks.
+
+Answers every GET and POST with a JSON body signed like the real API does:
+``BIZ_RESP_SIGNATURE`` is the signature of ``body|BIZ_TIMESTAMP`` with a
+throwaway key, whose public key is the ``coboPub`` of ``server.env``.
+Bodies are signed once per path and reused, so the server spends as little
+CPU as possible next to the client being measured.
+
+    python benchmarks/mock_server.py --port 8000 --records 50
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict
+from urllib.parse import urlparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from cobo_custody.config import Env
+from cobo_custody.signer.local_signer import LocalSigner, generate_new_key
+
+COIN_INFO = {"coin": "ETH", "display_code": "ETH", "description": "Ethereum", "decimal": 18,
+             "can_deposit": True, "can_withdraw": True, "balance": "1000000000000000000",
+             "abs_balance": "1", "fee_coin": "ETH", "abs_estimate_fee": "0.0005",
+             "confirming_threshold": 12, "dust_threshold": 1, "token_address": "",
+             "require_memo": False}
+
+
+def transactions_result(count: int) -> dict:
+    """A ``transactions`` page of ``count`` records, for decode heavy runs."""
+    return {"transactions": [{
+        "id": str(100000000 + index), "coin": "ETH", "display_code": "ETH", "description": "Ethereum",
+        "decimal": 18, "address": "0x%040x" % index, "source_address": "0x%040x" % (index + 1),
+        "side": "deposit", "amount": "1500000000000000000", "abs_amount": "1.5", "txid": "0x%064x" % index,
+        "vout_n": 0, "request_id": f"req-{index}", "status": "success", "abs_cobo_fee": "0",
+        "created_time": 1700000000000 + index, "last_time": 1700000000000 + index,
+        "confirmed_num": 12, "tx_detail": {"txid": "0x%064x" % index, "blocknum": 18000000 + index},
+        "source_address_detail": "", "memo": "", "confirming_threshold": 12, "fee_coin": "ETH",
+        "fee_amount": 0, "fee_decimal": 18, "type": "external",
+    } for index in range(count)]}
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    # the default listen backlog of 5 drops SYNs once a benchmark opens more concurrent connections than
+    # that, and the retransmitted SYNs show up as ~1s client latencies
+    request_queue_size = 128
+    daemon_threads = True
+
+
+class MockCoboServer(object):
+    """Threaded HTTP server on localhost answering ``results[path]`` or ``default_result``."""
+
+    def __init__(self, results: Dict[str, dict] = None, default_result: dict = None, port: int = 0):
+        secret, self.cobo_pub = generate_new_key()
+        self.signer = LocalSigner(secret)
+        self.results = results or {}
+        self.default_result = COIN_INFO if default_result is None else default_result
+        self.requests = 0
+        self._signed: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        self._server = _HTTPServer(("127.0.0.1", port), self._handler_class())
+        self._thread = None
+
+    @property
+    def host(self) -> str:
+        return "http://127.0.0.1:%d" % self._server.server_address[1]
+
+    @property
+    def env(self) -> Env:
+        return Env(host=self.host, coboPub=self.cobo_pub)
+
+    def signed_body(self, path: str) -> tuple:
+        with self._lock:
+            self.requests += 1
+            signed = self._signed.get(path)
+        if signed is None:
+            body = json.dumps({"success": True, "result": self.results.get(path, self.default_result)}).encode()
+            timestamp = str(int(time.time() * 1000))
+            signed = (body, timestamp, self.signer.sign(f"{body.decode()}|{timestamp}"))
+            with self._lock:
+                self._signed[path] = signed
+        return signed
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # headers and body are written separately, do not let Nagle hold back the body
+            disable_nagle_algorithm = True
+
+            def _answer(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                if length:
+                    self.rfile.read(length)
+                body, timestamp, signature = server.signed_body(urlparse(self.path).path)
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("BIZ_TIMESTAMP", timestamp)
+                self.send_header("BIZ_RESP_SIGNATURE", signature)
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = _answer
+            do_POST = _answer
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def start(self) -> "MockCoboServer":
+        self._thread = threading.Thread(target=self.serve_forever, name="mock-cobo-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--records", type=int, default=0,
+                        help="answer with a page of this many transactions instead of a coin_info result")
+    args = parser.parse_args()
+
+    server = MockCoboServer(default_result=transactions_result(args.records) if args.records else None,
+                            port=args.port)
+    # the first line tells a parent process where to connect and which key to trust
+    print(server.host, server.cobo_pub, flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
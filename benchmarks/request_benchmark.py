@@ -0,0 +1,214 @@
+"""Benchmark the SDK request path against a local mock Cobo server.
+
+Measures throughput and p50/p99 latency of ``Client.request`` under
+sequential, threaded and asyncio load, and the speed of the CPU bound steps
+of the pipeline on their own: signing, response verification, param
+canonicalization and JSON decoding.  The mock server runs in a separate
+process so it does not compete with the client for the GIL.
+
+    python benchmarks/request_benchmark.py --save baseline.json
+    python benchmarks/request_benchmark.py --compare baseline.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from cobo_custody.client import json_codec
+from cobo_custody.client.async_client import AsyncClient
+from cobo_custody.client.client import Client
+from cobo_custody.client.prepared_request import PreparedRequest
+from cobo_custody.config import Env
+from cobo_custody.signer.local_signer import LocalSigner, generate_new_key, verify_ecdsa_signature, \
+    verify_response_signature
+from cobo_custody.transport.aiohttp_transport import AioHttpTransport, aiohttp
+from cobo_custody.transport.pooled_transport import PooledTransport
+
+from mock_server import COIN_INFO, transactions_result
+
+PATH = "/v1/custody/coin_info/"
+PARAMS = {"coin": "ETH", "amount": 1000000000000000000, "memo": None}
+# metric name -> whether a larger value is better
+METRICS = {"throughput": True, "p50_ms": False, "p99_ms": False, "ops_per_s": True}
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def summarize(latencies: List[float], elapsed: float) -> Dict[str, float]:
+    ordered = sorted(latencies)
+    return {"requests": len(ordered),
+            "throughput": round(len(ordered) / elapsed, 1),
+            "p50_ms": round(percentile(ordered, 0.50) * 1000, 3),
+            "p99_ms": round(percentile(ordered, 0.99) * 1000, 3)}
+
+
+def timed_request(client: Client) -> float:
+    start = time.perf_counter()
+    response = client.request("GET", PATH, PARAMS)
+    assert response.success
+    return time.perf_counter() - start
+
+
+def run_sequential(client: Client, count: int) -> Dict[str, float]:
+    start = time.perf_counter()
+    latencies = [timed_request(client) for _ in range(count)]
+    return summarize(latencies, time.perf_counter() - start)
+
+
+def run_threaded(client: Client, count: int, concurrency: int) -> Dict[str, float]:
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        start = time.perf_counter()
+        latencies = list(executor.map(lambda _: timed_request(client), range(count)))
+        elapsed = time.perf_counter() - start
+    return summarize(latencies, elapsed)
+
+
+async def run_async(client: AsyncClient, count: int, concurrency: int) -> Dict[str, float]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def timed():
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.request("GET", PATH, PARAMS)
+            assert response.success
+            return time.perf_counter() - start
+
+    await client.request("GET", PATH, PARAMS)
+    start = time.perf_counter()
+    latencies = await asyncio.gather(*(timed() for _ in range(count)))
+    elapsed = time.perf_counter() - start
+    await client.close()
+    return summarize(list(latencies), elapsed)
+
+
+def measure(fn: Callable[[], object], seconds: float) -> Dict[str, float]:
+    fn()
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        fn()
+        count += 1
+    elapsed = time.perf_counter() - start
+    return {"ops_per_s": round(count / elapsed, 1), "us_per_op": round(elapsed / count * 1e6, 2)}
+
+
+def micro_benchmarks(seconds: float, records: int) -> Dict[str, Dict[str, float]]:
+    secret, pub_key = generate_new_key()
+    signer = LocalSigner(secret)
+    content = PreparedRequest("GET", PATH, PARAMS).signing_content(str(int(time.time() * 1e6)))
+    signature = signer.sign(content)
+    result = transactions_result(records) if records else COIN_INFO
+    body = json.dumps({"success": True, "result": result}).encode()
+    body_signature = signer.sign(f"{body.decode()}|1700000000000")
+    return {
+        "micro.sign": measure(lambda: signer.sign(content), seconds),
+        "micro.verify": measure(lambda: verify_ecdsa_signature(content, signature, pub_key), seconds),
+        "micro.verify_response": measure(
+            lambda: verify_response_signature(body, "1700000000000", body_signature, pub_key), seconds),
+        "micro.canonicalize": measure(lambda: PreparedRequest("GET", PATH, PARAMS), seconds),
+        "micro.json_decode": measure(lambda: json_codec.loads(body), seconds),
+        "micro.json_decode_stdlib": measure(lambda: json.loads(body), seconds),
+    }
+
+
+def start_server(records: int):
+    server = subprocess.Popen([sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                            "mock_server.py"), "--records", str(records)],
+                              stdout=subprocess.PIPE, text=True)
+    host, cobo_pub = server.stdout.readline().split()
+    return server, Env(host=host, coboPub=cobo_pub)
+
+
+def load_benchmarks(env: Env, count: int, concurrency: int) -> Dict[str, Dict[str, float]]:
+    signer = LocalSigner(generate_new_key()[0])
+    # identical concurrent GETs would be coalesced into one, measure every request
+    options = {"coalesce_requests": False}
+    results = {}
+    client = Client(signer, env, transport=PooledTransport(pool_maxsize=concurrency), **options)
+    client.request("GET", PATH, PARAMS)
+    results["request.sequential"] = run_sequential(client, count)
+    results["request.threaded"] = run_threaded(client, count, concurrency)
+    client.transport.close()
+    if aiohttp is not None:
+        client = AsyncClient(signer, env, transport=AioHttpTransport(limit=concurrency), **options)
+        results["request.async"] = asyncio.run(run_async(client, count, concurrency))
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Print the change of every metric against ``baseline`` and return the regressions."""
+    regressions = []
+    for key in ("requests", "concurrency", "records"):
+        if baseline["meta"].get(key) != results["meta"][key]:
+            print(f"warning: baseline was run with {key}={baseline['meta'].get(key)}, now {results['meta'][key]}")
+    print(f"\n{'benchmark':<28}{'metric':<12}{'baseline':>12}{'current':>12}{'change':>10}")
+    for name, metrics in results["results"].items():
+        before = baseline["results"].get(name, {})
+        for metric, higher_is_better in METRICS.items():
+            if metric not in metrics or not before.get(metric):
+                continue
+            change = (metrics[metric] - before[metric]) / before[metric]
+            worse = -change if higher_is_better else change
+            flag = "  REGRESSION" if worse > tolerance else ""
+            if flag:
+                regressions.append(f"{name} {metric}")
+            print(f"{name:<28}{metric:<12}{before[metric]:>12}{metrics[metric]:>12}{change:>+10.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000, help="requests per load benchmark")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--records", type=int, default=0,
+                        help="transactions per response, 0 answers with a small coin_info result")
+    parser.add_argument("--seconds", type=float, default=1.0, help="duration of each micro benchmark")
+    parser.add_argument("--skip-load", action="store_true", help="only run the micro benchmarks")
+    parser.add_argument("--save", help="write the results to this file as a baseline")
+    parser.add_argument("--compare", help="compare the results with a baseline file")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="relative slowdown reported as a regression")
+    args = parser.parse_args()
+
+    results = {"meta": {"python": platform.python_version(),
+                        "platform": platform.platform(),
+                        "orjson": json_codec.orjson is not None,
+                        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                        "requests": args.requests,
+                        "concurrency": args.concurrency,
+                        "records": args.records},
+               "results": {}}
+    if not args.skip_load:
+        server, env = start_server(args.records)
+        try:
+            results["results"].update(load_benchmarks(env, args.requests, args.concurrency))
+        finally:
+            server.terminate()
+            server.wait()
+    results["results"].update(micro_benchmarks(args.seconds, args.records))
+
+    for name, metrics in results["results"].items():
+        print(f"{name:<28}" + "  ".join(f"{metric}={value}" for metric, value in metrics.items()))
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) above {args.tolerance:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Compare response signature verification with and without the cached
+verifier, and signing/verification speed of every installed crypto backend.
+
+    python benchmarks/verify_benchmark.py --seconds 3
+"""
+import argparse
+import hashlib
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import ecdsa
+from ecdsa.util import sigdecode_der
+
+from cobo_custody.signer.crypto_backend import available_backends, get_backend
+from cobo_custody.signer.local_signer import LocalSigner, LocalVerifier, generate_new_key, verify_ecdsa_signature
+
+
+def verify_uncached(content: str, signature: str, pub_key: str) -> bool:
+    # the verification path before the verifier was cached
+    vk = ecdsa.VerifyingKey.from_string(bytes.fromhex(pub_key), hashfunc=hashlib.sha256, curve=ecdsa.SECP256k1)
+    return vk.verify(signature=bytes.fromhex(signature),
+                     data=hashlib.sha256(content.encode()).digest(),
+                     hashfunc=hashlib.sha256,
+                     sigdecode=sigdecode_der)
+
+
+def measure(verify, content: str, signature: str, pub_key: str, seconds: float) -> float:
+    verify(content, signature, pub_key)
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        assert verify(content, signature, pub_key)
+        count += 1
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=2.0)
+    args = parser.parse_args()
+
+    secret, pub_key = generate_new_key()
+    content = '{"success": true, "result": {"coin": "BTC"}}|%d' % int(time.time() * 1000)
+    signature = LocalSigner(secret).sign(content)
+
+    before = measure(verify_uncached, content, signature, pub_key, args.seconds)
+    after = measure(verify_ecdsa_signature, content, signature, pub_key, args.seconds)
+    print(f"uncached verifier: {before:10.1f} verifications/s")
+    print(f"cached verifier:   {after:10.1f} verifications/s  ({after / before:.2f}x)")
+
+    for name in available_backends():
+        signer = LocalSigner(secret, backend=get_backend(name))
+        verifier = LocalVerifier(pub_key, backend=get_backend(name))
+        signs = measure(lambda c, s, p: bool(signer.sign(c)), content, signature, pub_key, args.seconds)
+        verifies = measure(lambda c, s, p: verifier.verify(c, s), content, signature, pub_key, args.seconds)
+        print(f"{name:<13} backend: {signs:10.1f} signatures/s {verifies:10.1f} verifications/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -9,3 +9,17 @@ class ApiResponse:
     success: bool
     result: Optional[dict]
     exception: Optional[ApiError]
+
+
+@dataclass
+class RawResponse:
+    """Verified but undecoded response body, returned by clients created with
+    ``raw_response=True``.  The API envelope is not inspected, so ``success``
+    only reflects the HTTP status."""
+    status_code: int
+    content: bytes
+    exception = None
+
+    @property
+    def success(self) -> bool:
+        return self.status_code < 400
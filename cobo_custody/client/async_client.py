@@ -0,0 +1,110 @@
+from typing import AsyncIterator
+
+from cobo_custody.client.api_response import ApiResponse
+from cobo_custody.client.client import Client
+from cobo_custody.client.mpc_client import MPCClient
+from cobo_custody.client.mpc_prime_broker_client import MPCPrimeBrokerClient
+from cobo_custody.client.paginator import Pager, aiter_pages
+from cobo_custody.client.prepared_request import FORM_CONTENT_TYPE, PreparedRequest
+from cobo_custody.client.single_flight import AsyncSingleFlight
+from cobo_custody.client.web3_client import Web3Client
+from cobo_custody.config import Env
+from cobo_custody.signer.api_signer import ApiSigner
+from cobo_custody.transport.aiohttp_transport import AioHttpTransport
+from cobo_custody.transport.api_transport import AsyncApiTransport
+
+
+class AsyncRequestMixin(object):
+    """Turns a client into its asyncio counterpart.
+
+    Only the I/O steps of the ``BaseClient`` pipeline (``request``,
+    ``coalesce``, ``dispatch``, ``send_request``, ``send`` and ``paginate``)
+    are replaced, so every endpoint method of the wrapped client keeps its
+    name and arguments and simply returns an awaitable, and every ``iter_*``
+    method an async iterator.
+    """
+
+    def __init__(self, signer: ApiSigner, env: Env, debug: bool = False, transport: AsyncApiTransport = None,
+                 **kwargs):
+        super().__init__(signer, env, debug, transport=transport or AioHttpTransport(), **kwargs)
+        if self.in_flight is not None:
+            self.in_flight = AsyncSingleFlight()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close(self):
+        await self.transport.close()
+
+    async def request(
+            self,
+            method: str,
+            path: str,
+            params: dict
+    ) -> ApiResponse:
+        prepared = PreparedRequest(method, path, params)
+        ttl = self.cache_ttl(prepared)
+        if ttl is None:
+            return await self.coalesce(prepared)
+        return await self.cache.get_or_load_async(self.cache_key(prepared), ttl, lambda: self.coalesce(prepared))
+
+    async def coalesce(self, prepared: PreparedRequest) -> ApiResponse:
+        if self.in_flight is None or prepared.method != "GET":
+            return await self.dispatch(prepared)
+        return await self.in_flight.do(prepared.key, lambda: self.dispatch(prepared))
+
+    async def dispatch(self, prepared: PreparedRequest) -> ApiResponse:
+        if self.retry_policy is None:
+            return await self.send_request(prepared)
+        return await self.retry_policy.call_async(prepared.method, prepared.params,
+                                                  lambda: self.send_request(prepared))
+
+    async def send_request(self, prepared: PreparedRequest) -> ApiResponse:
+        timer = self.start_timer(prepared.method, prepared.path)
+        for phase, seconds in prepared.take_timings().items():
+            timer.add(phase, seconds)
+        try:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async(prepared.path)
+                timer.mark("rate_limit")
+            url, headers = self.prepare_request(prepared, timer)
+            resp = await self.send(prepared, url, headers)
+            timer.mark("http")
+            response = self.handle_response(prepared.path, resp, timer)
+        except Exception as e:
+            timer.finish(exception=e)
+            raise
+        timer.finish(response)
+        return response
+
+    async def send(self, prepared: PreparedRequest, url: str, headers: dict):
+        if prepared.method == "GET":
+            return await self.transport.request("GET", url, params=prepared.query, headers=headers)
+        elif prepared.method == "POST":
+            headers["Content-Type"] = FORM_CONTENT_TYPE
+            return await self.transport.request("POST", url, data=prepared.query, headers=headers)
+        else:
+            raise Exception("Not support http method")
+
+    def paginate(self, method: str, path: str, params: dict, pager: Pager,
+                 prefetch: bool = True) -> AsyncIterator[dict]:
+        return aiter_pages(self.request, method, path, params, pager, prefetch)
+
+
+class AsyncClient(AsyncRequestMixin, Client):
+    pass
+
+
+class AsyncMPCClient(AsyncRequestMixin, MPCClient):
+    pass
+
+
+class AsyncWeb3Client(AsyncRequestMixin, Web3Client):
+    pass
+
+
+class AsyncMPCPrimeBrokerClient(AsyncRequestMixin, MPCPrimeBrokerClient):
+    pass
@@ -0,0 +1,205 @@
+import time
+from typing import Iterator, Tuple
+
+import requests
+
+from cobo_custody.client import json_codec
+from cobo_custody.client.api_response import ApiResponse, RawResponse
+from cobo_custody.client.paginator import Pager, iter_pages
+from cobo_custody.client.prepared_request import FORM_CONTENT_TYPE, PreparedRequest, canonical_query, clean_params
+from cobo_custody.client.rate_limiter import RateLimiter
+from cobo_custody.client.response_cache import CacheKey, ResponseCache
+from cobo_custody.client.retry import RetryPolicy
+from cobo_custody.client.single_flight import SingleFlight
+from cobo_custody.config import Env
+from cobo_custody.error.api_error import ApiError, HttpStatusError
+from cobo_custody.metrics.metrics_sink import MetricsSink
+from cobo_custody.metrics.request_timer import NULL_TIMER, RequestTimer
+from cobo_custody.signer.api_signer import ApiSigner
+from cobo_custody.signer.local_signer import verify_response_signature
+from cobo_custody.transport.api_transport import ApiTransport
+from cobo_custody.transport.pooled_transport import get_default_transport
+
+
+class BaseClient(object):
+    """Request pipeline shared by every Cobo client.
+
+    Endpoint methods only describe a request (method, path, params) and hand
+    it to ``request``, which canonicalizes it once into a ``PreparedRequest``
+    and runs it through the pipeline: retry policy, rate limiter,
+    ``sign_request``, ``send`` over the transport, then
+    ``handle_response`` which verifies the Cobo signature and parses the
+    result.  Subclasses override those hooks instead of copying the pipeline.
+
+    With a ``metrics`` sink every request reports its latency, the time spent
+    in each phase, payload sizes and error codes; without one the phase
+    marks are no-ops.
+
+    With a ``cache`` GET requests to the reference endpoints it has a TTL for
+    are answered from the cache and only reach the API on a miss.
+
+    Identical GET requests (same path and canonical params) issued while one
+    is already in flight wait for it and share its verified response instead
+    of sending a duplicate, unless ``coalesce_requests`` is disabled.
+
+    With ``raw_response`` every request returns a ``RawResponse`` holding the
+    verified body bytes instead of decoding it, for callers that store the
+    payload as is.
+    """
+
+    def __init__(self, signer: ApiSigner, env: Env, debug: bool = False, transport: ApiTransport = None,
+                 rate_limiter: RateLimiter = None, retry_policy: RetryPolicy = None, metrics: MetricsSink = None,
+                 cache: ResponseCache = None, coalesce_requests: bool = True, raw_response: bool = False):
+        self.api_signer = signer
+        self.env = env
+        self.debug = debug
+        self.transport = transport or get_default_transport()
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.metrics = metrics
+        self.cache = cache
+        self.in_flight = SingleFlight() if coalesce_requests else None
+        self.raw_response = raw_response
+
+    def sort_params(self, params: dict) -> str:
+        return canonical_query(params)
+
+    def remove_none_value_elements(self, input_dict: dict) -> dict:
+        return clean_params(input_dict)
+
+    def sign_request(self, prepared: PreparedRequest, timer=NULL_TIMER) -> dict:
+        nonce = str(int(time.time() * 1000 * 1000))
+        timer.mark("nonce")
+        timer.record_request_size(len(prepared.query))
+        sign = self.api_signer.sign(prepared.signing_content(nonce))
+        timer.mark("sign")
+
+        return {
+            "Biz-Api-Key": self.api_signer.get_public_key(),
+            "Biz-Api-Nonce": nonce,
+            "Biz-Api-Signature": sign,
+        }
+
+    def send(self, prepared: PreparedRequest, url: str, headers: dict):
+        if prepared.method == "GET":
+            return self.transport.request("GET", url, params=prepared.query, headers=headers)
+        elif prepared.method == "POST":
+            headers["Content-Type"] = FORM_CONTENT_TYPE
+            return self.transport.request("POST", url, data=prepared.query, headers=headers)
+        else:
+            raise Exception("Not support http method")
+
+    def verify_signature(self, response: requests.Response, timer=NULL_TIMER) -> bool:
+        content = response.content
+        timer.record_response_size(len(content))
+        success = True
+        try:
+            timestamp = response.headers["BIZ_TIMESTAMP"]
+            signature = response.headers["BIZ_RESP_SIGNATURE"]
+            if self.debug:
+                print(f"response <<<<<<<< \n content: {content.decode()}\n headers: {response.headers} \n")
+            success = verify_response_signature(content, timestamp, signature, self.env.coboPub)
+        except KeyError:
+            pass
+        timer.mark("verify")
+        return success
+
+    def verify_response(self, response: requests.Response, timer=NULL_TIMER) -> Tuple[bool, dict]:
+        success = self.verify_signature(response, timer)
+        result = json_codec.loads(response.content)
+        timer.mark("parse")
+        return success, result
+
+    def parse_response(self, result: dict) -> ApiResponse:
+        success = result['success']
+        if success:
+            return ApiResponse(True, result['result'], None)
+        else:
+            exception = ApiError(result['error_code'], result['error_message'], result['error_id'])
+            return ApiResponse(False, None, exception)
+
+    def handle_response(self, path: str, resp, timer=NULL_TIMER) -> ApiResponse:
+        # a rate limit status is reported before the response is retried or parsed, its body is often not JSON
+        status_limited = self.rate_limiter is not None and self.rate_limiter.is_rate_limited(None, resp.status_code)
+        if status_limited:
+            self.rate_limiter.feedback(path, None, resp.status_code)
+        if self.retry_policy is not None and resp.status_code in self.retry_policy.retry_status_codes:
+            raise HttpStatusError(resp.status_code)
+        if self.raw_response:
+            if not self.verify_signature(resp, timer):
+                raise Exception("Fatal: verify content error, maybe encounter mid man attack")
+            if self.rate_limiter is not None and not status_limited:
+                self.rate_limiter.feedback(path, None, resp.status_code)
+            return RawResponse(resp.status_code, resp.content)
+        verify_success, result = self.verify_response(resp, timer)
+        if not verify_success:
+            raise Exception("Fatal: verify content error, maybe encounter mid man attack")
+
+        response = self.parse_response(result)
+        if self.rate_limiter is not None and not status_limited:
+            self.rate_limiter.feedback(path, response, resp.status_code)
+        return response
+
+    def prepare_request(self, prepared: PreparedRequest, timer=NULL_TIMER) -> Tuple[str, dict]:
+        headers = self.sign_request(prepared, timer)
+        url = f"{self.env.host}{prepared.path}"
+        if self.debug:
+            print(f"request >>>>>>>>\n method: {prepared.method} \n url: {url} \n params: {prepared.params} \n "
+                  f"headers: {headers} \n")
+        return url, headers
+
+    def request(
+            self,
+            method: str,
+            path: str,
+            params: dict
+    ) -> ApiResponse:
+        prepared = PreparedRequest(method, path, params)
+        ttl = self.cache_ttl(prepared)
+        if ttl is None:
+            return self.coalesce(prepared)
+        return self.cache.get_or_load(self.cache_key(prepared), ttl, lambda: self.coalesce(prepared))
+
+    def cache_key(self, prepared: PreparedRequest) -> CacheKey:
+        return self.env.host, self.api_signer.get_public_key(), prepared.path, prepared.query
+
+    def cache_ttl(self, prepared: PreparedRequest):
+        if self.cache is None or prepared.method != "GET" or self.raw_response:
+            return None
+        return self.cache.ttl_for(prepared.path)
+
+    def coalesce(self, prepared: PreparedRequest) -> ApiResponse:
+        if self.in_flight is None or prepared.method != "GET":
+            return self.dispatch(prepared)
+        return self.in_flight.do(prepared.key, lambda: self.dispatch(prepared))
+
+    def dispatch(self, prepared: PreparedRequest) -> ApiResponse:
+        if self.retry_policy is None:
+            return self.send_request(prepared)
+        return self.retry_policy.call(prepared.method, prepared.params, lambda: self.send_request(prepared))
+
+    def send_request(self, prepared: PreparedRequest) -> ApiResponse:
+        timer = self.start_timer(prepared.method, prepared.path)
+        for phase, seconds in prepared.take_timings().items():
+            timer.add(phase, seconds)
+        try:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(prepared.path)
+                timer.mark("rate_limit")
+            url, headers = self.prepare_request(prepared, timer)
+            resp = self.send(prepared, url, headers)
+            timer.mark("http")
+            response = self.handle_response(prepared.path, resp, timer)
+        except Exception as e:
+            timer.finish(exception=e)
+            raise
+        timer.finish(response)
+        return response
+
+    def start_timer(self, method: str, path: str):
+        if self.metrics is None:
+            return NULL_TIMER
+        return RequestTimer(self.metrics, method, path)
+
+    def paginate(self, method: str, path: str, params: dict, pager: Pager, prefetch: bool = True) -> Iterator[dict]:
+        return iter_pages(self.request, method, path, params, pager, prefetch)
@@ -0,0 +1,81 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Iterable, List, Union
+
+from cobo_custody.client.api_response import ApiResponse
+
+BatchResult = Union[ApiResponse, Exception]
+
+
+class BatchExecutor(object):
+    """Runs many independent client calls on a bounded thread pool.
+
+    Each call is a zero-argument callable, typically a ``functools.partial``
+    of a client method, so requests are signed and verified exactly as they
+    would be when called directly.  Results come back in input order; a call
+    that raises is reported by its exception instead of aborting the batch,
+    while API level failures stay inside their ``ApiResponse``.
+
+    Keep ``max_workers`` at or below the transport ``pool_maxsize`` so every
+    worker can hold a keep-alive connection.
+    """
+
+    def __init__(self, max_workers: int = 16):
+        self.max_workers = max_workers
+        self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="cobo-batch")
+        return self._executor
+
+    def execute(self, calls: Iterable[Callable[[], ApiResponse]]) -> List[BatchResult]:
+        futures = [self._get_executor().submit(call) for call in calls]
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append(e)
+        return results
+
+    def map(self, method: Callable[..., ApiResponse], kwargs_list: Iterable[dict]) -> List[BatchResult]:
+        """Call ``method`` once per keyword argument dict, e.g.
+        ``executor.map(mpc_client.get_balance, [{"address": a} for a in addresses])``."""
+        return self.execute([_bind(method, kwargs) for kwargs in kwargs_list])
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+class AsyncBatchExecutor(object):
+    """Event loop counterpart of ``BatchExecutor`` for the asyncio clients,
+    at most ``concurrency`` calls are in flight at once."""
+
+    def __init__(self, concurrency: int = 100):
+        self.concurrency = concurrency
+
+    async def execute(self, calls: Iterable[Callable[[], Awaitable[ApiResponse]]]) -> List[BatchResult]:
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def run(call):
+            async with semaphore:
+                return await call()
+
+        return list(await asyncio.gather(*[run(call) for call in calls], return_exceptions=True))
+
+    async def map(self, method: Callable[..., Awaitable[ApiResponse]],
+                  kwargs_list: Iterable[dict]) -> List[BatchResult]:
+        return await self.execute([_bind(method, kwargs) for kwargs in kwargs_list])
+
+
+def _bind(method, kwargs: dict):
+    return lambda: method(**kwargs)
@@ -1,97 +1,14 @@
-import json
 import time
 from hashlib import sha256
-from typing import Tuple
-from urllib.parse import urlencode
-
-import requests
+from typing import Iterator
 
 from cobo_custody.client.api_response import ApiResponse
-from cobo_custody.config import Env
-from cobo_custody.error.api_error import ApiError
-from cobo_custody.signer.api_signer import ApiSigner
-from cobo_custody.signer.local_signer import verify_ecdsa_signature
+from cobo_custody.client.base_client import BaseClient
+from cobo_custody.client.paginator import IdPager, OffsetPager, PageIndexPager
 from cobo_custody.model.enums import SortFlagEnum
 
 
-class Client(object):
-
-    def __init__(self, signer: ApiSigner, env: Env, debug: bool = False):
-        self.api_signer = signer
-        self.env = env
-        self.debug = debug
-
-    def sort_params(self, params: dict) -> str:
-        params = [(key, val) for key, val in params.items()]
-
-        params.sort(key=lambda x: x[0])
-        return urlencode(params)
-
-    def remove_none_value_elements(self, input_dict: dict) -> dict:
-        if type(input_dict) is not dict:
-            return {}
-        result = {}
-        for key in input_dict:
-            tmp = {}
-            if input_dict[key] is not None:
-                if type(input_dict[key]).__name__ == 'dict':
-                    tmp.update({key: self.remove_none_value_elements(input_dict[key])})
-                else:
-                    tmp.update({key: input_dict[key]})
-            result.update(tmp)
-        return result
-
-    def verify_response(self, response: requests.Response) -> Tuple[bool, dict]:
-        content = response.content.decode()
-        success = True
-        try:
-            timestamp = response.headers["BIZ_TIMESTAMP"]
-            signature = response.headers["BIZ_RESP_SIGNATURE"]
-            if self.debug:
-                print(f"response <<<<<<<< \n content: {content}\n headers: {response.headers} \n")
-            success = verify_ecdsa_signature("%s|%s" % (content, timestamp), signature, self.env.coboPub)
-        except KeyError:
-            pass
-        return success, json.loads(content)
-
-    def request(
-            self,
-            method: str,
-            path: str,
-            params: dict
-    ) -> ApiResponse:
-        method = method.upper()
-        nonce = str(int(time.time() * 1000 * 1000))
-        params = self.remove_none_value_elements(params)
-        content = f"{method}|{path}|{nonce}|{self.sort_params(params)}"
-        sign = self.api_signer.sign(content)
-
-        headers = {
-            "Biz-Api-Key": self.api_signer.get_public_key(),
-            "Biz-Api-Nonce": nonce,
-            "Biz-Api-Signature": sign,
-        }
-        url = f"{self.env.host}{path}"
-        if self.debug:
-            print(f"request >>>>>>>>\n method: {method} \n url: {url} \n params: {params} \n headers: {headers} \n")
-
-        if method == "GET":
-            resp = requests.get(url, params=urlencode(params), headers=headers)
-        elif method == "POST":
-            resp = requests.post(url, data=params, headers=headers)
-        else:
-            raise Exception("Not support http method")
-        verify_success, result = self.verify_response(resp)
-        if not verify_success:
-            raise Exception("Fatal: verify content error, maybe encounter mid man attack")
-
-        success = result['success']
-        if success:
-            return ApiResponse(True, result['result'], None)
-        else:
-            exception = ApiError(result['error_code'], result['error_message'], result['error_id'])
-            return ApiResponse(False, None, exception)
-
+class Client(BaseClient):
     def get_account_info(self) -> ApiResponse:
         return self.request("GET", "/v1/custody/org_info/", {})
 
@@ -132,6 +49,12 @@ class Client(object):
         return self.request("GET", "/v1/custody/address_history/", {
             "coin": coin, "page_index": page_index, "page_length": page_length, "sort_flag": sort_flag.value})
 
+    def iter_address_history(self, coin: str, page_length: int = 50, sort_flag=SortFlagEnum.DESCENDING,
+                             prefetch: bool = True) -> Iterator[dict]:
+        return self.paginate("GET", "/v1/custody/address_history/", {
+            "coin": coin, "page_index": 0, "page_length": page_length, "sort_flag": sort_flag.value},
+            PageIndexPager(), prefetch)
+
     # loop alliance
     def check_loop_address_details(self, coin: str, address: str, memo: str = None) -> ApiResponse:
         params = {
@@ -168,6 +91,20 @@ class Client(object):
         }
         return self.request("GET", "/v1/custody/transactions_by_id/", params)
 
+    def iter_transactions_by_id(self, coin: str = None, side: str = None, address: str = None,
+                                max_id: str = None, min_id: str = None, limit: str = None,
+                                include_financial: str = None, prefetch: bool = True) -> Iterator[dict]:
+        params = {
+            "coin": coin,
+            "side": side,
+            "address": address,
+            "max_id": max_id,
+            "min_id": min_id,
+            "limit": limit,
+            "include_financial": include_financial
+        }
+        return self.paginate("GET", "/v1/custody/transactions_by_id/", params, IdPager(), prefetch)
+
     def get_transactions_by_time(self, coin: str = None, side: str = None, address: str = None,
                                  begin_time: str = None, end_time: str = None, limit: str = None,
                                  include_financial: str = None) -> ApiResponse:
@@ -201,6 +138,25 @@ class Client(object):
         }
         return self.request("GET", "/v1/custody/transactions_by_time_ex/", params)
 
+    def iter_transactions_by_time_ex(self, coins: str = None, side: int = None, address: str = None,
+                                     status: int = None, begin_time: int = None, end_time: int = None,
+                                     limit: int = None, order_by: str = None, order: str = None,
+                                     txid: str = None, prefetch: bool = True) -> Iterator[dict]:
+        params = {
+            "coins": coins,
+            "side": side,
+            "address": address,
+            "status": status,
+            "begin_time": begin_time,
+            "end_time": end_time,
+            "limit": limit,
+            "offset": 0,
+            "order_by": order_by,
+            "order": order,
+            "txid": txid,
+        }
+        return self.paginate("GET", "/v1/custody/transactions_by_time_ex/", params, OffsetPager(), prefetch)
+
     def get_pending_transactions(self, coin: str = None, side: str = None,
                                  max_id: str = None, min_id: str = None, limit: str = None) -> ApiResponse:
         params = {
@@ -212,6 +168,17 @@ class Client(object):
         }
         return self.request("GET", "/v1/custody/pending_transactions/", params)
 
+    def iter_pending_transactions(self, coin: str = None, side: str = None, max_id: str = None,
+                                  min_id: str = None, limit: str = None, prefetch: bool = True) -> Iterator[dict]:
+        params = {
+            "coin": coin,
+            "side": side,
+            "max_id": max_id,
+            "min_id": min_id,
+            "limit": limit
+        }
+        return self.paginate("GET", "/v1/custody/pending_transactions/", params, IdPager(), prefetch)
+
     def get_pending_transaction(self, id: str) -> ApiResponse:
         return self.request("GET", "/v1/custody/pending_transaction/", {"id": id})
 
@@ -236,6 +203,23 @@ class Client(object):
         }
         return self.request("GET", "/v1/custody/transaction_history/", params)
 
+    def iter_transaction_history(self, coin: str = None, side: str = None, address: str = None, max_id: str = None,
+                                 min_id: str = None, limit: str = None,
+                                 begin_time: str = None, end_time: str = None,
+                                 include_financial: str = None, prefetch: bool = True) -> Iterator[dict]:
+        params = {
+            "coin": coin,
+            "side": side,
+            "address": address,
+            "max_id": max_id,
+            "min_id": min_id,
+            "limit": limit,
+            "begin_time": begin_time,
+            "end_time": end_time,
+            "include_financial": include_financial
+        }
+        return self.paginate("GET", "/v1/custody/transaction_history/", params, IdPager(), prefetch)
+
     def withdraw(self, coin: str, address: str, amount: int, request_id: str = None, memo: str = None,
                  force_external: str = None, force_internal: str = None, remark: str = None) -> ApiResponse:
         if not request_id:
@@ -0,0 +1,32 @@
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+# digits fold to 0 and the separators that may precede a number to ":"
+_FOLD = bytes.maketrans(b"123456789,[", b"000000000::")
+_DROP = b" \t\r\n-"
+_WIDE_INTEGER = b":" + b"0" * 19
+
+
+def has_wide_integer(content: bytes) -> bool:
+    """Whether ``content`` may hold an integer literal of 19 digits or more.
+
+    One C level pass folds digits to ``0``, the separators ``,`` and ``[``
+    to ``:`` and drops whitespace and minus signs, then a wide literal is a
+    run of zeros right after ``:``.  Digit runs inside strings (cobo ids)
+    start after a quote and do not match; the rare false positive merely
+    costs the slower decoder.
+    """
+    return _WIDE_INTEGER in content.translate(_FOLD, _DROP)
+
+
+def loads(content: bytes):
+    """Decode a JSON response body straight from bytes, with orjson when it is
+    installed.  orjson turns integers wider than 64 bits (e.g. wei amounts)
+    into floats, so bodies holding one are left to ``json``."""
+    if orjson is not None and not has_wide_integer(content):
+        return orjson.loads(content)
+    return json.loads(content)
@@ -1,94 +1,11 @@
-import json
-import time
-from typing import Tuple, List
-from urllib.parse import urlencode
-
-import requests
+from typing import Iterator, List
 
 from cobo_custody.client.api_response import ApiResponse
-from cobo_custody.config import Env
-from cobo_custody.error.api_error import ApiError
-from cobo_custody.signer.api_signer import ApiSigner
-from cobo_custody.signer.local_signer import verify_ecdsa_signature
-
-
-class MPCClient(object):
-    def __init__(self, signer: ApiSigner, env: Env, debug: bool = False):
-        self.api_signer = signer
-        self.env = env
-        self.debug = debug
-
-    def sort_params(self, params: dict) -> str:
-        params = [(key, val) for key, val in params.items()]
-
-        params.sort(key=lambda x: x[0])
-        return urlencode(params)
-
-    def remove_none_value_elements(self, input_dict: dict) -> dict:
-        if type(input_dict) is not dict:
-            return {}
-        result = {}
-        for key in input_dict:
-            tmp = {}
-            if input_dict[key] is not None:
-                if type(input_dict[key]).__name__ == 'dict':
-                    tmp.update({key: self.remove_none_value_elements(input_dict[key])})
-                else:
-                    tmp.update({key: input_dict[key]})
-            result.update(tmp)
-        return result
-
-    def verify_response(self, response: requests.Response) -> Tuple[bool, dict]:
-        content = response.content.decode()
-        success = True
-        try:
-            timestamp = response.headers["BIZ_TIMESTAMP"]
-            signature = response.headers["BIZ_RESP_SIGNATURE"]
-            if self.debug:
-                print(f"response <<<<<<<< \n content: {content}\n headers: {response.headers} \n")
-            success = verify_ecdsa_signature("%s|%s" % (content, timestamp), signature, self.env.coboPub)
-        except KeyError:
-            pass
-        return success, json.loads(content)
-
-    def request(
-            self,
-            method: str,
-            path: str,
-            params: dict
-    ) -> ApiResponse:
-        method = method.upper()
-        nonce = str(int(time.time() * 1000 * 1000))
-        params = self.remove_none_value_elements(params)
-        content = f"{method}|{path}|{nonce}|{self.sort_params(params)}"
-        sign = self.api_signer.sign(content)
-
-        headers = {
-            "Biz-Api-Key": self.api_signer.get_public_key(),
-            "Biz-Api-Nonce": nonce,
-            "Biz-Api-Signature": sign,
-        }
-        url = f"{self.env.host}{path}"
-        if self.debug:
-            print(f"request >>>>>>>>\n method: {method} \n url: {url} \n params: {params} \n headers: {headers} \n")
-
-        if method == "GET":
-            resp = requests.get(url, params=urlencode(params), headers=headers)
-        elif method == "POST":
-            resp = requests.post(url, data=params, headers=headers)
-        else:
-            raise Exception("Not support http method")
-        verify_success, result = self.verify_response(resp)
-        if not verify_success:
-            raise Exception("Fatal: verify content error, maybe encounter mid man attack")
-
-        success = result['success']
-        if success:
-            return ApiResponse(True, result['result'], None)
-        else:
-            exception = ApiError(result['error_code'], result['error_message'], result['error_id'])
-            return ApiResponse(False, None, exception)
+from cobo_custody.client.base_client import BaseClient
+from cobo_custody.client.paginator import IdPager, PageIndexPager, StartEndIdPager, TimePager
 
+
+class MPCClient(BaseClient):
     def get_supported_chains(self):
         params = {}
         return self.request("GET", "/v1/custody/mpc/get_supported_chains/", params)
@@ -151,6 +68,18 @@ class MPCClient(object):
         }
         return self.request("GET", "/v1/custody/mpc/list_addresses/", params)
 
+    def iter_addresses(self, chain_code: str, start_id: str = None, end_id: str = None, limit: int = None,
+                       sort: int = None, prefetch: bool = True) -> Iterator[dict]:
+        params = {
+            "chain_code": chain_code,
+            "start_id": start_id,
+            "end_id": end_id,
+            "limit": limit,
+            "sort": sort
+        }
+        return self.paginate("GET", "/v1/custody/mpc/list_addresses/", params,
+                             StartEndIdPager(items_key="addresses"), prefetch)
+
     def get_balance(self, address: str, chain_code: str = None, coin: str = None) -> ApiResponse:
         params = {
             "address": address,
@@ -168,6 +97,17 @@ class MPCClient(object):
         }
         return self.request("GET", "/v1/custody/mpc/list_balances/", params)
 
+    def iter_balances(self, page_length: int = 50, coin: str = None, chain_code: str = None,
+                      prefetch: bool = True) -> Iterator[dict]:
+        params = {
+            "coin": coin,
+            "chain_code": chain_code,
+            "page_index": 0,
+            "page_length": page_length
+        }
+        return self.paginate("GET", "/v1/custody/mpc/list_balances/", params,
+                             PageIndexPager(items_key="coin_data"), prefetch)
+
     def list_spendable(self, coin: str, address: str = None) -> ApiResponse:
         params = {
             "address": address,
@@ -271,6 +211,25 @@ class MPCClient(object):
         }
         return self.request("GET", "/v1/custody/mpc/list_transactions/", params)
 
+    def iter_transactions(self, start_time: int = None, end_time: int = None, status: int = None,
+                          order: str = None, order_by: str = None, transaction_type: int = None,
+                          coins: str = None, from_address: str = None, to_address: str = None,
+                          limit: int = 50, prefetch: bool = True) -> Iterator[dict]:
+        params = {
+            "start_time": start_time,
+            "end_time": end_time,
+            "status": status,
+            "order": order,
+            "order_by": order_by,
+            "transaction_type": transaction_type,
+            "coins": coins,
+            "from_address": from_address,
+            "to_address": to_address,
+            "limit": limit
+        }
+        return self.paginate("GET", "/v1/custody/mpc/list_transactions/", params,
+                             TimePager(items_key="transactions"), prefetch)
+
     def estimate_fee(self, coin: str, amount: int = None, address: str = None, replace_cobo_id: str = None,
                      from_address: str = None,
                      to_address_details: str = None, fee: float = None, gas_price: int = None, gas_limit: int = None,
@@ -357,6 +316,12 @@ class MPCClient(object):
         params = {"status": status, "address": address, "min_cobo_id": min_cobo_id, "limit": limit}
         return self.request("GET", "/v1/custody/mpc/babylon/list_transactions_by_status/", params)
 
+    def babylon_iter_transactions_by_status(self, status: int, address: str = None, min_cobo_id: str = None,
+                                            limit: int = None, prefetch: bool = True) -> Iterator[dict]:
+        params = {"status": status, "address": address, "min_cobo_id": min_cobo_id, "limit": limit}
+        return self.paginate("GET", "/v1/custody/mpc/babylon/list_transactions_by_status/", params,
+                             IdPager(id_key="cobo_id", max_key=None, min_key="min_cobo_id"), prefetch)
+
     def babylon_unbonding(self, request_id: str, staking_request_id: str):
         params = {"request_id": request_id, "staking_request_id": staking_request_id}
         return self.request("POST", "/v1/custody/mpc/babylon/unbonding/", params)
@@ -377,6 +342,16 @@ class MPCClient(object):
         }
         return self.request("GET", "/v1/custody/mpc/babylon/airdrops/list_eligibles/", params)
 
+    def iter_eligibles(self, status: str = None, min_id: str = None, limit: int = None,
+                       prefetch: bool = True) -> Iterator[dict]:
+        params = {
+            "status": status,
+            "min_id": min_id,
+            "limit": limit
+        }
+        return self.paginate("GET", "/v1/custody/mpc/babylon/airdrops/list_eligibles/", params,
+                             IdPager(max_key=None), prefetch)
+
     def submit_registration(self, btc_address: str, babylon_address: str) -> ApiResponse:
         params = {
             "btc_address": btc_address,
@@ -393,6 +368,17 @@ class MPCClient(object):
         }
         return self.request("GET", "/v1/custody/mpc/babylon/airdrops/list_registrations/", params)
 
+    def iter_registrations(self, status: str = None, btc_address: str = None, min_id: str = None,
+                           limit: int = None, prefetch: bool = True) -> Iterator[dict]:
+        params = {
+            "status": status,
+            "btc_address": btc_address,
+            "min_id": min_id,
+            "limit": limit
+        }
+        return self.paginate("GET", "/v1/custody/mpc/babylon/airdrops/list_registrations/", params,
+                             IdPager(max_key=None), prefetch)
+
     def get_registration(self, registration_id: str) -> ApiResponse:
         params = {
             "registration_id": registration_id
@@ -407,6 +393,16 @@ class MPCClient(object):
         }
         return self.request("GET", "/v1/custody/mpc/babylon/stakings/list_eligibles/", params)
 
+    def iter_eligible_stakings(self, status: str = None, min_id: str = None, limit: int = None,
+                               prefetch: bool = True) -> Iterator[dict]:
+        params = {
+            "status": status,
+            "min_id": min_id,
+            "limit": limit
+        }
+        return self.paginate("GET", "/v1/custody/mpc/babylon/stakings/list_eligibles/", params,
+                             IdPager(max_key=None), prefetch)
+
     def submit_staking_registration(self, staking_id: str, babylon_address: str) -> ApiResponse:
         params = {
             "staking_id": staking_id,
@@ -423,6 +419,17 @@ class MPCClient(object):
         }
         return self.request("GET", "/v1/custody/mpc/babylon/stakings/list_registrations/", params)
 
+    def iter_staking_registrations(self, staking_id: str, status: str = None, min_id: str = None,
+                                   limit: int = None, prefetch: bool = True) -> Iterator[dict]:
+        params = {
+            "staking_id": staking_id,
+            "status": status,
+            "min_id": min_id,
+            "limit": limit
+        }
+        return self.paginate("GET", "/v1/custody/mpc/babylon/stakings/list_registrations/", params,
+                             IdPager(max_key=None), prefetch)
+
     def get_staking_registration(self, registration_id: str) -> ApiResponse:
         params = {
             "registration_id": registration_id
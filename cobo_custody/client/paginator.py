@@ -0,0 +1,229 @@
+import asyncio
+from abc import abstractmethod, ABCMeta
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Callable, Iterator, List, Optional
+
+from cobo_custody.client.api_response import ApiResponse
+from cobo_custody.error.api_error import ApiException, PaginationError
+
+
+def page_records(result, items_key: str = None) -> List[dict]:
+    """Return the record list of one page, which is either the result itself
+    or a list nested under ``items_key`` (the first list found by default)."""
+    if result is None:
+        return []
+    if isinstance(result, list):
+        return result
+    if items_key is not None:
+        return result.get(items_key) or []
+    for value in result.values():
+        if isinstance(value, list):
+            return value
+    return []
+
+
+def _sort_key(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return value
+
+
+class Pager(metaclass=ABCMeta):
+    """Knows how one list endpoint moves from a page to the next one."""
+
+    def __init__(self, items_key: str = None):
+        self.items_key = items_key
+
+    def records(self, params: dict, result) -> List[dict]:
+        return page_records(result, self.items_key)
+
+    @abstractmethod
+    def next_params(self, params: dict, result, records: List[dict]) -> Optional[dict]:
+        """Return the params of the following page, or None on the last page."""
+        pass
+
+
+class IdPager(Pager):
+    """``max_id``/``min_id`` cursors: walks down from ``max_id`` by default, or up
+    from ``min_id`` when only that bound is given or the endpoint has no
+    ``max_key`` at all."""
+
+    def __init__(self, items_key: str = None, id_key: str = "id", max_key: str = "max_id", min_key: str = "min_id"):
+        super().__init__(items_key)
+        self.id_key = id_key
+        self.max_key = max_key
+        self.min_key = min_key
+
+    def _ascending(self, params: dict) -> bool:
+        if self.max_key is None:
+            return True
+        return params.get(self.min_key) is not None and params.get(self.max_key) is None
+
+    def records(self, params: dict, result) -> List[dict]:
+        # drop the boundary record in case the server treats the cursor as inclusive
+        cursor = params.get(self.min_key if self._ascending(params) else self.max_key)
+        records = super().records(params, result)
+        if cursor is None:
+            return records
+        return [record for record in records if str(record.get(self.id_key)) != str(cursor)]
+
+    def next_params(self, params: dict, result, records: List[dict]) -> Optional[dict]:
+        if not records:
+            return None
+        ids = [_sort_key(record[self.id_key]) for record in records]
+        if self._ascending(params):
+            return dict(params, **{self.min_key: str(max(ids))})
+        return dict(params, **{self.max_key: str(min(ids))})
+
+
+class StartEndIdPager(IdPager):
+    """``start_id``/``end_id`` cursors ordered by ``sort`` (1 ascending, 0 descending)."""
+
+    def __init__(self, items_key: str = None, id_key: str = "id", sort_key: str = "sort"):
+        super().__init__(items_key, id_key, max_key="end_id", min_key="start_id")
+        self.sort_key = sort_key
+
+    def _ascending(self, params: dict) -> bool:
+        return params.get(self.sort_key) == 1
+
+
+class PageIndexPager(Pager):
+    """Page number pagination, ``page_index`` counts pages and starts at 0."""
+
+    def __init__(self, items_key: str = None, index_key: str = "page_index", length_key: str = "page_length",
+                 total_key: str = "total"):
+        super().__init__(items_key)
+        self.index_key = index_key
+        self.length_key = length_key
+        self.total_key = total_key
+
+    def next_params(self, params: dict, result, records: List[dict]) -> Optional[dict]:
+        if not records:
+            return None
+        index = params.get(self.index_key) or 0
+        if isinstance(result, dict) and result.get(self.total_key) is not None:
+            if (index + 1) * params[self.length_key] >= int(result[self.total_key]):
+                return None
+        return dict(params, **{self.index_key: index + 1})
+
+
+class OffsetPager(Pager):
+    """``offset``/``limit`` pagination."""
+
+    def __init__(self, items_key: str = None, offset_key: str = "offset"):
+        super().__init__(items_key)
+        self.offset_key = offset_key
+
+    def next_params(self, params: dict, result, records: List[dict]) -> Optional[dict]:
+        if not records:
+            return None
+        return dict(params, **{self.offset_key: (params.get(self.offset_key) or 0) + len(records)})
+
+
+class TimePager(Pager):
+    """Time window cursors: moves ``start_key`` forward (ascending ``order``) or
+    ``end_key`` backward to the last seen timestamp and skips the records
+    already returned at that timestamp.
+
+    A full page of ``limit_key`` records that were all returned before means
+    more records share one timestamp than fit on a page; the window cannot
+    move past them and ``PaginationError`` is raised instead of ending early.
+    """
+
+    def __init__(self, items_key: str = None, time_key: str = "created_timestamp", id_key: str = "cobo_id",
+                 start_key: str = "start_time", end_key: str = "end_time", order_key: str = "order",
+                 limit_key: str = "limit"):
+        super().__init__(items_key)
+        self.time_key = time_key
+        self.id_key = id_key
+        self.start_key = start_key
+        self.end_key = end_key
+        self.order_key = order_key
+        self.limit_key = limit_key
+        self._boundary = None
+        self._boundary_ids = set()
+
+    def records(self, params: dict, result) -> List[dict]:
+        records = super().records(params, result)
+        return [record for record in records if record.get(self.id_key) not in self._boundary_ids]
+
+    def next_params(self, params: dict, result, records: List[dict]) -> Optional[dict]:
+        if not records:
+            limit = params.get(self.limit_key)
+            if limit and len(super().records(params, result)) >= int(limit):
+                raise PaginationError(f"more than {limit} records at {self.time_key} {self._boundary}, "
+                                      f"raise {self.limit_key} to page past them")
+            return None
+        boundary = records[-1][self.time_key]
+        ids = {record.get(self.id_key) for record in records if record[self.time_key] == boundary}
+        # records at the same timestamp may span several pages, remember all of them
+        self._boundary_ids = self._boundary_ids | ids if boundary == self._boundary else ids
+        self._boundary = boundary
+        key = self.start_key if str(params.get(self.order_key, "")).lower() == "asc" else self.end_key
+        return dict(params, **{key: boundary})
+
+
+def _raise_for_error(response: ApiResponse):
+    if not response.success:
+        raise ApiException(response.exception)
+
+
+def iter_pages(request: Callable[[str, str, dict], ApiResponse], method: str, path: str, params: dict,
+               pager: Pager, prefetch: bool = True) -> Iterator[dict]:
+    """Lazily yield the records of every page of a list endpoint.
+
+    At most one page is held in memory besides the one being consumed: with
+    ``prefetch`` the next page is requested in the background while the
+    caller works through the current one.  Failed pages raise ``ApiException``.
+    """
+    def fetch(page_params: dict):
+        response = request(method, path, page_params)
+        _raise_for_error(response)
+        records = pager.records(page_params, response.result)
+        return records, pager.next_params(page_params, response.result, records)
+
+    executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+    try:
+        records, next_params = fetch(params)
+        while True:
+            future = None
+            if executor is not None and next_params is not None:
+                future = executor.submit(fetch, next_params)
+            for record in records:
+                yield record
+            if next_params is None:
+                return
+            records, next_params = future.result() if future is not None else fetch(next_params)
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+async def aiter_pages(request, method: str, path: str, params: dict,
+                      pager: Pager, prefetch: bool = True) -> AsyncIterator[dict]:
+    """Async counterpart of ``iter_pages`` for the asyncio clients."""
+    async def fetch(page_params: dict):
+        response = await request(method, path, page_params)
+        _raise_for_error(response)
+        records = pager.records(page_params, response.result)
+        return records, pager.next_params(page_params, response.result, records)
+
+    records, next_params = await fetch(params)
+    task = None
+    try:
+        while True:
+            if prefetch and next_params is not None:
+                task = asyncio.ensure_future(fetch(next_params))
+            for record in records:
+                yield record
+            if next_params is None:
+                return
+            if task is not None:
+                records, next_params = await task
+                task = None
+            else:
+                records, next_params = await fetch(next_params)
+    finally:
+        if task is not None:
+            task.cancel()
@@ -0,0 +1,124 @@
+import asyncio
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+from cobo_custody.client.api_response import ApiResponse
+
+# HTTP statuses the API answers with once a key exceeds its quota
+RATE_LIMIT_STATUS_CODES = (429,)
+
+
+class TokenBucket(object):
+    """Thread safe token bucket refilled at ``rate`` tokens per second.
+
+    Callers reserve a token under a lock and sleep outside of it, which lets
+    the same bucket be shared by threads and asyncio tasks alike.  The rate
+    is halved when the server reports a rate limit and recovers additively
+    with every successful response.  Reports arriving within ``cooldown``
+    seconds of a halving, by default the time the bucket takes to refill,
+    are answers to requests sent before it and are ignored.
+    """
+
+    def __init__(self, rate: float, burst: int = None, min_rate: float = None, cooldown: float = None):
+        self.max_rate = rate
+        self.min_rate = min_rate if min_rate is not None else rate / 32
+        self.burst = burst if burst is not None else max(1, int(rate))
+        self.cooldown = cooldown
+        self._rate = rate
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._cooldown_until = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """Take one token and return how many seconds the caller has to wait for it."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self._rate
+
+    def acquire(self):
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self):
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def throttle(self):
+        with self._lock:
+            now = time.monotonic()
+            if now < self._cooldown_until:
+                return
+            self._refill(now)
+            self._rate = max(self.min_rate, self._rate / 2)
+            self._tokens = min(self._tokens, 0.0)
+            self._cooldown_until = now + (self.burst / self._rate if self.cooldown is None else self.cooldown)
+
+    def recover(self):
+        if self._rate >= self.max_rate:
+            return
+        with self._lock:
+            self._refill(time.monotonic())
+            self._rate = min(self.max_rate, self._rate + self.max_rate / 20)
+
+
+class RateLimiter(object):
+    """Client side quota made of one token bucket per API path prefix.
+
+    ``rate`` and ``burst`` configure the bucket used for every path without a
+    more specific rule, ``path_rates`` maps path prefixes such as
+    ``/v1/custody/mpc/`` to their own ``(rate, burst)``; the longest matching
+    prefix wins.  A response is a rate limit report when its HTTP status is
+    in ``rate_limit_status_codes`` or its Cobo error code in
+    ``rate_limit_error_codes``.  No error codes are built in, so they have to
+    be given; pass ``()`` to back off on HTTP statuses only.
+    """
+
+    def __init__(self, rate: float = 10, burst: int = None,
+                 path_rates: Dict[str, Tuple[float, Optional[int]]] = None, *,
+                 rate_limit_error_codes: Iterable[int],
+                 rate_limit_status_codes: Iterable[int] = RATE_LIMIT_STATUS_CODES):
+        self.default_bucket = TokenBucket(rate, burst)
+        self.path_buckets = sorted(((prefix, TokenBucket(prefix_rate, prefix_burst))
+                                    for prefix, (prefix_rate, prefix_burst) in (path_rates or {}).items()),
+                                   key=lambda item: len(item[0]), reverse=True)
+        self.rate_limit_error_codes = frozenset(rate_limit_error_codes)
+        self.rate_limit_status_codes = frozenset(rate_limit_status_codes)
+
+    def bucket(self, path: str) -> TokenBucket:
+        for prefix, bucket in self.path_buckets:
+            if path.startswith(prefix):
+                return bucket
+        return self.default_bucket
+
+    def acquire(self, path: str):
+        self.bucket(path).acquire()
+
+    async def acquire_async(self, path: str):
+        await self.bucket(path).acquire_async()
+
+    def is_rate_limited(self, response: ApiResponse, status_code: int = None) -> bool:
+        if status_code in self.rate_limit_status_codes:
+            return True
+        return response is not None and not response.success and response.exception is not None and \
+            response.exception.errorCode in self.rate_limit_error_codes
+
+    def feedback(self, path: str, response: ApiResponse, status_code: int = None):
+        if self.is_rate_limited(response, status_code):
+            self.bucket(path).throttle()
+        else:
+            self.bucket(path).recover()
@@ -0,0 +1,221 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from cobo_custody.client.api_response import ApiResponse
+from cobo_custody.client.async_client import AsyncRequestMixin
+from cobo_custody.client.paginator import page_records
+from cobo_custody.error.api_error import ApiException
+
+# client methods taking a comma joined id list: (ids param, result list key, record id key)
+BATCHED_METHODS = {
+    "get_transactions_by_request_ids": ("request_ids", None, "request_id"),
+    "transactions_by_request_ids": ("request_ids", "transactions", "request_id"),
+    "transactions_by_cobo_ids": ("cobo_ids", "transactions", "cobo_id"),
+    "sign_messages_by_request_ids": ("request_ids", "sign_messages", "request_id"),
+}
+
+
+def _fan_out(batch: Dict[str, list], response: ApiResponse, items_key: Optional[str], id_key: str):
+    if not response.success:
+        error = ApiException(response.exception)
+        _fail(batch, error)
+        return
+    records = {str(record.get(id_key)): record for record in page_records(response.result, items_key)}
+    for item_id, futures in batch.items():
+        for future in futures:
+            # asyncio waiters may have been cancelled meanwhile
+            if not future.done():
+                future.set_result(records.get(item_id))
+
+
+def _fail(batch: Dict[str, list], error: BaseException):
+    for futures in batch.values():
+        for future in futures:
+            if not future.done():
+                future.set_exception(error)
+
+
+class RequestBatcher(object):
+    """Collects single id lookups into combined requests.
+
+    ``submit`` returns a future for one id.  Ids are gathered until
+    ``max_batch_size`` distinct ids are pending or the oldest one has waited
+    ``window`` seconds, then ``fetch`` is called once with the whole list and
+    every future resolves to the record whose ``id_key`` matches its id, or
+    ``None`` when the API did not return it.  A failed API call raises
+    ``ApiException`` from every future of the batch.
+
+    Up to ``max_concurrency`` batches are in flight at once.
+    """
+
+    def __init__(self, fetch: Callable[[List[str]], ApiResponse], id_key: str, items_key: str = None,
+                 max_batch_size: int = 50, window: float = 0.02, max_concurrency: int = 4):
+        self.fetch = fetch
+        self.id_key = id_key
+        self.items_key = items_key
+        self.max_batch_size = max_batch_size
+        self.window = window
+        self._pending: "OrderedDict[str, List[Future]]" = OrderedDict()
+        self._deadline = 0.0
+        self._cond = threading.Condition()
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="cobo-batcher")
+        self._collector = None
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def submit(self, item_id) -> Future:
+        future = Future()
+        item_id = str(item_id)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("batcher is closed")
+            if not self._pending:
+                self._deadline = time.monotonic() + self.window
+            self._pending.setdefault(item_id, []).append(future)
+            if self._collector is None:
+                self._collector = threading.Thread(target=self._collect, name="cobo-batcher-collector", daemon=True)
+                self._collector.start()
+            self._cond.notify()
+        return future
+
+    def get(self, item_id, timeout: float = None) -> Optional[dict]:
+        return self.submit(item_id).result(timeout)
+
+    def _take_batch(self) -> Dict[str, List[Future]]:
+        batch = {}
+        while self._pending and len(batch) < self.max_batch_size:
+            item_id, futures = self._pending.popitem(last=False)
+            futures = [future for future in futures if future.set_running_or_notify_cancel()]
+            if futures:
+                batch[item_id] = futures
+        return batch
+
+    def _collect(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                while len(self._pending) < self.max_batch_size and not self._closed:
+                    remaining = self._deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = self._take_batch()
+            if batch:
+                self._executor.submit(self._execute, batch)
+
+    def _execute(self, batch: Dict[str, List[Future]]):
+        try:
+            response = self.fetch(list(batch))
+        except BaseException as e:
+            _fail(batch, e)
+            return
+        _fan_out(batch, response, self.items_key, self.id_key)
+
+    def close(self):
+        """Flush the pending ids and wait for every batch to finish."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+            collector = self._collector
+        if collector is not None:
+            collector.join()
+        self._executor.shutdown(wait=True)
+
+
+class AsyncRequestBatcher(object):
+    """Event loop counterpart of ``RequestBatcher`` for the asyncio clients."""
+
+    def __init__(self, fetch: Callable[[List[str]], Awaitable[ApiResponse]], id_key: str, items_key: str = None,
+                 max_batch_size: int = 50, window: float = 0.02):
+        self.fetch = fetch
+        self.id_key = id_key
+        self.items_key = items_key
+        self.max_batch_size = max_batch_size
+        self.window = window
+        self._pending: "OrderedDict[str, List[asyncio.Future]]" = OrderedDict()
+        self._timer = None
+        self._tasks = set()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    def submit(self, item_id) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        item_id = str(item_id)
+        if not self._pending:
+            self._timer = loop.call_later(self.window, self._flush)
+        self._pending.setdefault(item_id, []).append(future)
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        return future
+
+    async def get(self, item_id) -> Optional[dict]:
+        return await self.submit(item_id)
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._pending:
+            batch = {}
+            while self._pending and len(batch) < self.max_batch_size:
+                item_id, futures = self._pending.popitem(last=False)
+                futures = [future for future in futures if not future.done()]
+                if futures:
+                    batch[item_id] = futures
+            if batch:
+                task = asyncio.ensure_future(self._execute(batch))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+    async def _execute(self, batch: Dict[str, List[asyncio.Future]]):
+        try:
+            response = await self.fetch(list(batch))
+        except asyncio.CancelledError:
+            for futures in batch.values():
+                for future in futures:
+                    future.cancel()
+            raise
+        except BaseException as e:
+            _fail(batch, e)
+            return
+        _fan_out(batch, response, self.items_key, self.id_key)
+
+    async def close(self):
+        """Flush the pending ids and wait for every batch to finish."""
+        self._flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+def batcher_for(method: Callable[..., ApiResponse], max_batch_size: int = 50, window: float = 0.02, **params):
+    """Build a batcher for one of the ``BATCHED_METHODS`` of a client, e.g.
+    ``batcher_for(mpc_client.transactions_by_request_ids, status=501)``.
+
+    Extra keyword arguments are passed to every combined call.  Methods of the
+    asyncio clients get an ``AsyncRequestBatcher``.
+    """
+    ids_param, items_key, id_key = BATCHED_METHODS[method.__name__]
+
+    def fetch(ids: List[str]):
+        return method(**{ids_param: ",".join(ids)}, **params)
+
+    if isinstance(getattr(method, "__self__", None), AsyncRequestMixin):
+        return AsyncRequestBatcher(fetch, id_key, items_key, max_batch_size, window)
+    return RequestBatcher(fetch, id_key, items_key, max_batch_size, window)
@@ -0,0 +1,124 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from cobo_custody.client.api_response import ApiResponse
+from cobo_custody.client.prepared_request import canonical_query, clean_params
+from cobo_custody.client.single_flight import AsyncSingleFlight, SingleFlight
+
+# endpoints returning near static reference data and how long (seconds) to keep their responses; wallet
+# scoped endpoints such as custody coin_info (which carries the balance) do not belong here
+REFERENCE_ENDPOINT_TTLS = {
+    "/v1/custody/get_supported_coins/": 300,
+    "/v1/custody/mpc/get_supported_chains/": 300,
+    "/v1/custody/mpc/get_supported_coins/": 300,
+    "/v1/custody/mpc/get_supported_nft_collections/": 300,
+    "/v1/custody/mpc/coin_info/": 60,
+    "/v1/custody/web3_supported_chains/": 300,
+    "/v1/custody/web3_supported_coins/": 300,
+    "/v1/custody/web3_supported_nft_collections/": 300,
+    "/v1/custody/web3_supported_contracts/": 300,
+    "/v1/custody/web3_supported_contract_methods/": 300,
+}
+
+# host, API key, path and canonical query
+CacheKey = Tuple[str, str, str, str]
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+
+
+class ResponseCache(object):
+    """LRU cache of successful GET responses with a TTL per endpoint path.
+
+    Only paths listed in ``ttls`` are cached, keyed by API host, API key,
+    path and canonical params, so clients of different environments, orgs or
+    wallets may share one instance without seeing each other's data.
+    Concurrent misses on the same key are coalesced so only one of them
+    reaches the API.
+
+    Every caller of a cached request receives the same ``ApiResponse``
+    object; treat it as read-only.
+    """
+
+    def __init__(self, ttls: Dict[str, float] = None, max_size: int = 1024):
+        self.ttls = dict(REFERENCE_ENDPOINT_TTLS if ttls is None else ttls)
+        self.max_size = max_size
+        self._entries: "OrderedDict[CacheKey, Tuple[float, ApiResponse]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+        self._async_flight = AsyncSingleFlight()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def make_key(path: str, params: dict, host: str = "", api_key: str = "") -> CacheKey:
+        return host, api_key, path, canonical_query(clean_params(params or {}))
+
+    def ttl_for(self, path: str) -> Optional[float]:
+        return self.ttls.get(path)
+
+    def get(self, key: CacheKey) -> Optional[ApiResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[1]
+
+    def put(self, key: CacheKey, response: ApiResponse, ttl: float):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def _store(self, key: CacheKey, ttl: float, response: ApiResponse) -> ApiResponse:
+        if response.success:
+            self.put(key, response, ttl)
+        return response
+
+    def get_or_load(self, key: CacheKey, ttl: float, load: Callable[[], ApiResponse]) -> ApiResponse:
+        response = self.get(key)
+        if response is not None:
+            return response
+        return self._flight.do(key, lambda: self._store(key, ttl, load()))
+
+    async def get_or_load_async(self, key: CacheKey, ttl: float,
+                                load: Callable[[], Awaitable[ApiResponse]]) -> ApiResponse:
+        response = self.get(key)
+        if response is not None:
+            return response
+
+        async def load_and_store():
+            return self._store(key, ttl, await load())
+
+        return await self._async_flight.do(key, load_and_store)
+
+    def invalidate(self, path: str = None, params: dict = None):
+        """Drop the entries of ``path`` and ``params``, every entry of ``path``, or everything,
+        for all hosts and API keys."""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                return
+            query = None if params is None else self.make_key(path, params)[3]
+            for key in [key for key in self._entries if key[2] == path and query in (None, key[3])]:
+                del self._entries[key]
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(self._hits, self._misses, self._evictions, len(self._entries))
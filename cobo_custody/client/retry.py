@@ -0,0 +1,84 @@
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, Iterable
+
+import requests
+
+from cobo_custody.client.api_response import ApiResponse
+from cobo_custody.error.api_error import HttpStatusError
+
+RETRYABLE_EXCEPTIONS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    ConnectionError,
+    TimeoutError,
+    HttpStatusError,
+)
+
+
+class RetryPolicy(object):
+    """Decides whether a failed call may be sent again and how long to wait.
+
+    GET requests are always safe to replay.  POST requests are only replayed
+    when they carry an ``idempotency_key`` (``request_id`` for every Cobo
+    endpoint that creates something), since the server deduplicates on it.
+    Every attempt goes through the whole request path again, so it is signed
+    with a fresh nonce.  Waits use exponential backoff with full jitter.
+    """
+
+    def __init__(self, max_attempts: int = 3, backoff_base: float = 0.2, backoff_max: float = 5.0,
+                 jitter: bool = True, retry_exceptions: tuple = RETRYABLE_EXCEPTIONS,
+                 retry_status_codes: Iterable[int] = (502, 503, 504),
+                 retry_error_codes: Iterable[int] = (), idempotency_key: str = "request_id"):
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.retry_exceptions = retry_exceptions
+        self.retry_status_codes = frozenset(retry_status_codes)
+        self.retry_error_codes = frozenset(retry_error_codes)
+        self.idempotency_key = idempotency_key
+
+    def is_replayable(self, method: str, params: dict) -> bool:
+        if method == "GET":
+            return True
+        return method == "POST" and bool(params.get(self.idempotency_key))
+
+    def should_retry(self, method: str, params: dict, attempt: int, response: ApiResponse = None,
+                     exception: Exception = None) -> bool:
+        if attempt >= self.max_attempts or not self.is_replayable(method, params):
+            return False
+        if exception is not None:
+            return isinstance(exception, self.retry_exceptions)
+        return response.exception is not None and response.exception.errorCode in self.retry_error_codes
+
+    def backoff(self, attempt: int) -> float:
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+        return random.uniform(0, delay) if self.jitter else delay
+
+    def call(self, method: str, params: dict, send: Callable[[], ApiResponse]) -> ApiResponse:
+        attempt = 1
+        while True:
+            try:
+                response = send()
+                if not self.should_retry(method, params, attempt, response=response):
+                    return response
+            except Exception as e:
+                if not self.should_retry(method, params, attempt, exception=e):
+                    raise
+            time.sleep(self.backoff(attempt))
+            attempt += 1
+
+    async def call_async(self, method: str, params: dict, send: Callable[[], Awaitable[ApiResponse]]) -> ApiResponse:
+        attempt = 1
+        while True:
+            try:
+                response = await send()
+                if not self.should_retry(method, params, attempt, response=response):
+                    return response
+            except Exception as e:
+                if not self.should_retry(method, params, attempt, exception=e):
+                    raise
+            await asyncio.sleep(self.backoff(attempt))
+            attempt += 1
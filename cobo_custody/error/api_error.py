@@ -6,3 +6,24 @@ class ApiError:
     errorCode: int
     errorMessage: str
     errorId: str
+
+
+class ApiException(Exception):
+    """Raised where an ``ApiError`` cannot be handed back inside an ``ApiResponse``,
+    e.g. from the ``iter_*`` pagination helpers."""
+
+    def __init__(self, error: ApiError):
+        super().__init__(f"{error.errorCode} {error.errorMessage} ({error.errorId})")
+        self.error = error
+
+
+class HttpStatusError(Exception):
+    """Raised when the API answers with an HTTP status the retry policy treats as transient."""
+
+    def __init__(self, status_code: int):
+        super().__init__(f"unexpected http status {status_code}")
+        self.status_code = status_code
+
+
+class PaginationError(Exception):
+    """Raised when a list endpoint cannot be paged any further without skipping records."""
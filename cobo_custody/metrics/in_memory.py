@@ -0,0 +1,90 @@
+import bisect
+import threading
+from collections import defaultdict
+from typing import Dict, List, Sequence, Tuple
+
+from cobo_custody.metrics.metrics_sink import MetricsSink
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram(object):
+    """Fixed bucket histogram, ``counts[i]`` counts values up to ``buckets[i]``
+    and the last slot everything above the largest bucket."""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative_counts(self) -> List[int]:
+        total = 0
+        result = []
+        for count in self.counts:
+            total += count
+            result.append(total)
+        return result
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the ``q`` quantile."""
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        for bound, cumulative in zip(self.buckets + (float("inf"),), self.cumulative_counts()):
+            if cumulative >= rank:
+                return bound
+        return float("inf")
+
+
+class InMemoryMetrics(MetricsSink):
+    """Thread safe registry of per path latency, phase and payload statistics."""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self.latency: Dict[Tuple[str, str], Histogram] = {}
+        self.phases: Dict[Tuple[str, str], Histogram] = {}
+        self.request_bytes: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.response_bytes: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.errors: Dict[Tuple[str, str, str], int] = defaultdict(int)
+
+    def _histogram(self, histograms: dict, key) -> Histogram:
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = Histogram(self.buckets)
+        return histogram
+
+    def observe_request(self, method: str, path: str, seconds: float, phases: Dict[str, float],
+                        request_bytes: int, response_bytes: int):
+        with self._lock:
+            self._histogram(self.latency, (method, path)).observe(seconds)
+            for phase, phase_seconds in phases.items():
+                self._histogram(self.phases, (path, phase)).observe(phase_seconds)
+            self.request_bytes[(method, path)] += request_bytes
+            self.response_bytes[(method, path)] += response_bytes
+
+    def count_error(self, method: str, path: str, error_code: str):
+        with self._lock:
+            self.errors[(method, path, error_code)] += 1
+
+    def summary(self) -> Dict[str, dict]:
+        """Per ``METHOD path`` request count, mean and tail latency and mean phase times."""
+        with self._lock:
+            result = {}
+            for (method, path), histogram in self.latency.items():
+                result[f"{method} {path}"] = {
+                    "count": histogram.count,
+                    "mean": histogram.sum / histogram.count,
+                    "p50": histogram.quantile(0.5),
+                    "p99": histogram.quantile(0.99),
+                    "phases": {phase: phase_histogram.sum / phase_histogram.count
+                               for (phase_path, phase), phase_histogram in self.phases.items()
+                               if phase_path == path},
+                }
+            return result
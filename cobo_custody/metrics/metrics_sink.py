@@ -0,0 +1,18 @@
+from abc import abstractmethod, ABCMeta
+from typing import Dict
+
+
+class MetricsSink(metaclass=ABCMeta):
+    """Receives one observation per request sent through a client pipeline."""
+
+    @abstractmethod
+    def observe_request(self, method: str, path: str, seconds: float, phases: Dict[str, float],
+                        request_bytes: int, response_bytes: int):
+        """``phases`` maps pipeline phases (``rate_limit``, ``nonce``, ``sign``,
+        ``http``, ``verify``, ``parse``, ...) to the seconds spent in them."""
+        pass
+
+    @abstractmethod
+    def count_error(self, method: str, path: str, error_code: str):
+        """Count a failed request, by API error code or exception class name."""
+        pass
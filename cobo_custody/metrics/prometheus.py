@@ -0,0 +1,59 @@
+from typing import List
+
+from cobo_custody.metrics.in_memory import Histogram, InMemoryMetrics
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _format_bound(bound: float) -> str:
+    return "+Inf" if bound == float("inf") else repr(float(bound))
+
+
+class PrometheusExporter(object):
+    """Renders an ``InMemoryMetrics`` registry in the Prometheus text format,
+    ready to be served from any ``/metrics`` endpoint."""
+
+    def __init__(self, metrics: InMemoryMetrics, namespace: str = "cobo"):
+        self.metrics = metrics
+        self.namespace = namespace
+
+    def _histogram(self, lines: List[str], name: str, histogram: Histogram, **labels):
+        bounds = histogram.buckets + (float("inf"),)
+        for bound, cumulative in zip(bounds, histogram.cumulative_counts()):
+            lines.append(f"{name}_bucket{_labels(**labels, le=_format_bound(bound))} {cumulative}")
+        lines.append(f"{name}_sum{_labels(**labels)} {histogram.sum}")
+        lines.append(f"{name}_count{_labels(**labels)} {histogram.count}")
+
+    def render(self) -> str:
+        metrics = self.metrics
+        ns = self.namespace
+        lines = []
+        with metrics._lock:
+            lines.append(f"# HELP {ns}_request_duration_seconds Latency of Cobo API requests.")
+            lines.append(f"# TYPE {ns}_request_duration_seconds histogram")
+            for (method, path), histogram in sorted(metrics.latency.items()):
+                self._histogram(lines, f"{ns}_request_duration_seconds", histogram, method=method, path=path)
+
+            lines.append(f"# HELP {ns}_request_phase_seconds Time spent in each request pipeline phase.")
+            lines.append(f"# TYPE {ns}_request_phase_seconds histogram")
+            for (path, phase), histogram in sorted(metrics.phases.items()):
+                self._histogram(lines, f"{ns}_request_phase_seconds", histogram, path=path, phase=phase)
+
+            for name, sizes, help_text in (("request_bytes", metrics.request_bytes, "Canonical request payload size."),
+                                           ("response_bytes", metrics.response_bytes, "Response body size.")):
+                lines.append(f"# HELP {ns}_{name}_total {help_text}")
+                lines.append(f"# TYPE {ns}_{name}_total counter")
+                for (method, path), size in sorted(sizes.items()):
+                    lines.append(f"{ns}_{name}_total{_labels(method=method, path=path)} {size}")
+
+            lines.append(f"# HELP {ns}_request_errors_total Failed requests by error code.")
+            lines.append(f"# TYPE {ns}_request_errors_total counter")
+            for (method, path, code), count in sorted(metrics.errors.items()):
+                lines.append(f"{ns}_request_errors_total{_labels(method=method, path=path, code=code)} {count}")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,67 @@
+import time
+from typing import Optional
+
+from cobo_custody.client.api_response import ApiResponse
+from cobo_custody.metrics.metrics_sink import MetricsSink
+
+
+class RequestTimer(object):
+    """Splits the time of one request into pipeline phases.
+
+    Each ``mark`` charges the time elapsed since the previous mark to the
+    named phase; ``finish`` reports everything to the sink in one call.
+    """
+
+    def __init__(self, sink: MetricsSink, method: str, path: str):
+        self.sink = sink
+        self.method = method
+        self.path = path
+        self.phases = {}
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self._start = self._last = time.perf_counter()
+
+    def mark(self, phase: str):
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + now - self._last
+        self._last = now
+
+    def add(self, phase: str, seconds: float):
+        """Charge ``seconds`` spent before the timer started, e.g. preparing the request, to ``phase``."""
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def record_request_size(self, size: int):
+        self.request_bytes = size
+
+    def record_response_size(self, size: int):
+        self.response_bytes = size
+
+    def finish(self, response: Optional[ApiResponse] = None, exception: Exception = None):
+        self.sink.observe_request(self.method, self.path, time.perf_counter() - self._start, self.phases,
+                                  self.request_bytes, self.response_bytes)
+        if exception is not None:
+            self.sink.count_error(self.method, self.path, type(exception).__name__)
+        elif response is not None and response.exception is not None:
+            self.sink.count_error(self.method, self.path, str(response.exception.errorCode))
+
+
+class NullTimer(object):
+    """Stands in for ``RequestTimer`` when metrics are disabled."""
+
+    def mark(self, phase: str):
+        pass
+
+    def add(self, phase: str, seconds: float):
+        pass
+
+    def record_request_size(self, size: int):
+        pass
+
+    def record_response_size(self, size: int):
+        pass
+
+    def finish(self, response: Optional[ApiResponse] = None, exception: Exception = None):
+        pass
+
+
+NULL_TIMER = NullTimer()
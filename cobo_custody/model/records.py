@@ -0,0 +1,163 @@
+import sys
+from decimal import Decimal, InvalidOperation
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator, Optional, Type, TypeVar, Union
+
+Amount = Union[int, Decimal]
+R = TypeVar("R", bound="Record")
+_MISSING = object()
+
+
+def parse_amount(value) -> Optional[Amount]:
+    """Integer amounts (base units) become ``int``, fractional ones ``Decimal``."""
+    if value is None or isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return Decimal(repr(value))
+    if value == "":
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        return Decimal(value)
+    except InvalidOperation:
+        raise ValueError(f"invalid amount: {value!r}")
+
+
+class Record(object):
+    """Compact ``__slots__`` record built from one parsed JSON object.
+
+    Only the keys listed in ``FIELDS`` get a slot, missing ones are ``None``;
+    keys the model does not know are kept in ``extra`` (``None`` when there
+    are none) so nothing returned by the API is lost.  Keys listed in
+    ``AMOUNTS`` are parsed once with ``parse_amount``, as are the keys listed
+    per nested object in ``NESTED_AMOUNTS`` (into a copy of that object), and
+    the low cardinality strings listed in ``INTERNED`` (coin, status, ...)
+    are shared between records instead of stored once per record.
+
+    Records compare equal when their ``to_dict`` is equal and hash by their
+    ``KEY`` fields, the id of the record on the API; don't change those
+    fields while a record is in a set or a dict key.
+    """
+    FIELDS = ()
+    FIELD_SET = frozenset()
+    KEY = ()
+    AMOUNTS = frozenset()
+    NESTED_AMOUNTS = {}
+    INTERNED = frozenset()
+    __slots__ = ("extra",)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.FIELD_SET = frozenset(cls.FIELDS)
+
+    @classmethod
+    def from_dict(cls: Type[R], data: dict) -> R:
+        record = cls.__new__(cls)
+        amounts = cls.AMOUNTS
+        nested = cls.NESTED_AMOUNTS
+        interned = cls.INTERNED
+        known = 0
+        for name in cls.FIELDS:
+            value = data.get(name, _MISSING)
+            if value is _MISSING:
+                value = None
+            else:
+                known += 1
+                if name in amounts:
+                    value = parse_amount(value)
+                elif name in nested and type(value) is dict:
+                    value = {key: parse_amount(item) if key in nested[name] else item for key, item in value.items()}
+                elif name in interned and type(value) is str:
+                    value = sys.intern(value)
+            setattr(record, name, value)
+        if known < len(data):
+            record.extra = {key: value for key, value in data.items() if key not in cls.FIELD_SET}
+        else:
+            record.extra = None
+        return record
+
+    def to_dict(self) -> dict:
+        result = {name: getattr(self, name) for name in self.FIELDS}
+        if self.extra:
+            result.update(self.extra)
+        return result
+
+    def __eq__(self, other):
+        return type(other) is type(self) and self.to_dict() == other.to_dict()
+
+    def __hash__(self):
+        return hash((type(self), tuple(getattr(self, name) for name in self.KEY)))
+
+    def __repr__(self):
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.FIELDS if getattr(self, name) is not None)
+        return f"{type(self).__name__}({values})"
+
+
+class Transaction(Record):
+    """Custody wallet transaction, e.g. from ``Client.iter_transactions_by_time_ex``."""
+    FIELDS = ("id", "coin", "display_code", "description", "decimal", "address", "source_address", "side",
+              "amount", "abs_amount", "txid", "vout_n", "request_id", "status", "abs_cobo_fee", "created_time",
+              "last_time", "confirmed_num", "confirming_threshold", "memo", "fee_coin", "fee_amount", "fee_decimal",
+              "type", "tx_detail")
+    KEY = ("id",)
+    AMOUNTS = frozenset(("amount", "abs_amount", "abs_cobo_fee", "fee_amount"))
+    INTERNED = frozenset(("coin", "display_code", "description", "side", "status", "fee_coin", "type"))
+    __slots__ = FIELDS
+
+
+class MPCTransaction(Record):
+    """MPC wallet transaction, e.g. from ``MPCClient.iter_transactions``."""
+    FIELDS = ("cobo_id", "request_id", "chain_code", "coin_detail", "amount_detail", "fee_detail", "raw_tx_info",
+              "replace_cobo_id", "transaction_type", "operation", "status", "failed_reason", "from_address",
+              "to_address", "tx_hash", "nonce", "max_fee", "gas_price", "gas_limit", "confirmed_num",
+              "created_timestamp", "updated_timestamp", "remark")
+    KEY = ("cobo_id",)
+    AMOUNTS = frozenset(("max_fee", "gas_price", "gas_limit"))
+    NESTED_AMOUNTS = {"amount_detail": frozenset(("amount", "abs_amount")),
+                      "fee_detail": frozenset(("fee_used", "gas_price", "gas_limit", "max_fee", "max_priority_fee",
+                                               "fee_amount", "abs_fee_amount"))}
+    INTERNED = frozenset(("chain_code", "failed_reason"))
+    __slots__ = FIELDS
+
+
+class Balance(Record):
+    """Balance of one coin at one address, e.g. from ``MPCClient.iter_balances``."""
+    FIELDS = ("coin", "chain_code", "display_code", "description", "decimal", "address", "balance", "abs_balance",
+              "can_deposit", "can_withdraw")
+    KEY = ("coin", "address")
+    AMOUNTS = frozenset(("balance", "abs_balance"))
+    INTERNED = frozenset(("coin", "chain_code", "display_code", "description"))
+    __slots__ = FIELDS
+
+
+class Address(Record):
+    """Wallet address, e.g. from ``MPCClient.iter_addresses`` or ``Client.new_deposit_address``."""
+    FIELDS = ("id", "address", "coin", "chain_code", "encoding", "hd_path", "memo")
+    KEY = ("address", "memo")
+    INTERNED = frozenset(("coin", "chain_code"))
+    __slots__ = FIELDS
+
+
+class Spendable(Record):
+    """Unspent output, e.g. from ``MPCClient.list_spendable``."""
+    FIELDS = ("tx_hash", "vout_n", "address", "value", "confirmed_number", "is_coinbase", "status")
+    KEY = ("tx_hash", "vout_n")
+    AMOUNTS = frozenset(("value",))
+    INTERNED = frozenset(("status",))
+    __slots__ = FIELDS
+
+
+def to_models(model: Type[R], records: Iterable[dict]) -> Iterator[R]:
+    """Lazily turn parsed records into ``model`` instances, one at a time, so
+    ``to_models(MPCTransaction, mpc_client.iter_transactions())`` never holds
+    more than a page of dicts."""
+    for record in records:
+        yield model.from_dict(record)
+
+
+async def ato_models(model: Type[R], records: AsyncIterable[dict]) -> AsyncIterator[R]:
+    """Async iterator counterpart of ``to_models`` for the asyncio clients."""
+    async for record in records:
+        yield model.from_dict(record)
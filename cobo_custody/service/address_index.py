@@ -0,0 +1,181 @@
+import json
+import sqlite3
+import threading
+from typing import Iterable, Optional
+
+from cobo_custody.client.api_response import ApiResponse
+from cobo_custody.client.client import Client
+from cobo_custody.client.mpc_client import MPCClient
+from cobo_custody.client.paginator import PageIndexPager
+from cobo_custody.client.web3_client import Web3Client
+from cobo_custody.error.api_error import ApiException
+from cobo_custody.model.enums import SortFlagEnum
+
+# wallets whose addresses are indexed, each with its own namespace of networks
+CUSTODY = "custody"
+MPC = "mpc"
+WEB3 = "web3"
+
+
+class AddressIndex(object):
+    """Local SQLite index of the wallet's own addresses.
+
+    Addresses are keyed by wallet (``CUSTODY``, ``MPC`` or ``WEB3``) and
+    network, the coin for the custody wallet and the chain code for the MPC
+    and Web3 wallets, and loaded from
+    ``MPCClient.list_addresses``, ``Web3Client.get_web3_address_list`` and
+    the results of ``Client.new_deposit_address`` /
+    ``batch_new_deposit_address``.  ``refresh_*`` only pulls the addresses
+    added since the previous refresh and their progress is kept in the
+    database, so a restart does not reload everything.
+
+    The ``verify_deposit_address``, ``is_loop_address`` and
+    ``is_valid_address`` checks answer from the addresses of their own
+    wallet and only call the API on a miss, raising ``ValueError`` when the
+    client it needs was not given; addresses the API confirms as ours are
+    added to the index.
+    """
+
+    def __init__(self, path: str = ":memory:", client: Client = None, mpc_client: MPCClient = None,
+                 web3_client: Web3Client = None):
+        self.path = path
+        self.client = client
+        self.mpc_client = mpc_client
+        self.web3_client = web3_client
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            if path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS address_index_address "
+                               "(wallet TEXT NOT NULL, network TEXT NOT NULL, address TEXT NOT NULL, "
+                               "PRIMARY KEY (wallet, network, address)) WITHOUT ROWID")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS address_index_source "
+                               "(source TEXT PRIMARY KEY, state TEXT NOT NULL)")
+
+    @staticmethod
+    def _key(address: str, memo: str = None) -> str:
+        # custody addresses of memo coins are returned as "address|memo"
+        return f"{address}|{memo}" if memo else address
+
+    def add(self, wallet: str, network: str, addresses: Iterable[str], source_state: tuple = None) -> int:
+        """Add ``addresses`` of ``network`` in ``wallet``, optionally saving a source's refresh
+        progress in the same transaction.  Returns how many were new."""
+        rows = [(wallet, network, address) for address in addresses if address]
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany("INSERT OR IGNORE INTO address_index_address (wallet, network, address) "
+                                   "VALUES (?, ?, ?)", rows)
+            added = self._conn.total_changes - before
+            if source_state is not None:
+                source, state = source_state
+                self._conn.execute("INSERT OR REPLACE INTO address_index_source (source, state) VALUES (?, ?)",
+                                   (source, json.dumps(state)))
+        return added
+
+    def contains(self, wallet: str, network: str, address: str, memo: str = None) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM address_index_address "
+                                     "WHERE wallet = ? AND network = ? AND address = ?",
+                                     (wallet, network, self._key(address, memo))).fetchone()
+        return row is not None
+
+    def count(self, wallet: str = None, network: str = None) -> int:
+        query, args = "SELECT COUNT(*) FROM address_index_address WHERE 1 = 1", []
+        if wallet is not None:
+            query, args = query + " AND wallet = ?", args + [wallet]
+        if network is not None:
+            query, args = query + " AND network = ?", args + [network]
+        with self._lock:
+            return self._conn.execute(query, args).fetchone()[0]
+
+    def _source_state(self, source: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT state FROM address_index_source WHERE source = ?", (source,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def add_new_addresses(self, coin: str, response: ApiResponse) -> int:
+        """Index the result of ``Client.new_deposit_address`` or ``batch_new_deposit_address``."""
+        if not response.success or not response.result:
+            return 0
+        result = response.result
+        addresses = result.get("addresses") or [result.get("address")]
+        if isinstance(addresses, str):
+            addresses = addresses.split(",")
+        return self.add(CUSTODY, result.get("coin") or coin, addresses)
+
+    def refresh_mpc(self, chain_code: str, limit: int = 500) -> int:
+        """Pull the MPC addresses of ``chain_code`` created since the last refresh."""
+        source = f"mpc:{chain_code}"
+        state = self._source_state(source) or {}
+        added = 0
+        batch = []
+        last_id = state.get("start_id")
+        for record in self.mpc_client.iter_addresses(chain_code, start_id=last_id, limit=limit, sort=1):
+            batch.append(record["address"])
+            last_id = str(record["id"])
+            if len(batch) >= limit:
+                added += self.add(MPC, chain_code, batch, (source, {"start_id": last_id}))
+                batch = []
+        if batch:
+            added += self.add(MPC, chain_code, batch, (source, {"start_id": last_id}))
+        return added
+
+    def refresh_web3(self, chain_code: str, page_length: int = 50) -> int:
+        """Pull the Web3 wallet addresses of ``chain_code`` added since the last refresh."""
+        source = f"web3:{chain_code}"
+        state = self._source_state(source) or {}
+        loaded = state.get("loaded", 0)
+        # oldest first, so new addresses only ever append pages; resume at the last partial page
+        params = {"chain_code": chain_code, "page_index": loaded // page_length, "page_length": page_length,
+                  "sort_flag": SortFlagEnum.ASCENDING.value}
+        pager = PageIndexPager(items_key="addresses")
+        added = 0
+        while params is not None:
+            response = self.web3_client.get_web3_address_list(**params)
+            if not response.success:
+                raise ApiException(response.exception)
+            records = pager.records(params, response.result)
+            if records:
+                loaded = params["page_index"] * page_length + len(records)
+                added += self.add(WEB3, chain_code, [record["address"] for record in records],
+                                  (source, {"loaded": loaded}))
+            params = pager.next_params(params, response.result, records)
+        return added
+
+    def verify_deposit_address(self, coin: str, address: str, memo: str = None) -> bool:
+        """Whether ``address`` (with ``memo`` for memo coins) is a deposit address of the custody wallet."""
+        key = self._key(address, memo)
+        if self.contains(CUSTODY, coin, key):
+            return True
+        response = self._require(self.client, "client").verify_deposit_address(coin, key)
+        if not response.success or not response.result:
+            return False
+        self.add(CUSTODY, coin, [key])
+        return True
+
+    def is_loop_address(self, coin: str, address: str, memo: str = None) -> bool:
+        """Whether ``address`` is a Cobo internal (loop) address; our own custody addresses always are."""
+        if self.contains(CUSTODY, coin, address, memo):
+            return True
+        response = self._require(self.client, "client").check_loop_address_details(coin, address, memo)
+        return bool(response.success and response.result and response.result.get("is_internal_address"))
+
+    def is_valid_address(self, coin: str, address: str, chain_code: str = None) -> bool:
+        """Whether ``address`` is valid for ``coin``; addresses of the MPC and Web3 wallets
+        on ``chain_code`` (or on ``coin``) are answered locally."""
+        network = chain_code or coin
+        if self.contains(MPC, network, address) or self.contains(WEB3, network, address):
+            return True
+        response = self._require(self.mpc_client, "mpc_client").is_valid_address(coin, address)
+        return bool(response.success and response.result)
+
+    @staticmethod
+    def _require(client, name: str):
+        if client is None:
+            raise ValueError(f"address not in the index and no {name} to ask the API")
+        return client
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,181 @@
+import sqlite3
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Deque, Dict, List, Tuple
+
+from cobo_custody.client.api_response import ApiResponse
+from cobo_custody.client.client import Client
+from cobo_custody.client.mpc_client import MPCClient
+from cobo_custody.client.single_flight import SingleFlight
+from cobo_custody.client.web3_client import Web3Client
+from cobo_custody.error.api_error import ApiException
+from cobo_custody.service.address_index import CUSTODY, MPC, WEB3, AddressIndex
+
+PoolKey = Tuple[str, str]
+
+
+class AddressPool(object):
+    """Pre-generated deposit addresses, handed out without waiting for the API.
+
+    Each pool is keyed by wallet and network, the coin for the custody
+    wallet and the chain code for the MPC and Web3 wallets.  ``take`` pops
+    the oldest buffered address in constant time; when a pool drops below
+    ``low_water`` addresses a background refill generates ``batch_size`` more
+    with one ``batch_new_deposit_address``, ``generate_addresses`` or
+    ``batch_web3_new_address`` call.  Only a ``take`` on an empty pool waits
+    for the API, sharing the refill already in flight, and raises
+    ``RuntimeError`` if the API generates no addresses.
+
+    The buffer lives in a SQLite database, so a restart continues with the
+    addresses generated before it.  An address is removed from the database
+    before it is returned and is never handed out twice.  Generated
+    addresses are also added to ``address_index`` when one is given.
+    """
+
+    def __init__(self, path: str = ":memory:", client: Client = None, mpc_client: MPCClient = None,
+                 web3_client: Web3Client = None, low_water: int = 100, batch_size: int = 500,
+                 address_index: AddressIndex = None, max_workers: int = 4):
+        self.path = path
+        self.client = client
+        self.mpc_client = mpc_client
+        self.web3_client = web3_client
+        self.low_water = low_water
+        self.batch_size = batch_size
+        self.address_index = address_index
+        self.max_workers = max_workers
+        self._buffers: Dict[PoolKey, Deque[Tuple[int, str]]] = {}
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+        self._executor = None
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            if path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS pool_address "
+                               "(id INTEGER PRIMARY KEY AUTOINCREMENT, wallet TEXT NOT NULL, "
+                               "network TEXT NOT NULL, address TEXT NOT NULL)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS pool_address_network ON pool_address (wallet, network, id)")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="cobo-address")
+            return self._executor
+
+    def _buffer(self, key: PoolKey) -> Deque[Tuple[int, str]]:
+        # called with self._lock held
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            rows = self._conn.execute("SELECT id, address FROM pool_address WHERE wallet = ? AND network = ? "
+                                      "ORDER BY id", key).fetchall()
+            buffer = self._buffers[key] = deque(rows)
+        return buffer
+
+    def size(self, wallet: str, network: str) -> int:
+        with self._lock:
+            return len(self._buffer((wallet, network)))
+
+    def take(self, wallet: str, network: str) -> str:
+        """Hand out an unused address of ``network`` in ``wallet``."""
+        key = (wallet, network)
+        address = self._pop(key)
+        while address is None:
+            self._fill_some(wallet, network)
+            address = self._pop(key)
+        return address
+
+    def take_custody(self, coin: str) -> str:
+        return self.take(CUSTODY, coin)
+
+    def take_mpc(self, chain_code: str) -> str:
+        return self.take(MPC, chain_code)
+
+    def take_web3(self, chain_code: str) -> str:
+        return self.take(WEB3, chain_code)
+
+    def _pop(self, key: PoolKey):
+        with self._lock:
+            buffer = self._buffer(key)
+            if not buffer:
+                return None
+            row_id, address = buffer.popleft()
+            with self._conn:
+                self._conn.execute("DELETE FROM pool_address WHERE id = ?", (row_id,))
+            low = len(buffer) < self.low_water
+        if low:
+            self._get_executor().submit(self._refill, key)
+        return address
+
+    def fill(self, wallet: str, network: str) -> int:
+        """Generate one batch of addresses now, or wait for the refill in flight; returns how many were added."""
+        key = (wallet, network)
+        return self._flight.do(key, lambda: self._generate(key))
+
+    def prefill(self, wallet: str, network: str, target: int = None) -> int:
+        """Fill the pool up to ``target`` addresses, ``low_water + batch_size`` by default."""
+        target = self.low_water + self.batch_size if target is None else target
+        added = 0
+        while self.size(wallet, network) < target:
+            added += self._fill_some(wallet, network)
+        return added
+
+    def _fill_some(self, wallet: str, network: str) -> int:
+        added = self.fill(wallet, network)
+        if not added:
+            raise RuntimeError(f"no {wallet} addresses generated for {network}")
+        return added
+
+    def _refill(self, key: PoolKey):
+        with self._lock:
+            if len(self._buffer(key)) >= self.low_water:
+                return
+        try:
+            self.fill(*key)
+        except Exception:
+            pass  # the next take retries, an empty pool reports the error
+
+    def _generate(self, key: PoolKey) -> int:
+        wallet, network = key
+        if wallet == CUSTODY:
+            response = self.client.batch_new_deposit_address(network, self.batch_size)
+        elif wallet == MPC:
+            response = self.mpc_client.generate_addresses(network, self.batch_size)
+        elif wallet == WEB3:
+            response = self.web3_client.batch_web3_new_address(network, self.batch_size)
+        else:
+            raise ValueError(f"unknown wallet {wallet}")
+        addresses = self._addresses(response)
+        with self._lock:
+            buffer = self._buffer(key)
+            with self._conn:
+                rows = [(self._conn.execute("INSERT INTO pool_address (wallet, network, address) VALUES (?, ?, ?)",
+                                            (wallet, network, address)).lastrowid, address)
+                        for address in addresses]
+            buffer.extend(rows)
+        if self.address_index is not None:
+            self.address_index.add(wallet, network, addresses)
+        return len(addresses)
+
+    @staticmethod
+    def _addresses(response: ApiResponse) -> List[str]:
+        if not response.success:
+            raise ApiException(response.exception)
+        addresses = (response.result or {}).get("addresses") or []
+        if isinstance(addresses, str):
+            addresses = addresses.split(",")
+        # custody returns address strings, the MPC and Web3 wallets address records
+        return [address["address"] if isinstance(address, dict) else address for address in addresses]
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        with self._lock:
+            self._conn.close()
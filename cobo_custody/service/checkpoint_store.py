@@ -0,0 +1,140 @@
+import json
+import os
+import sqlite3
+import threading
+from abc import abstractmethod, ABCMeta
+from typing import Dict, List, Optional, Tuple
+
+# record id -> (fingerprint, final)
+RecordStates = Dict[str, Tuple[str, bool]]
+
+
+class CheckpointStore(metaclass=ABCMeta):
+    """Persists the progress of sync streams so a restart resumes where it stopped.
+
+    Per stream it keeps the cursor of the last committed record and the
+    fingerprint of every record emitted so far, flagged final or not; the
+    ids that are not final yet are refreshed on the next run.
+    """
+
+    @abstractmethod
+    def load_cursor(self, stream: str) -> Optional[dict]:
+        pass
+
+    @abstractmethod
+    def get_fingerprints(self, stream: str, record_ids: List[str]) -> Dict[str, str]:
+        """Return the stored fingerprint of the known ids among ``record_ids``."""
+        pass
+
+    @abstractmethod
+    def pending_ids(self, stream: str) -> List[str]:
+        """Return the ids whose last stored state is not final."""
+        pass
+
+    @abstractmethod
+    def commit(self, stream: str, cursor: Optional[dict], records: RecordStates):
+        """Atomically store ``records`` and, unless it is ``None``, the new ``cursor``."""
+        pass
+
+    def close(self):
+        pass
+
+
+class SQLiteCheckpointStore(CheckpointStore):
+    """Checkpoints in a SQLite database, suited to millions of records.
+
+    Safe to share between threads; several streams can use the same file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            if path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS sync_cursor "
+                               "(stream TEXT PRIMARY KEY, cursor TEXT NOT NULL)")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS sync_record "
+                               "(stream TEXT NOT NULL, record_id TEXT NOT NULL, fingerprint TEXT NOT NULL, "
+                               "final INTEGER NOT NULL, PRIMARY KEY (stream, record_id)) WITHOUT ROWID")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS sync_record_pending "
+                               "ON sync_record (stream, record_id) WHERE final = 0")
+
+    def load_cursor(self, stream: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT cursor FROM sync_cursor WHERE stream = ?", (stream,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_fingerprints(self, stream: str, record_ids: List[str]) -> Dict[str, str]:
+        result = {}
+        with self._lock:
+            # stay below SQLite's default limit of bound variables
+            for start in range(0, len(record_ids), 500):
+                chunk = record_ids[start:start + 500]
+                rows = self._conn.execute(
+                    "SELECT record_id, fingerprint FROM sync_record WHERE stream = ? AND record_id IN (%s)"
+                    % ",".join("?" * len(chunk)), [stream] + chunk)
+                result.update(rows)
+        return result
+
+    def pending_ids(self, stream: str) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute("SELECT record_id FROM sync_record WHERE stream = ? AND final = 0", (stream,))
+            return [row[0] for row in rows]
+
+    def commit(self, stream: str, cursor: Optional[dict], records: RecordStates):
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO sync_record (stream, record_id, fingerprint, final) VALUES (?, ?, ?, ?)",
+                [(stream, record_id, fingerprint, int(final)) for record_id, (fingerprint, final) in records.items()])
+            if cursor is not None:
+                self._conn.execute("INSERT OR REPLACE INTO sync_cursor (stream, cursor) VALUES (?, ?)",
+                                   (stream, json.dumps(cursor)))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class FileCheckpointStore(CheckpointStore):
+    """Checkpoints in one JSON file, rewritten atomically on every commit.
+
+    Everything is held in memory, so it is meant for modest histories; use
+    ``SQLiteCheckpointStore`` for large ones.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._data = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self._data = json.load(f)
+
+    def _stream(self, stream: str) -> dict:
+        return self._data.setdefault(stream, {"cursor": None, "records": {}})
+
+    def load_cursor(self, stream: str) -> Optional[dict]:
+        with self._lock:
+            return self._stream(stream)["cursor"]
+
+    def get_fingerprints(self, stream: str, record_ids: List[str]) -> Dict[str, str]:
+        with self._lock:
+            records = self._stream(stream)["records"]
+            return {record_id: records[record_id][0] for record_id in record_ids if record_id in records}
+
+    def pending_ids(self, stream: str) -> List[str]:
+        with self._lock:
+            return [record_id for record_id, (_, final) in self._stream(stream)["records"].items() if not final]
+
+    def commit(self, stream: str, cursor: Optional[dict], records: RecordStates):
+        with self._lock:
+            state = self._stream(stream)
+            state["records"].update((record_id, list(record)) for record_id, record in records.items())
+            if cursor is not None:
+                state["cursor"] = cursor
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self._data, f)
+            os.replace(tmp_path, self.path)
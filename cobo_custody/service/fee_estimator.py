@@ -0,0 +1,141 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Hashable, Iterable, List, NamedTuple, Optional, Tuple
+
+from cobo_custody.client.api_response import ApiResponse
+from cobo_custody.client.mpc_client import MPCClient
+from cobo_custody.client.single_flight import SingleFlight
+
+
+class FeeRequest(NamedTuple):
+    coin: str
+    from_address: Optional[str] = None
+    to_address: Optional[str] = None
+    amount: Optional[int] = None
+
+
+def amount_bucket(amount: Optional[int], digits: int = 2) -> Optional[int]:
+    """``amount`` rounded up to ``digits`` significant digits, e.g. 12345 -> 13000."""
+    if amount is None or amount <= 0:
+        return amount
+    scale = 10 ** max(len(str(amount)) - digits, 0)
+    return -(-amount // scale) * scale
+
+
+class FeeEstimator(object):
+    """Shared ``MPCClient.estimate_fee`` results.
+
+    Estimates are keyed by coin and amount bucket and estimated once per
+    bucket, without a from address and with the bucket's upper bound as
+    amount so a shared estimate errs on the high side.  For coins in
+    ``per_address_coins``, typically UTXO coins whose fee depends on the
+    sender's inputs, the key is the from address and the exact amount
+    instead, as a rounded up amount may exceed what the sender holds.
+
+    Successful estimates are kept for ``ttl`` seconds, at most ``max_size``
+    of them, dropping the least recently used first.  An estimate read
+    after ``refresh_after`` seconds is still returned but refreshed in the
+    background, so steady traffic never waits for the API; concurrent misses
+    on one key share a single request.  ``estimate_many`` answers a batch of
+    ``FeeRequest``s with one request per distinct key, run in parallel.
+    """
+
+    def __init__(self, mpc_client: MPCClient, ttl: float = 10.0, refresh_after: float = None,
+                 bucket_digits: int = 2, per_address_coins: Iterable[str] = (), max_workers: int = 8,
+                 max_size: int = 1024):
+        self.mpc_client = mpc_client
+        self.ttl = ttl
+        self.refresh_after = ttl / 2 if refresh_after is None else refresh_after
+        self.bucket_digits = bucket_digits
+        self.per_address_coins = frozenset(per_address_coins)
+        self.max_workers = max_workers
+        self.max_size = max_size
+        self._entries: "OrderedDict[Hashable, Tuple[float, ApiResponse]]" = OrderedDict()
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+        self._executor = None
+        self.requests = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="cobo-fee")
+            return self._executor
+
+    def key(self, request: FeeRequest) -> Hashable:
+        if request.coin in self.per_address_coins:
+            return request.coin, request.from_address, request.amount
+        return request.coin, None, amount_bucket(request.amount, self.bucket_digits)
+
+    def estimate(self, coin: str, amount: int = None, to_address: str = None,
+                 from_address: str = None) -> ApiResponse:
+        return self._get(FeeRequest(coin, from_address, to_address, amount))
+
+    def estimate_many(self, requests: Iterable[FeeRequest]) -> List[ApiResponse]:
+        """Estimates for ``requests`` in order, one API request per distinct uncached key."""
+        requests = list(requests)
+        firsts = {}
+        for request in requests:
+            firsts.setdefault(self.key(request), request)
+        futures = {key: self._get_executor().submit(self._get, request) for key, request in firsts.items()}
+        results = {key: future.result() for key, future in futures.items()}
+        return [results[self.key(request)] for request in requests]
+
+    def invalidate(self, coin: str = None):
+        with self._lock:
+            for key in [key for key in self._entries if coin is None or key[0] == coin]:
+                del self._entries[key]
+
+    def _get(self, request: FeeRequest) -> ApiResponse:
+        key = self.key(request)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] < self.ttl:
+                self._entries.move_to_end(key)
+                if now - entry[0] < self.refresh_after or key in self._refreshing:
+                    return entry[1]
+                self._refreshing.add(key)
+            else:
+                entry = None
+        if entry is not None:
+            self._get_executor().submit(self._refresh, key, request)
+            return entry[1]
+        return self._flight.do(key, lambda: self._fetch(key, request))
+
+    def _refresh(self, key: Hashable, request: FeeRequest):
+        try:
+            self._flight.do(key, lambda: self._fetch(key, request))
+        except Exception:
+            pass  # the cached estimate stays until it expires
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _fetch(self, key: Hashable, request: FeeRequest) -> ApiResponse:
+        coin, from_address, amount = key
+        with self._lock:
+            self.requests += 1
+        response = self.mpc_client.estimate_fee(coin, amount=amount, address=request.to_address,
+                                                from_address=from_address)
+        if response.success:
+            with self._lock:
+                self._entries[key] = (time.monotonic(), response)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+        return response
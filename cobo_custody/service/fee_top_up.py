@@ -0,0 +1,173 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import Callable, Iterable, List, Optional
+
+from cobo_custody.client.api_response import ApiResponse
+from cobo_custody.client.batch_executor import BatchResult
+from cobo_custody.client.mpc_client import MPCClient
+from cobo_custody.service.transaction_watcher import MPCWatchSource, TransactionWatcher
+
+MPC_STATUS_SUCCESS = 501
+MPC_STATUS_FAILED = 502
+
+# states of a TopUpJob
+WAITING = "waiting"
+TOPPING_UP = "topping_up"
+RELEASED = "released"
+SUBMITTED = "submitted"
+FAILED = "failed"
+
+
+@dataclass
+class Transfer:
+    """Arguments of one ``MPCClient.create_transaction`` call."""
+    coin: str
+    request_id: str
+    from_address: str
+    to_address: str
+    amount: int
+    gas_price: Optional[int] = None
+    gas_limit: Optional[int] = None
+
+    def submit(self, mpc_client: MPCClient) -> ApiResponse:
+        return mpc_client.create_transaction(coin=self.coin, request_id=self.request_id, from_addr=self.from_address,
+                                             to_addr=self.to_address, amount=self.amount, gas_price=self.gas_price,
+                                             gas_limit=self.gas_limit)
+
+
+@dataclass
+class TopUpJob:
+    """A token ``transfer`` that may only be submitted once its gas ``top_up``,
+    if any, is confirmed on chain."""
+    transfer: Transfer
+    top_up: Optional[Transfer] = None
+    status: str = WAITING
+    reason: str = ""
+    cobo_id: Optional[str] = None
+
+
+def _call(fn: Callable[[], ApiResponse]) -> BatchResult:
+    try:
+        return fn()
+    except Exception as e:
+        return e
+
+
+def _error(result: BatchResult) -> Optional[str]:
+    if isinstance(result, Exception):
+        return str(result) or type(result).__name__
+    if not result.success:
+        return result.exception.errorMessage if result.exception else "request failed"
+    return None
+
+
+class FeeTopUpOrchestrator(object):
+    """Runs token transfers that first need gas sent to their source address.
+
+    All top-ups go out in one parallel wave.  A ``TransactionWatcher`` then
+    follows them with combined ``transactions_by_request_ids`` polls of up to
+    ``batch_size`` ids each, every ``poll_interval`` seconds at first and
+    backing off to ``max_poll_interval`` as they age, and every dependent
+    transfer is submitted as soon as its own top-up confirms, without waiting
+    for the others.  Jobs whose top-up fails or is not confirmed within
+    ``timeout`` seconds are marked failed.
+    """
+
+    def __init__(self, mpc_client: MPCClient, max_workers: int = 16, batch_size: int = 50,
+                 poll_interval: float = 2.0, max_poll_interval: float = 30.0, timeout: float = 1800.0):
+        self.mpc_client = mpc_client
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.timeout = timeout
+        self._executor = None
+        self._stopped = threading.Event()
+        self._watcher = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="cobo-top-up")
+        return self._executor
+
+    def _execute(self, calls: Iterable[Callable[[], ApiResponse]]) -> List[BatchResult]:
+        return list(self._get_executor().map(_call, calls))
+
+    def stop(self):
+        """Make a running ``run`` stop waiting for the top-ups still pending."""
+        self._stopped.set()
+        if self._watcher is not None:
+            self._watcher.stop()
+
+    def run(self, jobs: List[TopUpJob]) -> List[TopUpJob]:
+        """Top up, wait and submit ``jobs``; returns them with their final status."""
+        self._stopped.clear()
+        submissions: List[Future] = []
+
+        def release(job: TopUpJob):
+            # set before submitting, the sweep below only fails jobs still topping up
+            job.status = RELEASED
+            submissions.append(self._get_executor().submit(self._submit, job))
+
+        def confirmed(job: TopUpJob, future: Future):
+            if future.cancelled() or future.exception() is not None:
+                return
+            transaction = future.result()
+            if transaction.get("status") == MPC_STATUS_SUCCESS:
+                release(job)
+            else:
+                self._fail(job, f"fee top-up failed: {transaction.get('failed_reason') or 'on chain'}")
+
+        for job in jobs:
+            if job.top_up is None:
+                release(job)
+        waiting = [job for job in jobs if job.top_up is not None]
+        results = self._execute([partial(job.top_up.submit, self.mpc_client) for job in waiting])
+        watcher = self._watcher = TransactionWatcher(MPCWatchSource(self.mpc_client), batch_size=self.batch_size,
+                                                     fast_interval=self.poll_interval,
+                                                     slow_interval=self.max_poll_interval, max_age=self.timeout)
+        for job, result in zip(waiting, results):
+            error = _error(result)
+            if error is None:
+                job.status = TOPPING_UP
+                watcher.watch(job.top_up.request_id).add_done_callback(partial(confirmed, job))
+            else:
+                self._fail(job, f"fee top-up failed: {error}")
+
+        watcher.run(until=lambda: watcher.pending == 0 or self._stopped.is_set())
+        watcher.stop()
+        self._watcher = None
+        for job in waiting:
+            if job.status == TOPPING_UP:
+                self._fail(job, "fee top-up not confirmed")
+
+        for future in submissions:
+            future.result()
+        return jobs
+
+    def _submit(self, job: TopUpJob):
+        response = _call(partial(job.transfer.submit, self.mpc_client))
+        error = _error(response)
+        if error is None:
+            job.status = SUBMITTED
+            job.cobo_id = (response.result or {}).get("cobo_id")
+        else:
+            self._fail(job, error)
+
+    @staticmethod
+    def _fail(job: TopUpJob, reason: str):
+        job.status = FAILED
+        job.reason = reason
@@ -0,0 +1,272 @@
+from dataclasses import dataclass, field
+from functools import partial
+from hashlib import sha256
+from typing import Dict, List, Optional
+
+from cobo_custody.client.batch_executor import BatchExecutor, BatchResult
+from cobo_custody.client.mpc_client import MPCClient
+from cobo_custody.service.fee_estimator import FeeEstimator, FeeRequest
+from cobo_custody.service.fee_top_up import SUBMITTED, FeeTopUpOrchestrator, TopUpJob, Transfer
+
+# states of a SweepTransfer
+PLANNED = "planned"
+SWEPT = "swept"
+AWAITING_TOP_UP = "awaiting_top_up"
+SKIPPED = "skipped"
+FAILED = "failed"
+
+
+@dataclass
+class SweepTransfer:
+    """One source address of a sweep.  ``top_up`` is the amount of fee coin
+    the fee address has to send first, for tokens whose fee is paid in
+    another coin."""
+    from_address: str
+    balance: int
+    amount: int = 0
+    fee: int = 0
+    gas_price: Optional[int] = None
+    gas_limit: Optional[int] = None
+    top_up: int = 0
+    request_id: str = ""
+    top_up_request_id: str = ""
+    status: str = PLANNED
+    reason: str = ""
+    cobo_id: Optional[str] = None
+
+
+@dataclass
+class SweepPlan:
+    sweep_id: str
+    coin: str
+    to_address: str
+    fee_coin: Optional[str] = None
+    fee_from_address: Optional[str] = None
+    target: Optional[int] = None
+    transfers: List[SweepTransfer] = field(default_factory=list)
+    skipped: List[SweepTransfer] = field(default_factory=list)
+
+    @property
+    def amount(self) -> int:
+        return sum(transfer.amount for transfer in self.transfers)
+
+    @property
+    def shortfall(self) -> int:
+        """How much of ``target`` the planned transfers do not cover."""
+        return max(self.target - self.amount, 0) if self.target is not None else 0
+
+
+@dataclass
+class SweepReport:
+    plan: SweepPlan
+    swept: List[SweepTransfer] = field(default_factory=list)
+    awaiting_top_up: List[SweepTransfer] = field(default_factory=list)
+    skipped: List[SweepTransfer] = field(default_factory=list)
+    failed: List[SweepTransfer] = field(default_factory=list)
+
+    @property
+    def swept_amount(self) -> int:
+        return sum(transfer.amount for transfer in self.swept)
+
+    def summary(self) -> dict:
+        return {"coin": self.plan.coin, "to_address": self.plan.to_address, "swept": len(self.swept),
+                "swept_amount": self.swept_amount, "awaiting_top_up": len(self.awaiting_top_up),
+                "skipped": len(self.skipped), "failed": len(self.failed)}
+
+
+def _error(result: BatchResult) -> Optional[str]:
+    if isinstance(result, Exception):
+        return str(result) or type(result).__name__
+    if not result.success:
+        return result.exception.errorMessage if result.exception else "request failed"
+    return None
+
+
+class FundSweep(object):
+    """Collects the balances of an MPC wallet's addresses into one address.
+
+    A sweep is planned up front from a single bulk load of the balances
+    (plus one of the fee coin for tokens) and concurrent fee estimates, then
+    executed with at most ``max_workers`` requests in flight::
+
+        sweep = FundSweep(mpc_client)
+        report = sweep.sweep("ETH", to_address, sweep_id="2024-05-01")
+
+    ``request_id``s are derived from ``sweep_id``, kind, coin and addresses,
+    so running the same sweep again cannot transfer twice: transfers that were
+    accepted before are rejected as duplicates.  Token transfers whose source
+    lacks the fee coin are topped up from ``fee_from_address`` and reported as
+    ``awaiting_top_up``; run the sweep again with the same ``sweep_id`` once
+    the top-ups are confirmed to submit them.  With a ``top_up_orchestrator``
+    the sweep instead waits for the top-ups and submits each such transfer as
+    soon as its top-up confirms.
+
+    With a ``fee_estimator`` sources of similar balance share one estimate.
+    """
+
+    def __init__(self, mpc_client: MPCClient, max_workers: int = 16, fee_level: str = "average",
+                 min_amount: int = 1, request_id_prefix: str = "sweep", fee_estimator: FeeEstimator = None,
+                 top_up_orchestrator: FeeTopUpOrchestrator = None):
+        self.mpc_client = mpc_client
+        self.fee_estimator = fee_estimator
+        self.top_up_orchestrator = top_up_orchestrator
+        self.executor = BatchExecutor(max_workers)
+        self.fee_level = fee_level
+        self.min_amount = min_amount
+        self.request_id_prefix = request_id_prefix
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        self.executor.close()
+
+    def request_id(self, sweep_id: str, kind: str, coin: str, from_address: str, to_address: str) -> str:
+        key = "|".join((sweep_id, kind, coin, from_address.lower(), to_address.lower()))
+        return f"{self.request_id_prefix}-{sha256(key.encode()).hexdigest()[:32]}"
+
+    def load_balances(self, coin: str) -> Dict[str, int]:
+        """Balance of every address holding ``coin``, from one paged walk of ``list_balances``."""
+        return {record["address"]: int(record["balance"]) for record in self.mpc_client.iter_balances(coin=coin)}
+
+    def estimate_fees(self, coin: str, to_address: str, balances: Dict[str, int]) -> Dict[str, BatchResult]:
+        addresses = list(balances)
+        if self.fee_estimator is not None:
+            results = self.fee_estimator.estimate_many([FeeRequest(coin, address, to_address, balances[address])
+                                                        for address in addresses])
+            return dict(zip(addresses, results))
+        results = self.executor.map(self.mpc_client.estimate_fee,
+                                    [{"coin": coin, "amount": balances[address], "address": to_address,
+                                      "from_address": address} for address in addresses])
+        return dict(zip(addresses, results))
+
+    def plan(self, coin: str, to_address: str, sweep_id: str, amount: int = None,
+             fee_from_address: str = None) -> SweepPlan:
+        """Plan the transfers collecting ``amount`` of ``coin``, or all of it, into ``to_address``.
+
+        Sources are used from the largest balance down.  An address whose
+        balance does not cover its fee, or whose fee cannot be estimated or
+        topped up, is skipped."""
+        plan = SweepPlan(sweep_id, coin, to_address, fee_from_address=fee_from_address, target=amount)
+        excluded = {to_address.lower()} | ({fee_from_address.lower()} if fee_from_address else set())
+        balances = {address: balance for address, balance in self.load_balances(coin).items()
+                    if balance > 0 and address.lower() not in excluded}
+        if not balances:
+            return plan
+        estimates = self.estimate_fees(coin, to_address, balances)
+        for result in estimates.values():
+            if _error(result) is None:
+                plan.fee_coin = result.result.get("fee_coin") or coin
+                break
+        fee_balances = self.load_balances(plan.fee_coin) if plan.fee_coin and plan.fee_coin != coin else {}
+        fee_budget = fee_balances.get(fee_from_address, 0) if fee_from_address else 0
+
+        for address in sorted(balances, key=lambda a: (-balances[a], a)):
+            if plan.target is not None and plan.amount >= plan.target:
+                break
+            transfer = SweepTransfer(address, balances[address],
+                                     request_id=self.request_id(sweep_id, "transfer", coin, address, to_address))
+            error = _error(estimates[address])
+            if error is not None:
+                self._skip(plan, transfer, f"fee estimate failed: {error}")
+                continue
+            level = estimates[address].result.get(self.fee_level) or {}
+            transfer.gas_price = level.get("gas_price") or None
+            transfer.gas_limit = level.get("gas_limit") or None
+            transfer.fee = (transfer.gas_price or 0) * (transfer.gas_limit or 0)
+            native = plan.fee_coin == coin
+            sweepable = transfer.balance - transfer.fee if native else transfer.balance
+            if plan.target is not None:
+                sweepable = min(sweepable, plan.target - plan.amount)
+            if sweepable < self.min_amount:
+                self._skip(plan, transfer, "balance does not cover the fee" if native else "balance below minimum")
+                continue
+            transfer.amount = sweepable
+            if not native:
+                missing = transfer.fee - fee_balances.get(address, 0)
+                if missing > 0:
+                    if not fee_from_address or fee_budget < missing:
+                        self._skip(plan, transfer, f"insufficient {plan.fee_coin} for the fee")
+                        continue
+                    fee_budget -= missing
+                    transfer.top_up = missing
+                    transfer.top_up_request_id = self.request_id(sweep_id, "top_up", plan.fee_coin,
+                                                                 fee_from_address, address)
+            plan.transfers.append(transfer)
+        return plan
+
+    @staticmethod
+    def _skip(plan: SweepPlan, transfer: SweepTransfer, reason: str):
+        transfer.amount = 0
+        transfer.status = SKIPPED
+        transfer.reason = reason
+        plan.skipped.append(transfer)
+
+    def execute(self, plan: SweepPlan) -> SweepReport:
+        """Submit the top-ups, then every transfer that does not wait for one, in parallel."""
+        report = SweepReport(plan, skipped=list(plan.skipped))
+        if self.top_up_orchestrator is not None:
+            return self._execute_with_top_ups(plan, report)
+        top_ups = [transfer for transfer in plan.transfers if transfer.top_up]
+        results = self.executor.execute([partial(self.mpc_client.create_transaction, coin=plan.fee_coin,
+                                                 request_id=transfer.top_up_request_id,
+                                                 from_addr=plan.fee_from_address, to_addr=transfer.from_address,
+                                                 amount=transfer.top_up) for transfer in top_ups])
+        for transfer, result in zip(top_ups, results):
+            error = _error(result)
+            if error is None:
+                transfer.status = AWAITING_TOP_UP
+                report.awaiting_top_up.append(transfer)
+            else:
+                transfer.status = FAILED
+                transfer.reason = f"fee top-up failed: {error}"
+                report.failed.append(transfer)
+
+        ready = [transfer for transfer in plan.transfers if not transfer.top_up]
+        results = self.executor.execute([partial(self.mpc_client.create_transaction, coin=plan.coin,
+                                                 request_id=transfer.request_id, from_addr=transfer.from_address,
+                                                 to_addr=plan.to_address, amount=transfer.amount,
+                                                 gas_price=transfer.gas_price, gas_limit=transfer.gas_limit)
+                                         for transfer in ready])
+        for transfer, result in zip(ready, results):
+            self._record(report, transfer, result)
+        return report
+
+    def _execute_with_top_ups(self, plan: SweepPlan, report: SweepReport) -> SweepReport:
+        jobs = []
+        for transfer in plan.transfers:
+            top_up = None
+            if transfer.top_up:
+                top_up = Transfer(plan.fee_coin, transfer.top_up_request_id, plan.fee_from_address,
+                                  transfer.from_address, transfer.top_up)
+            jobs.append(TopUpJob(Transfer(plan.coin, transfer.request_id, transfer.from_address, plan.to_address,
+                                          transfer.amount, transfer.gas_price, transfer.gas_limit), top_up))
+        for transfer, job in zip(plan.transfers, self.top_up_orchestrator.run(jobs)):
+            if job.status == SUBMITTED:
+                transfer.status = SWEPT
+                transfer.cobo_id = job.cobo_id
+                report.swept.append(transfer)
+            else:
+                transfer.status = FAILED
+                transfer.reason = job.reason
+                report.failed.append(transfer)
+        return report
+
+    @staticmethod
+    def _record(report: SweepReport, transfer: SweepTransfer, result: BatchResult):
+        error = _error(result)
+        if error is None:
+            transfer.status = SWEPT
+            transfer.cobo_id = (result.result or {}).get("cobo_id")
+            report.swept.append(transfer)
+        else:
+            transfer.status = FAILED
+            transfer.reason = error
+            report.failed.append(transfer)
+
+    def sweep(self, coin: str, to_address: str, sweep_id: str, amount: int = None,
+              fee_from_address: str = None) -> SweepReport:
+        return self.execute(self.plan(coin, to_address, sweep_id, amount, fee_from_address))
@@ -0,0 +1,190 @@
+import threading
+from abc import abstractmethod, ABCMeta
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Sequence
+
+from cobo_custody.client.batch_executor import BatchExecutor
+from cobo_custody.client.client import Client
+from cobo_custody.client.mpc_client import MPCClient
+from cobo_custody.client.paginator import page_records
+from cobo_custody.error.api_error import ApiException
+from cobo_custody.service.checkpoint_store import CheckpointStore
+
+# MPC transaction status codes after which a transaction no longer changes
+MPC_FINAL_STATUSES = (501, 502)
+
+
+class SyncSource(metaclass=ABCMeta):
+    """Where a ``TransactionSync`` reads records from.
+
+    ``records`` returns the records after a cursor in ascending order and
+    ``advance`` moves the cursor past one of them.  Records that are not
+    final yet are looked up again with ``refresh`` on every run until they
+    are.  A record is emitted again whenever its ``fingerprint`` changes.
+    """
+    id_key = "id"
+    fingerprint_keys: Sequence[str] = ("status",)
+
+    @abstractmethod
+    def records(self, cursor: Optional[dict]) -> Iterator[dict]:
+        pass
+
+    @abstractmethod
+    def advance(self, cursor: Optional[dict], record: dict) -> dict:
+        pass
+
+    def refresh(self, record_ids: List[str]) -> Iterator[dict]:
+        return iter(())
+
+    def is_final(self, record: dict) -> bool:
+        return True
+
+    def fingerprint(self, record: dict) -> str:
+        return "|".join(str(record.get(key)) for key in self.fingerprint_keys)
+
+
+class CustodyTransactionSource(SyncSource):
+    """Custody wallet transactions: confirmed ones by ascending id from
+    ``transactions_by_id`` and, when ``include_pending``, pending ones
+    which are followed until they are confirmed.
+
+    Custody has no lookup by a list of ids, so ``refresh`` reads the pending
+    list once and only fetches the details of the records that left it, up
+    to ``max_workers`` at a time.
+    """
+
+    def __init__(self, client: Client, coin: str = None, side: str = None, limit: int = None,
+                 include_pending: bool = True, max_workers: int = 8):
+        self.client = client
+        self.coin = coin
+        self.side = side
+        self.limit = limit
+        self.include_pending = include_pending
+        self.max_workers = max_workers
+
+    def records(self, cursor: Optional[dict]) -> Iterator[dict]:
+        # a min_id cursor makes the endpoint page upwards, start below the first id
+        min_id = cursor["min_id"] if cursor else "0"
+        yield from self.client.iter_transactions_by_id(coin=self.coin, side=self.side, min_id=min_id,
+                                                       limit=self.limit)
+        if self.include_pending:
+            yield from self.client.iter_pending_transactions(coin=self.coin, side=self.side, limit=self.limit)
+
+    def advance(self, cursor: Optional[dict], record: dict) -> dict:
+        if not self.is_final(record):
+            return cursor
+        return {"min_id": str(record["id"])}
+
+    def refresh(self, record_ids: List[str]) -> Iterator[dict]:
+        if not record_ids:
+            return
+        left = set(record_ids)
+        for record in self.client.iter_pending_transactions(coin=self.coin, side=self.side, limit=self.limit):
+            if str(record["id"]) in left:
+                left.discard(str(record["id"]))
+                yield record
+        with BatchExecutor(self.max_workers) as executor:
+            results = executor.map(self.client.get_transaction_details,
+                                   [{"tx_id": record_id} for record_id in record_ids if record_id in left])
+        for response in results:
+            if isinstance(response, Exception):
+                raise response
+            if not response.success:
+                raise ApiException(response.exception)
+            if response.result:
+                yield response.result
+
+    def is_final(self, record: dict) -> bool:
+        return record.get("status") != "pending"
+
+
+class MPCTransactionSource(SyncSource):
+    """MPC wallet transactions by ascending creation time, unfinished ones are
+    refreshed in batches with ``transactions_by_cobo_ids``."""
+    id_key = "cobo_id"
+
+    def __init__(self, client: MPCClient, transaction_type: int = None, coins: str = None, start_time: int = None,
+                 limit: int = 50, final_statuses: Sequence[int] = MPC_FINAL_STATUSES):
+        self.client = client
+        self.transaction_type = transaction_type
+        self.coins = coins
+        self.start_time = start_time
+        self.limit = limit
+        self.final_statuses = tuple(final_statuses)
+
+    def records(self, cursor: Optional[dict]) -> Iterator[dict]:
+        # the start time is inclusive, records at the cursor come back and are deduplicated
+        start_time = cursor["start_time"] if cursor else self.start_time
+        return self.client.iter_transactions(start_time=start_time, order="asc",
+                                             transaction_type=self.transaction_type, coins=self.coins,
+                                             limit=self.limit)
+
+    def advance(self, cursor: Optional[dict], record: dict) -> dict:
+        return {"start_time": record["created_timestamp"]}
+
+    def refresh(self, record_ids: List[str]) -> Iterator[dict]:
+        for start in range(0, len(record_ids), self.limit):
+            response = self.client.transactions_by_cobo_ids(",".join(record_ids[start:start + self.limit]))
+            if not response.success:
+                raise ApiException(response.exception)
+            yield from page_records(response.result, "transactions")
+
+    def is_final(self, record: dict) -> bool:
+        return record.get("status") in self.final_statuses
+
+
+class TransactionSync(object):
+    """Incrementally mirrors a transaction source, resuming from a checkpoint.
+
+    ``changes`` first refreshes the records that were not final at the last
+    run, then reads the records after the stored cursor; the ``iter_*``
+    generators underneath prefetch the next page while the current one is
+    consumed.  A record is yielded only when it is new or its fingerprint
+    changed, so a pending transaction costs one more emission when it
+    confirms and re-reading a page emits nothing.
+
+    Progress is committed every ``batch_size`` records once they have been
+    consumed, so records are delivered at least once: after a crash the
+    uncommitted tail is emitted again.
+    """
+
+    def __init__(self, source: SyncSource, store: CheckpointStore, stream: str, batch_size: int = 100):
+        self.source = source
+        self.store = store
+        self.stream = stream
+        self.batch_size = batch_size
+
+    def changes(self) -> Iterator[dict]:
+        cursor = self.store.load_cursor(self.stream)
+        pending = self.store.pending_ids(self.stream)
+        if pending:
+            yield from self._emit(self.source.refresh(pending), cursor, advance=False)
+        yield from self._emit(self.source.records(cursor), cursor, advance=True)
+
+    def _emit(self, records: Iterable[dict], cursor: Optional[dict], advance: bool) -> Iterator[dict]:
+        source = self.source
+        iterator = iter(records)
+        while True:
+            chunk = list(islice(iterator, self.batch_size))
+            if not chunk:
+                return
+            ids = [str(record[source.id_key]) for record in chunk]
+            known = self.store.get_fingerprints(self.stream, ids)
+            updates = {}
+            for record_id, record in zip(ids, chunk):
+                if advance:
+                    cursor = source.advance(cursor, record)
+                fingerprint = source.fingerprint(record)
+                seen = updates.get(record_id)
+                if (seen[0] if seen else known.get(record_id)) == fingerprint:
+                    continue
+                updates[record_id] = (fingerprint, source.is_final(record))
+                yield record
+            self.store.commit(self.stream, cursor if advance else None, updates)
+
+    def follow(self, interval: float = 10.0, stop: threading.Event = None) -> Iterator[dict]:
+        """Yield changes forever, polling every ``interval`` seconds until ``stop`` is set."""
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            yield from self.changes()
+            stop.wait(interval)
@@ -0,0 +1,247 @@
+import logging
+import threading
+import time
+from abc import abstractmethod, ABCMeta
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence
+
+from cobo_custody.client.client import Client
+from cobo_custody.client.mpc_client import MPCClient
+from cobo_custody.client.paginator import page_records
+from cobo_custody.error.api_error import ApiException
+from cobo_custody.service.transaction_sync import MPC_FINAL_STATUSES
+
+logger = logging.getLogger(__name__)
+
+# called with the request_id, the new record and the previous status (None on the first sighting)
+ChangeListener = Callable[[str, dict, Optional[object]], None]
+
+
+class WatchSource(metaclass=ABCMeta):
+    """Looks up transactions by ``request_id`` for a ``TransactionWatcher``."""
+
+    @abstractmethod
+    def fetch(self, request_ids: List[str]) -> List[dict]:
+        """Current records of ``request_ids`` in one request; unknown ids are left out."""
+        pass
+
+    @abstractmethod
+    def is_final(self, record: dict) -> bool:
+        pass
+
+    def status(self, record: dict):
+        return record.get("status")
+
+
+class MPCWatchSource(WatchSource):
+    """MPC and Web3 wallet transactions, by ``MPCClient.transactions_by_request_ids``."""
+
+    def __init__(self, client: MPCClient, final_statuses: Sequence[int] = MPC_FINAL_STATUSES):
+        self.client = client
+        self.final_statuses = tuple(final_statuses)
+
+    def fetch(self, request_ids: List[str]) -> List[dict]:
+        response = self.client.transactions_by_request_ids(",".join(request_ids))
+        if not response.success:
+            raise ApiException(response.exception)
+        return page_records(response.result, "transactions")
+
+    def is_final(self, record: dict) -> bool:
+        return record.get("status") in self.final_statuses
+
+
+class CustodyWatchSource(WatchSource):
+    """Custody withdrawals, by ``Client.get_transactions_by_request_ids`` instead of one
+    ``query_withdraw_info`` call per request."""
+
+    def __init__(self, client: Client):
+        self.client = client
+
+    def fetch(self, request_ids: List[str]) -> List[dict]:
+        response = self.client.get_transactions_by_request_ids(",".join(request_ids))
+        if not response.success:
+            raise ApiException(response.exception)
+        return page_records(response.result)
+
+    def is_final(self, record: dict) -> bool:
+        return record.get("status") not in (None, "pending")
+
+
+class _Watch(object):
+    __slots__ = ("request_id", "added", "due", "status", "future", "callback")
+
+    def __init__(self, request_id: str, added: float, callback: Optional[ChangeListener]):
+        self.request_id = request_id
+        self.added = added
+        self.due = added
+        self.status = None
+        self.future = Future()
+        self.callback = callback
+
+
+class TransactionWatcher(object):
+    """Follows many outstanding requests until their transactions are final.
+
+    Pending ``request_id``s are polled together, up to ``batch_size`` per
+    request and the batches in parallel.  Each request is polled again after
+    ``age_ratio`` times its age, clamped between ``fast_interval`` and
+    ``slow_interval``: a fresh request is checked every few seconds while one
+    that has been pending for an hour costs a poll a minute.  Requests due
+    within ``fast_interval`` of a poll ride along with it.
+
+    Final transactions are dropped and resolve the future returned by
+    ``watch``; await it from asyncio with ``asyncio.wrap_future``.  Then, as
+    on every status change, the per request callback given to ``watch`` and
+    all ``on_change`` listeners are called; exceptions they raise are logged
+    and do not stop the watcher, nor do failed polls, which are logged and
+    retried at the next interval.  Requests still unknown or pending after
+    ``max_age`` seconds are dropped with a ``TimeoutError``.
+
+    Call ``poll_once`` from your own loop, or ``start`` a background thread.
+    """
+
+    def __init__(self, source: WatchSource, batch_size: int = 50, fast_interval: float = 2.0,
+                 slow_interval: float = 60.0, age_ratio: float = 0.1, max_age: float = None,
+                 max_workers: int = 4):
+        self.source = source
+        self.batch_size = batch_size
+        self.fast_interval = fast_interval
+        self.slow_interval = slow_interval
+        self.age_ratio = age_ratio
+        self.max_age = max_age
+        self.max_workers = max_workers
+        self._watches: Dict[str, _Watch] = {}
+        self._listeners: List[ChangeListener] = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def on_change(self, listener: ChangeListener):
+        self._listeners.append(listener)
+
+    def watch(self, request_id: str, callback: ChangeListener = None) -> Future:
+        """Follow ``request_id``; the returned future resolves with its final record."""
+        with self._lock:
+            watch = self._watches.get(request_id)
+            if watch is None:
+                watch = self._watches[request_id] = _Watch(request_id, time.monotonic(), callback)
+                watch.due += self.fast_interval
+        self._wakeup.set()
+        return watch.future
+
+    def unwatch(self, request_id: str):
+        with self._lock:
+            watch = self._watches.pop(request_id, None)
+        if watch is not None:
+            watch.future.cancel()
+
+    @property
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._watches)
+
+    def interval(self, age: float) -> float:
+        return min(self.slow_interval, max(self.fast_interval, age * self.age_ratio))
+
+    def next_due(self) -> Optional[float]:
+        """``time.monotonic()`` value at which the next poll is due, None when nothing is watched."""
+        with self._lock:
+            return min((watch.due for watch in self._watches.values()), default=None)
+
+    def poll_once(self) -> int:
+        """Poll the requests that are due and return how many changed status."""
+        now = time.monotonic()
+        due = []
+        with self._lock:
+            if any(watch.due <= now for watch in self._watches.values()):
+                due = [watch for watch in self._watches.values() if watch.due <= now + self.fast_interval]
+                for watch in due:
+                    watch.due = now + self.interval(now - watch.added)
+        changed = 0
+        if due:
+            batches = [due[i:i + self.batch_size] for i in range(0, len(due), self.batch_size)]
+            if len(batches) == 1:
+                results = [self._fetch(batches[0])]
+            else:
+                results = list(self._get_executor().map(self._fetch, batches))
+            for records in results:
+                for record in records:
+                    changed += self._update(record)
+        if self.max_age is not None:
+            self._expire(now)
+        return changed
+
+    def _fetch(self, batch: List[_Watch]) -> List[dict]:
+        try:
+            return self.source.fetch([watch.request_id for watch in batch])
+        except Exception:
+            logger.exception("transaction watcher failed to fetch %d requests", len(batch))
+            return []  # polled again at the next interval
+
+    def _update(self, record: dict) -> int:
+        status = self.source.status(record)
+        final = self.source.is_final(record)
+        with self._lock:
+            watch = self._watches.get(record.get("request_id"))
+            if watch is None or (watch.status == status and not final):
+                return 0
+            previous, watch.status = watch.status, status
+            if final:
+                del self._watches[watch.request_id]
+        if final:
+            watch.future.set_result(record)
+        if previous != status:
+            for listener in ([watch.callback] if watch.callback else []) + self._listeners:
+                try:
+                    listener(watch.request_id, record, previous)
+                except Exception:
+                    logger.exception("transaction watcher listener failed for %s", watch.request_id)
+        return int(previous != status)
+
+    def _expire(self, now: float):
+        with self._lock:
+            expired = [watch for watch in self._watches.values() if now - watch.added > self.max_age]
+            for watch in expired:
+                del self._watches[watch.request_id]
+        for watch in expired:
+            watch.future.set_exception(TimeoutError(f"{watch.request_id} not final after {self.max_age}s"))
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="cobo-watch")
+        return self._executor
+
+    def run(self, until: Callable[[], bool] = None):
+        """Poll until ``stop`` is called or ``until()`` is true, sleeping until the next request is due."""
+        while not self._stopped.is_set() and not (until and until()):
+            self.poll_once()
+            # clear first, a watch added while the delay is computed then still wakes the loop
+            self._wakeup.clear()
+            next_due = self.next_due()
+            delay = self.fast_interval if next_due is None else max(next_due - time.monotonic(), 0)
+            if delay:
+                self._wakeup.wait(delay)
+
+    def start(self) -> "TransactionWatcher":
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self.run, name="cobo-transaction-watcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
@@ -0,0 +1,163 @@
+import hashlib
+from abc import abstractmethod, ABCMeta
+from typing import Dict, List
+
+import ecdsa
+from ecdsa.der import UnexpectedDER
+from ecdsa.ellipticcurve import PointJacobi
+from ecdsa.util import sigencode_der, sigdecode_der
+
+try:
+    import coincurve
+except ImportError:  # pragma: no cover
+    coincurve = None
+
+try:
+    from cryptography.exceptions import InvalidSignature
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+except ImportError:  # pragma: no cover
+    ec = None
+
+
+class CryptoBackend(metaclass=ABCMeta):
+    """SECP256k1 primitives used by ``LocalSigner`` and ``LocalVerifier``.
+
+    ``data`` is always hashed once more with SHA-256 before it is signed or
+    verified and signatures are DER encoded, so every backend produces and
+    accepts the same wire format.
+    """
+    name = ""
+
+    @abstractmethod
+    def load_private_key(self, secret: bytes):
+        pass
+
+    @abstractmethod
+    def public_key_bytes(self, private_key) -> bytes:
+        """Return the compressed public key of ``private_key``."""
+        pass
+
+    @abstractmethod
+    def sign(self, private_key, data: bytes) -> bytes:
+        pass
+
+    @abstractmethod
+    def load_public_key(self, public_key: bytes):
+        pass
+
+    @abstractmethod
+    def verify(self, public_key, signature: bytes, data: bytes) -> bool:
+        pass
+
+
+class EcdsaBackend(CryptoBackend):
+    name = "ecdsa"
+
+    def load_private_key(self, secret: bytes):
+        return ecdsa.SigningKey.from_secret_exponent(int.from_bytes(secret, 'big'), curve=ecdsa.SECP256k1)
+
+    def public_key_bytes(self, private_key) -> bytes:
+        return private_key.verifying_key.to_string("compressed")
+
+    def sign(self, private_key, data: bytes) -> bytes:
+        return private_key.sign(data=data, hashfunc=hashlib.sha256, sigencode=sigencode_der)
+
+    def load_public_key(self, public_key: bytes):
+        key = ecdsa.VerifyingKey.from_string(public_key, hashfunc=hashlib.sha256, curve=ecdsa.SECP256k1)
+        # ecdsa 0.17 drops the curve order when decoding a point, which
+        # VerifyingKey.precompute() needs, so rebuild the point with it and
+        # multiply once to build the precomputation table eagerly
+        point = key.pubkey.point
+        key.pubkey.point = PointJacobi(ecdsa.SECP256k1.curve, point.x(), point.y(), 1,
+                                       ecdsa.SECP256k1.order, generator=True)
+        key.pubkey.point * 2
+        return key
+
+    def verify(self, public_key, signature: bytes, data: bytes) -> bool:
+        try:
+            return public_key.verify(signature=signature, data=data, hashfunc=hashlib.sha256,
+                                     sigdecode=sigdecode_der)
+        except (ecdsa.BadSignatureError, UnexpectedDER):
+            return False
+
+
+class CryptographyBackend(CryptoBackend):
+    name = "cryptography"
+
+    def load_private_key(self, secret: bytes):
+        return ec.derive_private_key(int.from_bytes(secret, 'big'), ec.SECP256K1())
+
+    def public_key_bytes(self, private_key) -> bytes:
+        return private_key.public_key().public_bytes(serialization.Encoding.X962,
+                                                     serialization.PublicFormat.CompressedPoint)
+
+    def sign(self, private_key, data: bytes) -> bytes:
+        return private_key.sign(data, ec.ECDSA(hashes.SHA256()))
+
+    def load_public_key(self, public_key: bytes):
+        return ec.EllipticCurvePublicKey.from_encoded_point(ec.SECP256K1(), public_key)
+
+    def verify(self, public_key, signature: bytes, data: bytes) -> bool:
+        try:
+            public_key.verify(signature, data, ec.ECDSA(hashes.SHA256()))
+            return True
+        except (InvalidSignature, ValueError):
+            return False
+
+
+class CoincurveBackend(CryptoBackend):
+    name = "coincurve"
+
+    def load_private_key(self, secret: bytes):
+        return coincurve.PrivateKey(secret)
+
+    def public_key_bytes(self, private_key) -> bytes:
+        return private_key.public_key.format(compressed=True)
+
+    def sign(self, private_key, data: bytes) -> bytes:
+        return private_key.sign(data, hasher=_sha256)
+
+    def load_public_key(self, public_key: bytes):
+        return coincurve.PublicKey(public_key)
+
+    def verify(self, public_key, signature: bytes, data: bytes) -> bool:
+        order = ecdsa.SECP256k1.order
+        try:
+            r, s = sigdecode_der(signature, order)
+            # libsecp256k1 only accepts low-S signatures, other backends may produce high-S ones
+            if s > order // 2:
+                signature = sigencode_der(r, order - s, order)
+            return public_key.verify(signature, data, hasher=_sha256)
+        except (UnexpectedDER, ValueError):
+            return False
+
+
+def _sha256(data: bytes) -> bytes:
+    return hashlib.sha256(data).digest()
+
+
+_BACKENDS: Dict[str, type] = {
+    CoincurveBackend.name: CoincurveBackend,
+    CryptographyBackend.name: CryptographyBackend,
+    EcdsaBackend.name: EcdsaBackend,
+}
+
+
+def available_backends() -> List[str]:
+    """Names of the installed backends, fastest first."""
+    installed = {
+        CoincurveBackend.name: coincurve is not None,
+        CryptographyBackend.name: ec is not None,
+        EcdsaBackend.name: True,
+    }
+    return [name for name in _BACKENDS if installed[name]]
+
+
+def get_backend(name: str = None) -> CryptoBackend:
+    """Return the named backend, or the fastest installed one."""
+    if name is None:
+        name = available_backends()[0]
+    elif name not in available_backends():
+        raise ValueError(f"crypto backend {name} is not available")
+    return _BACKENDS[name]()
@@ -1,41 +1,70 @@
 import hashlib
+from functools import lru_cache
 
 import ecdsa
-from ecdsa.util import sigencode_der, sigdecode_der
 
 from cobo_custody.signer.api_signer import ApiSigner
+from cobo_custody.signer.crypto_backend import CryptoBackend, get_backend
 
 
 class LocalSigner(ApiSigner):
 
     def get_public_key(self) -> str:
-        return self.key.verifying_key.to_string("compressed").hex()
+        return self.public_key
 
-    def __init__(self, priv_key: str):
-        secexp = int.from_bytes(bytes.fromhex(priv_key), 'big')
-        self.key = ecdsa.SigningKey.from_secret_exponent(secexp, curve=ecdsa.SECP256k1)
+    def __init__(self, priv_key: str, backend: CryptoBackend = None):
+        self.backend = backend or get_backend()
+        self.key = self.backend.load_private_key(bytes.fromhex(priv_key))
+        self.public_key = self.backend.public_key_bytes(self.key).hex()
 
     def sign(self, message: str) -> str:
-        return self.key.sign(data=hashlib.sha256(message.encode()).digest(),
-                             hashfunc=hashlib.sha256,
-                             sigencode=sigencode_der).hex()
+        return self.backend.sign(self.key, hashlib.sha256(message.encode()).digest()).hex()
 
     @staticmethod
     def double_hash256(content: str):
         return hashlib.sha256(hashlib.sha256(content.encode()).digest()).digest()
 
 
+class LocalVerifier(object):
+    """Verifies Cobo response signatures against one public key.
+
+    The key is decoded once by the crypto backend, which also precomputes
+    whatever tables it can, so every following ``verify`` is cheaper.
+    """
+
+    def __init__(self, pub_key: str, backend: CryptoBackend = None):
+        self.pub_key = pub_key
+        self.backend = backend or get_backend()
+        self.key = self.backend.load_public_key(bytes.fromhex(pub_key))
+
+    def verify(self, content: str, signature: str) -> bool:
+        return self.verify_digest(hashlib.sha256(content.encode()).digest(), signature)
+
+    def verify_digest(self, digest: bytes, signature: str) -> bool:
+        """Verify a signature over content already hashed once with SHA-256."""
+        try:
+            signature = bytes.fromhex(signature)
+        except ValueError:
+            return False
+        return self.backend.verify(self.key, signature, digest)
+
+
+@lru_cache(maxsize=16)
+def get_verifier(pub_key: str) -> LocalVerifier:
+    return LocalVerifier(pub_key)
+
+
 def verify_ecdsa_signature(content: str, signature: str, pub_key: str):
-    vk: ecdsa.VerifyingKey = ecdsa.VerifyingKey.from_string(bytes.fromhex(pub_key),
-                                                            hashfunc=hashlib.sha256,
-                                                            curve=ecdsa.SECP256k1)
-    try:
-        return vk.verify(signature=bytes.fromhex(signature),
-                         data=hashlib.sha256(content.encode()).digest(),
-                         hashfunc=hashlib.sha256,
-                         sigdecode=sigdecode_der)
-    except ecdsa.BadSignatureError:
-        return False
+    return get_verifier(pub_key).verify(content, signature)
+
+
+def verify_response_signature(content: bytes, timestamp: str, signature: str, pub_key: str) -> bool:
+    """Verify the signature of ``content|timestamp`` hashing the raw response
+    body in place instead of decoding and concatenating it."""
+    digest = hashlib.sha256(content)
+    digest.update(b"|")
+    digest.update(timestamp.encode())
+    return get_verifier(pub_key).verify_digest(digest.digest(), signature)
 
 
 def generate_new_key():
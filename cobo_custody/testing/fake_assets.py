@@ -0,0 +1,82 @@
+import hashlib
+import re
+from dataclasses import dataclass
+
+_BASE58 = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+_BASE32 = "ABCDEFGHIJKLMNOPQRSTUVWXYZ234567"
+_BECH32 = "qpzry9x8gf2tvdw0s3jn54khce6mua7l"
+
+ADDRESS_PATTERNS = {
+    "evm": re.compile(r"0x[0-9a-fA-F]{40}"),
+    "btc": re.compile(r"bc1[02-9ac-hj-np-z]{8,87}|[13][1-9A-HJ-NP-Za-km-z]{25,34}"),
+    "xrp": re.compile(r"r[1-9A-HJ-NP-Za-km-z]{24,34}"),
+    "xlm": re.compile(r"G[A-Z2-7]{55}"),
+}
+
+
+@dataclass(frozen=True)
+class FakeCoin:
+    """A coin the fake server supports.  ``address_style`` is a key of
+    ``ADDRESS_PATTERNS`` and decides how addresses look and validate."""
+    coin: str
+    chain_code: str
+    decimal: int
+    address_style: str = "evm"
+    fee_coin: str = None
+    require_memo: bool = False
+    gas_limit: int = 21000
+    gas_price: int = 10
+
+    @property
+    def fee_coin_code(self) -> str:
+        return self.fee_coin or self.coin
+
+    @property
+    def fee(self) -> int:
+        return self.gas_limit * self.gas_price
+
+    def info(self) -> dict:
+        return {"coin": self.coin, "chain_code": self.chain_code, "display_code": self.coin,
+                "description": self.coin, "decimal": self.decimal, "can_deposit": True, "can_withdraw": True,
+                "require_memo": self.require_memo, "fee_coin": self.fee_coin_code,
+                "abs_estimate_fee": format_amount(self.fee, self.decimal), "minimum_deposit_threshold": "0",
+                "confirming_threshold": 12, "token_address": ""}
+
+
+DEFAULT_COINS = (
+    FakeCoin("BTC", "BTC", 8, "btc", gas_limit=250, gas_price=20),
+    FakeCoin("ETH", "ETH", 18),
+    FakeCoin("TETH", "TETH", 18),
+    FakeCoin("COBO_ETH", "COBO_ETH", 18),
+    FakeCoin("XRP", "XRP", 6, "xrp", require_memo=True, gas_limit=1, gas_price=12),
+    FakeCoin("XLM", "XLM", 7, "xlm", require_memo=True, gas_limit=1, gas_price=100),
+    FakeCoin("GETH", "GETH", 18),
+    FakeCoin("GETH_USDT", "GETH", 6, fee_coin="GETH", gas_limit=60000),
+)
+
+
+def format_amount(amount: int, decimal: int) -> str:
+    """Integer base units as the human readable decimal string the API calls ``abs_*``."""
+    sign = "-" if amount < 0 else ""
+    whole, frac = divmod(abs(amount), 10 ** decimal)
+    frac = str(frac).rjust(decimal, "0").rstrip("0") if decimal else ""
+    return f"{sign}{whole}.{frac}" if frac else f"{sign}{whole}"
+
+
+def make_address(style: str, seed: str, native_segwit: bool = False) -> str:
+    """A well formed, deterministic address of ``style`` derived from ``seed``."""
+    digest = hashlib.sha512(seed.encode()).digest()
+    if style == "btc":
+        if native_segwit:
+            return "bc1q" + "".join(_BECH32[b % 32] for b in digest[:38])
+        return "3" + "".join(_BASE58[b % 58] for b in digest[:33])
+    if style == "xrp":
+        return "r" + "".join(_BASE58[b % 58] for b in digest[:33])
+    if style == "xlm":
+        return "G" + "".join(_BASE32[b % 32] for b in digest[:55])
+    return "0x" + digest[:20].hex()
+
+
+def is_valid_address(style: str, address: str) -> bool:
+    pattern = ADDRESS_PATTERNS.get(style)
+    return bool(pattern and address and pattern.fullmatch(address))
@@ -0,0 +1,715 @@
+import hashlib
+import itertools
+from collections import defaultdict
+from typing import List
+
+from cobo_custody.testing.fake_assets import FakeCoin, format_amount, is_valid_address, make_address
+from cobo_custody.testing.fake_wallet import FakeApiError, FakeWallet
+
+# custody transaction status -> the numeric code ``transactions_by_time_ex`` filters on
+CUSTODY_STATUS_CODES = {"pending": 100, "success": 900, "failed": 901}
+CUSTODY_SIDES = {"1": "deposit", "2": "withdraw"}
+MAX_LIMIT = 50
+
+
+def endpoint(method: str, path: str):
+    """Register the decorated method as the handler of ``method path``."""
+    def decorate(fn):
+        fn.endpoint = (method, path)
+        return fn
+    return decorate
+
+
+def required(params: dict, key: str) -> str:
+    value = params.get(key)
+    if value is None or value == "":
+        raise FakeApiError(FakeApiError.INVALID_PARAMETER, f"missing parameter {key}")
+    return value
+
+
+def integer(params: dict, key: str, default: int = None) -> int:
+    value = params.get(key)
+    if value is None or value == "":
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise FakeApiError(FakeApiError.INVALID_PARAMETER, f"{key} must be an integer")
+
+
+def flag(params: dict, key: str) -> bool:
+    return params.get(key, "").lower() in ("true", "1")
+
+
+def limit(params: dict, default: int = MAX_LIMIT) -> int:
+    return max(1, min(integer(params, "limit", default), MAX_LIMIT))
+
+
+def by_id_window(records: List[dict], params: dict, id_key: str = "id", max_key: str = "max_id",
+                 min_key: str = "min_id") -> List[dict]:
+    """Id cursor paging: downwards from ``max_id``, or upwards from ``min_id`` when only that is given."""
+    max_id, min_id = integer(params, max_key), integer(params, min_key)
+    records = [record for record in records
+               if (max_id is None or int(record[id_key]) < max_id) and (min_id is None or int(record[id_key]) > min_id)]
+    records.sort(key=lambda record: int(record[id_key]), reverse=not (min_id is not None and max_id is None))
+    return records[:limit(params)]
+
+
+def page(records: List[dict], params: dict) -> List[dict]:
+    index, length = integer(params, "page_index", 0), integer(params, "page_length", MAX_LIMIT)
+    return records[index * length:(index + 1) * length]
+
+
+class CustodyEndpoints(object):
+    """Custody wallet endpoints of ``Client``: one balance per coin, deposit
+    addresses, deposits and withdrawals, loop addresses and staking."""
+
+    def _init_custody(self):
+        self.custody_balances = defaultdict(int)
+        self.custody_addresses = defaultdict(list)
+        self.custody_transactions = {}
+        self.custody_by_request_id = {}
+        self.loop_addresses = set()
+        self.staking_products = [{"product_id": "1", "coin": "TETH", "name": "TETH staking", "rate": "0.05",
+                                  "min_amount": "1", "unstake_days": 7}]
+        self.stakings = defaultdict(int)
+        self.staking_history = []
+        self._custody_address_seq = itertools.count(1)
+
+    # state helpers, also used to seed a scenario
+    def add_custody_address(self, coin: str, address: str = None, native_segwit: bool = False) -> str:
+        fake_coin = self.coin(coin)
+        if address is None:
+            address = make_address(fake_coin.address_style, f"custody:{coin}:{next(self._custody_address_seq)}",
+                                   native_segwit)
+            if fake_coin.require_memo:
+                address = f"{address}|{next(self._custody_address_seq)}"
+        records = self.custody_addresses[coin]
+        if address not in {record["address"] for record in records}:
+            records.append({"id": str(len(records) + 1), "coin": coin, "address": address})
+        return address
+
+    def owns_custody_address(self, coin: str, address: str, memo: str = None) -> bool:
+        key = f"{address}|{memo}" if memo else address
+        return any(record["address"] == key for record in self.custody_addresses.get(coin, ()))
+
+    def add_loop_address(self, coin: str, address: str, memo: str = None):
+        """Register an address of another Cobo customer, which loop transfers can reach."""
+        self.loop_addresses.add((coin, f"{address}|{memo}" if memo else address))
+
+    def custody_deposit(self, coin: str, amount: int, address: str = None, confirmed: bool = True,
+                        txid: str = None, record_id: str = None) -> dict:
+        address = address or self.add_custody_address(coin)
+        record = self._custody_transaction(coin, "deposit", address, amount, txid=txid, record_id=record_id,
+                                           status="success" if confirmed else "pending")
+        if confirmed:
+            self.custody_balances[coin] += amount
+        return record
+
+    def custody_withdraw(self, coin: str, amount: int, address: str, request_id: str, confirmed: bool = True,
+                         txid: str = None, record_id: str = None) -> dict:
+        """Record a withdraw made before the scenario starts; the balance is not touched."""
+        return self._custody_transaction(coin, "withdraw", address, amount, request_id=request_id, txid=txid,
+                                         record_id=record_id, status="success" if confirmed else "pending")
+
+    def _custody_transaction(self, coin: str, side: str, address: str, amount: int, request_id: str = "",
+                             memo: str = "", status: str = "pending", txid: str = None,
+                             record_id: str = None) -> dict:
+        fake_coin = self.coin(coin)
+        now = self.clock()
+        record_id = record_id or self.next_id()
+        txid = txid or ("0x" + hashlib.sha256(record_id.encode()).hexdigest() if status == "success" else "")
+        record = {"id": record_id, "coin": coin, "display_code": coin, "description": coin,
+                  "decimal": fake_coin.decimal, "address": address, "source_address": "", "side": side,
+                  "amount": str(amount), "abs_amount": format_amount(amount, fake_coin.decimal), "txid": txid,
+                  "vout_n": 0, "request_id": request_id, "status": status, "abs_cobo_fee": "0",
+                  "created_time": now, "last_time": now, "confirmed_num": 12 if status == "success" else 0,
+                  "confirming_threshold": 12, "memo": memo, "fee_coin": fake_coin.fee_coin_code,
+                  "fee_amount": 0, "fee_decimal": self.coin(fake_coin.fee_coin_code).decimal, "type": "external",
+                  "tx_detail": {"txid": txid, "blocknum": 0, "blockhash": "", "hexstr": ""}}
+        self.custody_transactions[record_id] = record
+        if request_id:
+            self.custody_by_request_id[request_id] = record
+        return record
+
+    def settle_custody(self, record: dict, success: bool = True):
+        if record["status"] != "pending":
+            return
+        amount = int(record["amount"])
+        if record["side"] == "deposit" and success:
+            self.custody_balances[record["coin"]] += amount
+        elif record["side"] == "withdraw" and not success:
+            self.custody_balances[record["coin"]] += amount
+        record.update(status="success" if success else "failed", last_time=self.clock(),
+                      confirmed_num=12 if success else 0)
+        if success:
+            record["txid"] = record["tx_detail"]["txid"] = "0x" + hashlib.sha256(record["id"].encode()).hexdigest()
+
+    def _custody_coin_info(self, coin: FakeCoin) -> dict:
+        balance = self.custody_balances.get(coin.coin, 0)
+        return dict(coin.info(), balance=str(balance), abs_balance=format_amount(balance, coin.decimal))
+
+    def _custody_query(self, params: dict, pending_only: bool = False) -> List[dict]:
+        coin, side, address = params.get("coin"), params.get("side"), params.get("address")
+        return [record for record in self.custody_transactions.values()
+                if (not coin or record["coin"] == coin) and (not side or record["side"] == side)
+                and (not address or record["address"].lower() == address.lower())
+                and (not pending_only or record["status"] == "pending")]
+
+    # account and address
+    @endpoint("GET", "/v1/custody/org_info/")
+    def org_info(self, params: dict):
+        return {"name": "Fake Org", "assets": [self._custody_coin_info(coin) for coin in self.coins.values()]}
+
+    @endpoint("GET", "/v1/custody/coin_info/")
+    def custody_coin_info(self, params: dict):
+        return self._custody_coin_info(self.coin(required(params, "coin")))
+
+    @endpoint("GET", "/v1/custody/get_supported_coins/")
+    def custody_supported_coins(self, params: dict):
+        return [coin.info() for coin in self.coins.values()]
+
+    @endpoint("POST", "/v1/custody/new_address/")
+    def new_address(self, params: dict):
+        coin = required(params, "coin")
+        return {"coin": coin, "address": self.add_custody_address(coin, native_segwit=flag(params, "native_segwit"))}
+
+    @endpoint("POST", "/v1/custody/new_addresses/")
+    def new_addresses(self, params: dict):
+        coin = required(params, "coin")
+        count = integer(params, "count", 1)
+        if not 0 < count <= 1000:
+            raise FakeApiError(FakeApiError.INVALID_PARAMETER, "count must be between 1 and 1000")
+        native_segwit = flag(params, "native_segwit")
+        return {"coin": coin,
+                "addresses": [self.add_custody_address(coin, native_segwit=native_segwit) for _ in range(count)]}
+
+    @endpoint("GET", "/v1/custody/address_info/")
+    def address_info(self, params: dict):
+        coin, address = required(params, "coin"), required(params, "address")
+        if not self.owns_custody_address(coin, address):
+            raise FakeApiError(FakeApiError.INVALID_ADDRESS, f"{address} is not a deposit address of the wallet")
+        return {"coin": coin, "address": address}
+
+    @endpoint("GET", "/v1/custody/addresses_info/")
+    def addresses_info(self, params: dict):
+        coin = required(params, "coin")
+        return {"coin": coin, "addresses": [address for address in required(params, "address").split(",")
+                                            if self.owns_custody_address(coin, address)]}
+
+    @endpoint("GET", "/v1/custody/is_valid_address/")
+    def custody_is_valid_address(self, params: dict):
+        coin = self.coin(required(params, "coin"))
+        address = required(params, "address").split("|")[0]
+        return is_valid_address(coin.address_style, address)
+
+    @endpoint("GET", "/v1/custody/address_history/")
+    def address_history(self, params: dict):
+        records = list(self.custody_addresses.get(required(params, "coin"), ()))
+        if integer(params, "sort_flag", 0) == 0:
+            records.reverse()
+        return page(records, params)
+
+    # loop alliance
+    def _loop_info(self, coin: str, address: str) -> dict:
+        internal = (coin, address) in self.loop_addresses
+        return {"coin": coin, "address": address, "is_internal_address": internal,
+                "internal_org": "Fake Loop Org" if internal else "", "internal_wallet": ""}
+
+    @endpoint("GET", "/v1/custody/internal_address_info/")
+    def internal_address_info(self, params: dict):
+        address, memo = required(params, "address"), params.get("memo")
+        return self._loop_info(required(params, "coin"), f"{address}|{memo}" if memo else address)
+
+    @endpoint("GET", "/v1/custody/internal_address_info_batch/")
+    def internal_address_info_batch(self, params: dict):
+        coin = required(params, "coin")
+        return [self._loop_info(coin, address) for address in required(params, "address").split(",")]
+
+    # transactions
+    @endpoint("GET", "/v1/custody/transaction/")
+    def transaction(self, params: dict):
+        record = self.custody_transactions.get(required(params, "id"))
+        if record is None:
+            raise FakeApiError(FakeApiError.NOT_FOUND, "transaction not found")
+        return record
+
+    @endpoint("GET", "/v1/custody/transaction_by_txid/")
+    def transaction_by_txid(self, params: dict):
+        txid = required(params, "txid")
+        for record in self.custody_transactions.values():
+            if record["txid"] == txid:
+                return record
+        raise FakeApiError(FakeApiError.NOT_FOUND, "transaction not found")
+
+    @endpoint("GET", "/v1/custody/transactions_by_id/")
+    def transactions_by_id(self, params: dict):
+        return by_id_window([record for record in self._custody_query(params) if record["status"] != "pending"],
+                            params)
+
+    @endpoint("GET", "/v1/custody/transaction_history/")
+    def transaction_history(self, params: dict):
+        return by_id_window(self._custody_query(params), params)
+
+    @endpoint("GET", "/v1/custody/transactions_by_time/")
+    def transactions_by_time(self, params: dict):
+        begin, end = integer(params, "begin_time"), integer(params, "end_time")
+        records = [record for record in self._custody_query(params)
+                   if (begin is None or record["created_time"] >= begin) and
+                   (end is None or record["created_time"] <= end)]
+        records.sort(key=lambda record: record["created_time"], reverse=begin is None)
+        return records[:limit(params)]
+
+    @endpoint("GET", "/v1/custody/transactions_by_time_ex/")
+    def transactions_by_time_ex(self, params: dict):
+        coins = set(params["coins"].split(",")) if params.get("coins") else None
+        side = CUSTODY_SIDES.get(params.get("side", ""))
+        status, txid = integer(params, "status"), params.get("txid")
+        begin, end = integer(params, "begin_time"), integer(params, "end_time")
+        address = params.get("address")
+        records = [record for record in self.custody_transactions.values()
+                   if (coins is None or record["coin"] in coins) and (side is None or record["side"] == side)
+                   and (status is None or CUSTODY_STATUS_CODES[record["status"]] == status)
+                   and (not txid or record["txid"] == txid)
+                   and (not address or record["address"].lower() == address.lower())
+                   and (begin is None or record["created_time"] >= begin)
+                   and (end is None or record["created_time"] <= end)]
+        records.sort(key=lambda record: (record["created_time"], int(record["id"])),
+                     reverse=params.get("order", "DESC").upper() != "ASC")
+        offset = integer(params, "offset", 0)
+        return records[offset:offset + limit(params)]
+
+    @endpoint("GET", "/v1/custody/pending_transactions/")
+    def pending_transactions(self, params: dict):
+        return by_id_window(self._custody_query(params, pending_only=True), params)
+
+    @endpoint("GET", "/v1/custody/pending_transaction/")
+    def pending_transaction(self, params: dict):
+        record = self.custody_transactions.get(required(params, "id"))
+        if record is None or record["status"] != "pending":
+            raise FakeApiError(FakeApiError.NOT_FOUND, "pending transaction not found")
+        return record
+
+    @endpoint("GET", "/v1/custody/transactions_by_request_ids/")
+    def custody_transactions_by_request_ids(self, params: dict):
+        return [self.custody_by_request_id[request_id] for request_id in required(params, "request_ids").split(",")
+                if request_id in self.custody_by_request_id]
+
+    # withdraw
+    @endpoint("POST", "/v1/custody/new_withdraw_request/")
+    def new_withdraw_request(self, params: dict):
+        coin = self.coin(required(params, "coin"))
+        request_id, address = required(params, "request_id"), required(params, "address")
+        amount = integer(params, "amount", 0)
+        if request_id in self.custody_by_request_id:
+            raise FakeApiError(FakeApiError.DUPLICATE_REQUEST_ID, f"duplicate request_id {request_id}")
+        if not is_valid_address(coin.address_style, address):
+            raise FakeApiError(FakeApiError.INVALID_ADDRESS, f"invalid {coin.coin} address {address}")
+        if amount <= 0:
+            raise FakeApiError(FakeApiError.INVALID_PARAMETER, "amount must be positive")
+        if self.custody_balances.get(coin.coin, 0) < amount:
+            raise FakeApiError(FakeApiError.INSUFFICIENT_BALANCE, f"insufficient {coin.coin} balance")
+        self.custody_balances[coin.coin] -= amount
+        self._custody_transaction(coin.coin, "withdraw", address, amount, request_id=request_id,
+                                  memo=params.get("memo") or "")
+        return request_id
+
+    @endpoint("GET", "/v1/custody/withdraw_info_by_request_id/")
+    def withdraw_info_by_request_id(self, params: dict):
+        record = self.custody_by_request_id.get(required(params, "request_id"))
+        if record is None:
+            raise FakeApiError(FakeApiError.NOT_FOUND, "withdraw request not found")
+        return record
+
+    # staking
+    def _staking_product(self, product_id: str) -> dict:
+        for product in self.staking_products:
+            if product["product_id"] == product_id:
+                return product
+        raise FakeApiError(FakeApiError.NOT_FOUND, "staking product not found")
+
+    @endpoint("GET", "/v1/custody/staking_product/")
+    def staking_product(self, params: dict):
+        return self._staking_product(required(params, "product_id"))
+
+    @endpoint("GET", "/v1/custody/staking_products/")
+    def staking_product_list(self, params: dict):
+        coin = params.get("coin")
+        return [product for product in self.staking_products if not coin or product["coin"] == coin]
+
+    def _stake(self, params: dict, side: str):
+        product = self._staking_product(required(params, "product_id"))
+        amount = integer(params, "amount", 0)
+        coin = product["coin"]
+        if amount <= 0:
+            raise FakeApiError(FakeApiError.INVALID_PARAMETER, "amount must be positive")
+        source = self.custody_balances if side == "stake" else self.stakings
+        if source.get(coin if side == "stake" else product["product_id"], 0) < amount:
+            raise FakeApiError(FakeApiError.INSUFFICIENT_BALANCE, f"insufficient {coin} amount to {side}")
+        sign = 1 if side == "stake" else -1
+        self.custody_balances[coin] -= sign * amount
+        self.stakings[product["product_id"]] += sign * amount
+        self.staking_history.append({"id": self.next_id(), "product_id": product["product_id"], "coin": coin,
+                                     "amount": str(amount), "type": side, "created_time": self.clock()})
+        return True
+
+    @endpoint("POST", "/v1/custody/staking_stake/")
+    def staking_stake(self, params: dict):
+        return self._stake(params, "stake")
+
+    @endpoint("POST", "/v1/custody/staking_unstake/")
+    def staking_unstake(self, params: dict):
+        return self._stake(params, "unstake")
+
+    @endpoint("GET", "/v1/custody/stakings/")
+    def staking_list(self, params: dict):
+        coin = params.get("coin")
+        return [dict(product, amount=str(self.stakings[product["product_id"]])) for product in self.staking_products
+                if self.stakings.get(product["product_id"]) and (not coin or product["coin"] == coin)]
+
+    @endpoint("GET", "/v1/custody/unstakings/")
+    def unstaking_list(self, params: dict):
+        coin = params.get("coin")
+        return [entry for entry in self.staking_history
+                if entry["type"] == "unstake" and (not coin or entry["coin"] == coin)]
+
+    @endpoint("GET", "/v1/custody/staking_history/")
+    def staking_history_list(self, params: dict):
+        return list(reversed(self.staking_history))
+
+    @endpoint("GET", "/v1/custody/get_gas_station_balance/")
+    def gas_station_balance(self, params: dict):
+        return []
+
+
+class WalletEndpoints(object):
+    """Endpoints shared by the MPC and Web3 wallets."""
+
+    def _wallet_transfer(self, wallet: FakeWallet, params: dict, from_key: str, to_key: str) -> dict:
+        amount = integer(params, "amount", 0)
+        coin = wallet.coin(required(params, "coin"))
+        from_address = params.get(from_key)
+        if not from_address:
+            # like the API, pick an address that can pay when none is given
+            fee = 0 if integer(params, "auto_fuel", 0) else coin.fee
+            candidates = [record["address"] for record in wallet.addresses.get(coin.chain_code, ())
+                          if wallet.balance(coin.coin, record["address"]) >= amount
+                          and wallet.balance(coin.fee_coin_code, record["address"]) >= fee]
+            if not candidates:
+                raise FakeApiError(FakeApiError.INSUFFICIENT_BALANCE, f"no address can pay {amount} {coin.coin}")
+            from_address = candidates[0]
+        to_address = required(params, to_key)
+        if not is_valid_address(coin.address_style, to_address):
+            raise FakeApiError(FakeApiError.INVALID_ADDRESS, f"invalid {coin.coin} address {to_address}")
+        return wallet.create_transaction(coin.coin, params.get("request_id"), from_address, to_address, amount,
+                                         gas_price=integer(params, "gas_price"), gas_limit=integer(params, "gas_limit"),
+                                         auto_fuel=bool(integer(params, "auto_fuel", 0)),
+                                         remark=params.get("remark") or "")
+
+    @staticmethod
+    def _coin_list(coins, chain_code: str = None) -> List[dict]:
+        return [{"coin": coin.coin, "chain_code": coin.chain_code, "display_code": coin.coin,
+                 "description": coin.coin, "decimal": coin.decimal, "can_deposit": True, "can_withdraw": True}
+                for coin in coins if not chain_code or coin.chain_code == chain_code]
+
+    def _chains(self) -> List[dict]:
+        chains = dict.fromkeys(coin.chain_code for coin in self.coins.values())
+        return [{"chain_code": chain_code} for chain_code in chains]
+
+
+class MPCEndpoints(WalletEndpoints):
+    """MPC wallet endpoints of ``MPCClient``."""
+
+    @endpoint("GET", "/v1/custody/mpc/get_supported_chains/")
+    def mpc_supported_chains(self, params: dict):
+        return {"chains": self._chains()}
+
+    @endpoint("GET", "/v1/custody/mpc/get_supported_coins/")
+    def mpc_supported_coins(self, params: dict):
+        return {"coins": self._coin_list(self.coins.values(), required(params, "chain_code"))}
+
+    @endpoint("GET", "/v1/custody/mpc/get_supported_nft_collections/")
+    def mpc_supported_nft_collections(self, params: dict):
+        return {"nft_collections": []}
+
+    @endpoint("GET", "/v1/custody/mpc/get_wallet_supported_coins/")
+    def mpc_wallet_supported_coins(self, params: dict):
+        return {"coins": self._coin_list(self.coins.values())}
+
+    @endpoint("GET", "/v1/custody/mpc/coin_info/")
+    def mpc_coin_info(self, params: dict):
+        return self._coin_list([self.coin(required(params, "coin"))])[0]
+
+    @endpoint("GET", "/v1/custody/mpc/is_valid_address/")
+    def mpc_is_valid_address(self, params: dict):
+        return is_valid_address(self.coin(required(params, "coin")).address_style, required(params, "address"))
+
+    @endpoint("GET", "/v1/custody/mpc/get_main_address/")
+    def mpc_main_address(self, params: dict):
+        chain_code = required(params, "chain_code")
+        records = self.mpc.addresses.get(chain_code)
+        return records[0] if records else self.mpc.add_address(chain_code)
+
+    @endpoint("POST", "/v1/custody/mpc/generate_addresses/")
+    def mpc_generate_addresses(self, params: dict):
+        chain_code = required(params, "chain_code")
+        count = integer(params, "count", 1)
+        if not 0 < count <= 1000:
+            raise FakeApiError(FakeApiError.INVALID_PARAMETER, "count must be between 1 and 1000")
+        return {"addresses": [self.mpc.add_address(chain_code) for _ in range(count)]}
+
+    @endpoint("POST", "/v1/custody/mpc/update_address_description/")
+    def mpc_update_address_description(self, params: dict):
+        address = required(params, "address")
+        if not self.mpc.owns(address):
+            raise FakeApiError(FakeApiError.INVALID_ADDRESS, f"{address} is not an address of the wallet")
+        record = self.mpc.owners[address.lower()]
+        record["description"] = params.get("description") or ""
+        return record
+
+    @endpoint("GET", "/v1/custody/mpc/list_addresses/")
+    def mpc_list_addresses(self, params: dict):
+        records = self.mpc.addresses.get(required(params, "chain_code"), [])
+        start, end = integer(params, "start_id"), integer(params, "end_id")
+        window = [record for record in records
+                  if (start is None or int(record["id"]) > start) and (end is None or int(record["id"]) < end)]
+        if integer(params, "sort", 0) != 1:
+            window.reverse()
+        return {"total": len(records), "addresses": window[:limit(params)]}
+
+    @endpoint("GET", "/v1/custody/mpc/get_balance/")
+    def mpc_get_balance(self, params: dict):
+        address = required(params, "address")
+        if not self.mpc.owns(address):
+            raise FakeApiError(FakeApiError.INVALID_ADDRESS, f"{address} is not an address of the wallet")
+        coin = params.get("coin")
+        chain_code = params.get("chain_code")
+        if coin:
+            coin_data = [self.mpc.balance_record(coin, address)]
+        else:
+            coin_data = [self.mpc.balance_record(code, address) for code, fake_coin in self.coins.items()
+                         if self.mpc.balance(code, address) and (not chain_code or fake_coin.chain_code == chain_code)]
+        return {"coin_data": coin_data, "nft_data": []}
+
+    @endpoint("GET", "/v1/custody/mpc/list_balances/")
+    def mpc_list_balances(self, params: dict):
+        coin, chain_code = params.get("coin"), params.get("chain_code")
+        records = [self.mpc.balance_record(code, address) for (code, address), amount in self.mpc.balances.items()
+                   if amount and (not coin or code == coin) and
+                   (not chain_code or self.coins[code].chain_code == chain_code)]
+        return {"total": len(records), "coin_data": page(records, params)}
+
+    @endpoint("GET", "/v1/custody/mpc/list_spendable/")
+    def mpc_list_spendable(self, params: dict):
+        self.coin(required(params, "coin"))
+        return {"spendables": []}
+
+    @endpoint("POST", "/v1/custody/mpc/create_transaction/")
+    def mpc_create_transaction(self, params: dict):
+        record = self._wallet_transfer(self.mpc, params, "from_address", "to_address")
+        return {"cobo_id": record["cobo_id"], "request_id": record["request_id"]}
+
+    @endpoint("POST", "/v1/custody/mpc/estimate_fee/")
+    def mpc_estimate_fee(self, params: dict):
+        coin = self.coin(required(params, "coin"))
+        gas_price = integer(params, "gas_price") or coin.gas_price
+        gas_limit = integer(params, "gas_limit") or coin.gas_limit
+
+        def level(price: int) -> dict:
+            return {"gas_price": price, "gas_limit": gas_limit, "fee_amount": price * gas_limit}
+
+        return {"fee_coin": coin.fee_coin_code, "slow": level(max(1, gas_price // 2)), "average": level(gas_price),
+                "fast": level(gas_price * 2)}
+
+    def _mpc_transactions(self, records, params: dict) -> dict:
+        status = integer(params, "status")
+        return {"transactions": [record for record in records if status is None or record["status"] == status]}
+
+    @endpoint("GET", "/v1/custody/mpc/transactions_by_request_ids/")
+    def mpc_transactions_by_request_ids(self, params: dict):
+        by_request_id = self.mpc.by_request_id
+        return self._mpc_transactions([by_request_id[request_id] for request_id in
+                                       required(params, "request_ids").split(",") if request_id in by_request_id],
+                                      params)
+
+    @endpoint("GET", "/v1/custody/mpc/transactions_by_cobo_ids/")
+    def mpc_transactions_by_cobo_ids(self, params: dict):
+        transactions = self.mpc.transactions
+        return self._mpc_transactions([transactions[cobo_id] for cobo_id in required(params, "cobo_ids").split(",")
+                                       if cobo_id in transactions], params)
+
+    @endpoint("GET", "/v1/custody/mpc/transactions_by_tx_hash/")
+    def mpc_transactions_by_tx_hash(self, params: dict):
+        tx_hash = required(params, "tx_hash")
+        transaction_type = integer(params, "transaction_type")
+        return {"transactions": [record for record in self.mpc.transactions.values() if record["tx_hash"] == tx_hash
+                                 and (transaction_type is None or record["transaction_type"] == transaction_type)]}
+
+    @endpoint("GET", "/v1/custody/mpc/list_transactions/")
+    def mpc_list_transactions(self, params: dict):
+        start, end = integer(params, "start_time"), integer(params, "end_time")
+        status, transaction_type = integer(params, "status"), integer(params, "transaction_type")
+        coins = set(params["coins"].split(",")) if params.get("coins") else None
+        from_address, to_address = params.get("from_address"), params.get("to_address")
+        records = [record for record in self.mpc.transactions.values()
+                   if (start is None or record["created_timestamp"] >= start)
+                   and (end is None or record["created_timestamp"] <= end)
+                   and (status is None or record["status"] == status)
+                   and (transaction_type is None or record["transaction_type"] == transaction_type)
+                   and (coins is None or record["coin_detail"]["coin"] in coins)
+                   and (not from_address or record["from_address"] == from_address)
+                   and (not to_address or record["to_address"] == to_address)]
+        records.sort(key=lambda record: record["created_timestamp"],
+                     reverse=params.get("order", "desc").lower() != "asc")
+        return {"transactions": records[:limit(params)]}
+
+    @endpoint("POST", "/v1/custody/mpc/sign_message/")
+    def mpc_sign_message(self, params: dict):
+        request_id = required(params, "request_id")
+        if request_id in self.sign_messages:
+            raise FakeApiError(FakeApiError.DUPLICATE_REQUEST_ID, f"duplicate request_id {request_id}")
+        record = {"cobo_id": self.next_id(), "request_id": request_id, "chain_code": required(params, "chain_code"),
+                  "from_address": required(params, "from_address"), "sign_version": integer(params, "sign_version"),
+                  "extra_parameters": params.get("extra_parameters", ""), "status": 501,
+                  "signature": hashlib.sha256(request_id.encode()).hexdigest(), "created_timestamp": self.clock()}
+        self.sign_messages[request_id] = record
+        return {"cobo_id": record["cobo_id"], "request_id": request_id}
+
+    @endpoint("GET", "/v1/custody/mpc/sign_messages_by_request_ids/")
+    def mpc_sign_messages_by_request_ids(self, params: dict):
+        return {"sign_messages": [self.sign_messages[request_id] for request_id in
+                                  required(params, "request_ids").split(",") if request_id in self.sign_messages]}
+
+    @endpoint("GET", "/v1/custody/mpc/sign_messages_by_cobo_ids/")
+    def mpc_sign_messages_by_cobo_ids(self, params: dict):
+        cobo_ids = set(required(params, "cobo_ids").split(","))
+        return {"sign_messages": [record for record in self.sign_messages.values() if record["cobo_id"] in cobo_ids]}
+
+    @endpoint("POST", "/v1/custody/mpc/retry_double_check/")
+    def mpc_retry_double_check(self, params: dict):
+        required(params, "request_id")
+        raise FakeApiError(FakeApiError.INVALID_PARAMETER, "transaction is not waiting for a double check")
+
+    @endpoint("GET", "/v1/custody/mpc/list_tss_node_requests/")
+    def mpc_list_tss_node_requests(self, params: dict):
+        return []
+
+    @endpoint("GET", "/v1/custody/mpc/list_tss_node/")
+    def mpc_list_tss_node(self, params: dict):
+        return []
+
+    @endpoint("GET", "/v1/custody/mpc/get_max_send_amount/")
+    def mpc_max_send_amount(self, params: dict):
+        coin = self.coin(required(params, "coin"))
+        from_address = params.get("from_address")
+        addresses = [from_address] if from_address else [record["address"] for record in
+                                                         self.mpc.addresses.get(coin.chain_code, ())]
+        fee = coin.fee if coin.fee_coin_code == coin.coin else 0
+        amount = max([self.mpc.balance(coin.coin, address) - fee for address in addresses] or [0])
+        return {"max_send_amount": str(max(amount, 0))}
+
+
+class Web3Endpoints(WalletEndpoints):
+    """Web3 wallet endpoints of ``Web3Client``."""
+
+    @endpoint("POST", "/v1/custody/web3_add_addresses/")
+    def web3_add_addresses(self, params: dict):
+        chain_code = required(params, "chain_code")
+        count = integer(params, "count", 1)
+        if not 0 < count <= 1000:
+            raise FakeApiError(FakeApiError.INVALID_PARAMETER, "count must be between 1 and 1000")
+        return {"chain_code": chain_code, "addresses": [self.web3.add_address(chain_code) for _ in range(count)]}
+
+    @endpoint("GET", "/v1/custody/web3_list_wallet_address/")
+    def web3_list_wallet_address(self, params: dict):
+        records = list(self.web3.addresses.get(required(params, "chain_code"), []))
+        if integer(params, "sort_flag", 0) == 0:
+            records.reverse()
+        return {"total": len(records), "addresses": page(records, params)}
+
+    @endpoint("GET", "/v1/custody/web3_list_wallet_assets/")
+    def web3_list_wallet_assets(self, params: dict):
+        address, chain_code = params.get("address"), params.get("chain_code")
+        return {"assets": [self.web3.balance_record(code, owner) for (code, owner), amount
+                           in self.web3.balances.items()
+                           if amount and (not address or owner == address.lower())
+                           and (not chain_code or self.coins[code].chain_code == chain_code)]}
+
+    @endpoint("GET", "/v1/custody/web3_list_wallet_nfts/")
+    def web3_list_wallet_nfts(self, params: dict):
+        required(params, "nft_code")
+        return {"nfts": []}
+
+    @endpoint("GET", "/v1/custody/web3_wallet_nft_detail/")
+    def web3_wallet_nft_detail(self, params: dict):
+        return {"nft_code": required(params, "nft_code"), "token_id": required(params, "token_id"),
+                "owner_address": "", "token_uri": "", "content_type": "", "content_uri": ""}
+
+    @endpoint("GET", "/v1/custody/web3_supported_chains/")
+    def web3_supported_chains(self, params: dict):
+        return {"chains": self._chains()}
+
+    @endpoint("GET", "/v1/custody/web3_supported_coins/")
+    def web3_supported_coins(self, params: dict):
+        return {"coins": self._coin_list(self.coins.values(), required(params, "chain_code"))}
+
+    @endpoint("GET", "/v1/custody/web3_supported_nft_collections/")
+    def web3_supported_nft_collections(self, params: dict):
+        return {"nft_collections": []}
+
+    @endpoint("GET", "/v1/custody/web3_supported_contracts/")
+    def web3_supported_contracts(self, params: dict):
+        required(params, "chain_code")
+        return {"contracts": []}
+
+    @endpoint("GET", "/v1/custody/web3_supported_contract_methods/")
+    def web3_supported_contract_methods(self, params: dict):
+        required(params, "contract_address")
+        return {"methods": []}
+
+    @endpoint("POST", "/v1/custody/web3_withdraw/")
+    def web3_withdraw(self, params: dict):
+        record = self._wallet_transfer(self.web3, params, "from_addr", "to_addr")
+        return {"request_id": record["request_id"]}
+
+    @endpoint("GET", "/v1/custody/web3_get_withdraw_transaction/")
+    def web3_get_withdraw_transaction(self, params: dict):
+        record = self.web3.by_request_id.get(required(params, "request_id"))
+        if record is None:
+            raise FakeApiError(FakeApiError.NOT_FOUND, "transaction not found")
+        return record
+
+    @endpoint("POST", "/v1/custody/web3_contract/")
+    def web3_contract(self, params: dict):
+        # contract calls are recorded and settled like transfers, but move no balance
+        request_id = required(params, "request_id")
+        if request_id in self.contract_calls:
+            raise FakeApiError(FakeApiError.DUPLICATE_REQUEST_ID, f"duplicate request_id {request_id}")
+        wallet_address = required(params, "wallet_addr")
+        if not self.web3.owns(wallet_address):
+            raise FakeApiError(FakeApiError.INVALID_ADDRESS, f"{wallet_address} is not an address of the wallet")
+        now = self.clock()
+        self.contract_calls[request_id] = {
+            "cobo_id": self.next_id(), "request_id": request_id, "chain_code": required(params, "chain_code"),
+            "wallet_address": wallet_address, "contract_address": required(params, "contract_addr"),
+            "method_id": required(params, "method_id"), "method_name": params.get("method_name", ""),
+            "args": params.get("args", ""), "amount": str(integer(params, "amount", 0)), "status": 501,
+            "tx_hash": "0x" + hashlib.sha256(request_id.encode()).hexdigest(), "created_timestamp": now,
+            "updated_timestamp": now}
+        return {"request_id": request_id}
+
+    @endpoint("GET", "/v1/custody/web3_get_contract_transaction/")
+    def web3_get_contract_transaction(self, params: dict):
+        record = self.contract_calls.get(required(params, "request_id"))
+        if record is None:
+            raise FakeApiError(FakeApiError.NOT_FOUND, "transaction not found")
+        return record
+
+    @endpoint("GET", "/v1/custody/web3_list_wallet_transactions/")
+    def web3_list_wallet_transactions(self, params: dict):
+        address = required(params, "address").lower()
+        chain_code = params.get("chain_code")
+        records = [dict(record, id=record["cobo_id"]) for record in self.web3.transactions.values()
+                   if address in (record["from_address"].lower(), record["to_address"].lower())
+                   and (not chain_code or record["chain_code"] == chain_code)]
+        return {"transactions": by_id_window(records, params)}
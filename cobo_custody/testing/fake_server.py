@@ -0,0 +1,199 @@
+import asyncio
+import itertools
+import json
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict, deque
+from typing import Callable, Dict, Iterable, Mapping, Tuple
+from urllib.parse import parse_qsl, urlencode, urlparse
+
+from cobo_custody.client.prepared_request import canonical_query
+from cobo_custody.config import Env
+from cobo_custody.signer.local_signer import LocalSigner, generate_new_key, verify_ecdsa_signature
+from cobo_custody.testing.fake_assets import DEFAULT_COINS, FakeCoin
+from cobo_custody.testing.fake_endpoints import CustodyEndpoints, MPCEndpoints, Web3Endpoints
+from cobo_custody.testing.fake_wallet import FakeApiError, FakeWallet
+from cobo_custody.transport.api_transport import ApiTransport, AsyncApiTransport, HttpResponse
+
+FAKE_HOST = "https://fake.cobo.local"
+
+
+class FakeCoboServer(CustodyEndpoints, MPCEndpoints, Web3Endpoints):
+    """In-process stand-in for the Cobo API, for offline tests and load tests.
+
+    It implements the main custody, MPC and Web3 endpoints on top of an in
+    memory wallet state and answers like the API: every request signature
+    is checked and every response is signed with the server's own key, whose
+    public key is the ``coboPub`` of ``env``.  Point a client at it with
+    ``transport()`` (or ``async_transport()``) and ``env``::
+
+        server = FakeCoboServer()
+        client = MPCClient(signer, server.env, transport=server.transport())
+
+    Transactions stay pending until ``settle`` is called, or are settled
+    ``confirm_after`` seconds after they were created.  ``fail_next`` queues
+    error answers for a path and ``latency`` delays every answer, so retry
+    and concurrency behaviour can be exercised too.
+    """
+
+    def __init__(self, coins: Iterable[FakeCoin] = DEFAULT_COINS, api_keys: Iterable[str] = None,
+                 confirm_after: float = None, latency: float = 0.0, host: str = FAKE_HOST):
+        secret, self.cobo_pub = generate_new_key()
+        self._signer = LocalSigner(secret)
+        self.host = host
+        self.api_keys = set(api_keys) if api_keys is not None else None
+        self.confirm_after = confirm_after
+        self.latency = latency
+        self.coins: Dict[str, FakeCoin] = {coin.coin: coin for coin in coins}
+        self.calls = Counter()
+        self._lock = threading.RLock()
+        self._ids = itertools.count(1)
+        self._last_timestamp = 0
+        self._failures: Dict[str, deque] = defaultdict(deque)
+        self._routes: Dict[Tuple[str, str], Callable[[dict], object]] = {}
+        for name in dir(type(self)):
+            route = getattr(getattr(type(self), name), "endpoint", None)
+            if route is not None:
+                self._routes[route] = getattr(self, name)
+        self._init_custody()
+        self.mpc = FakeWallet("mpc", self.coins, self.clock, self.next_id)
+        self.web3 = FakeWallet("web3", self.coins, self.clock, self.next_id)
+        self.sign_messages = {}
+        self.contract_calls = {}
+
+    @property
+    def env(self) -> Env:
+        return Env(host=self.host, coboPub=self.cobo_pub)
+
+    def transport(self) -> "FakeTransport":
+        return FakeTransport(self)
+
+    def async_transport(self) -> "AsyncFakeTransport":
+        return AsyncFakeTransport(self)
+
+    def coin(self, code: str) -> FakeCoin:
+        coin = self.coins.get(code)
+        if coin is None:
+            raise FakeApiError(FakeApiError.UNSUPPORTED_COIN, f"unsupported coin {code}")
+        return coin
+
+    def clock(self) -> int:
+        """Milliseconds since the epoch, strictly increasing so records never share a timestamp."""
+        with self._lock:
+            self._last_timestamp = max(int(time.time() * 1000), self._last_timestamp + 1)
+            return self._last_timestamp
+
+    def next_id(self) -> str:
+        # shaped like a Cobo id: creation time followed by a sequence number
+        with self._lock:
+            return time.strftime("%Y%m%d%H%M%S", time.gmtime()) + str(next(self._ids)).rjust(18, "0")
+
+    # scenario helpers
+    def fail_next(self, path: str, status_code: int = 503, error_code: int = None, times: int = 1):
+        """Answer the next ``times`` requests to ``path`` with an error instead of handling them."""
+        error = FakeApiError(error_code or status_code, "failure injected by the fake server", status_code)
+        with self._lock:
+            self._failures[path].extend([error] * times)
+
+    def settle(self, request_id: str = None, success: bool = True, wallet: str = "mpc"):
+        """Settle the pending transaction of ``request_id``, or every pending one, of the
+        ``mpc``, ``web3`` or ``custody`` wallet."""
+        with self._lock:
+            if wallet == "custody":
+                records = ([self.custody_by_request_id[request_id]] if request_id else
+                           [record for record in self.custody_transactions.values() if record["status"] == "pending"])
+                for record in records:
+                    self.settle_custody(record, success)
+                return
+            fake_wallet = self.mpc if wallet == "mpc" else self.web3
+            for record in ([fake_wallet.by_request_id[request_id]] if request_id else fake_wallet.pending()):
+                fake_wallet.settle(record, success)
+
+    def _settle_due(self):
+        if self.confirm_after is None:
+            return
+        deadline = time.time() * 1000 - self.confirm_after * 1000
+        for fake_wallet in (self.mpc, self.web3):
+            for record in fake_wallet.pending():
+                if record["created_timestamp"] <= deadline:
+                    fake_wallet.settle(record)
+        for record in list(self.custody_transactions.values()):
+            if record["status"] == "pending" and record["created_time"] <= deadline:
+                self.settle_custody(record)
+
+    # request handling
+    def _check_signature(self, method: str, path: str, params: dict, headers: Mapping[str, str]):
+        api_key = headers.get("Biz-Api-Key")
+        nonce = headers.get("Biz-Api-Nonce")
+        signature = headers.get("Biz-Api-Signature")
+        if not (api_key and nonce and signature):
+            raise FakeApiError(FakeApiError.INVALID_SIGNATURE, "missing api key, nonce or signature", 401)
+        if self.api_keys is not None and api_key not in self.api_keys:
+            raise FakeApiError(FakeApiError.INVALID_SIGNATURE, "unknown api key", 401)
+        content = f"{method}|{path}|{nonce}|{canonical_query(params)}"
+        if not verify_ecdsa_signature(content, signature, api_key):
+            raise FakeApiError(FakeApiError.INVALID_SIGNATURE, "signature verification failed", 401)
+
+    def handle(self, method: str, url: str, params=None, data=None, headers: Mapping[str, str] = None) -> HttpResponse:
+        """Answer one HTTP request the way the API would."""
+        path = urlparse(url).path
+        query = params if method == "GET" else data
+        if isinstance(query, dict):
+            query = urlencode(query)
+        args = dict(parse_qsl(query or "", keep_blank_values=True))
+        try:
+            with self._lock:
+                self.calls[path] += 1
+                failures = self._failures.get(path)
+                if failures:
+                    raise failures.popleft()
+            self._check_signature(method, path, args, headers or {})
+            handler = self._routes.get((method, path))
+            if handler is None:
+                raise FakeApiError(FakeApiError.UNKNOWN_ENDPOINT, f"unknown endpoint {method} {path}", 404)
+            with self._lock:
+                self._settle_due()
+                body = self._encode({"success": True, "result": handler(args)})
+            status_code = 200
+        except FakeApiError as e:
+            body = self._encode({"success": False, "error_code": e.error_code, "error_message": e.error_message,
+                                 "error_id": uuid.uuid4().hex})
+            status_code = e.status_code
+        timestamp = str(int(time.time() * 1000))
+        signature = self._signer.sign(f"{body.decode()}|{timestamp}")
+        return HttpResponse(status_code, {"BIZ_TIMESTAMP": timestamp, "BIZ_RESP_SIGNATURE": signature}, body)
+
+    @staticmethod
+    def _encode(payload: dict) -> bytes:
+        return json.dumps(payload, ensure_ascii=False).encode()
+
+
+class FakeTransport(ApiTransport):
+    """Sends requests straight to a ``FakeCoboServer``, no sockets involved."""
+
+    def __init__(self, server: FakeCoboServer):
+        self.server = server
+
+    def request(self, method: str, url: str, params=None, data=None, headers: dict = None) -> HttpResponse:
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        return self.server.handle(method, url, params, data, headers)
+
+    def close(self):
+        pass
+
+
+class AsyncFakeTransport(AsyncApiTransport):
+    """asyncio counterpart of ``FakeTransport``."""
+
+    def __init__(self, server: FakeCoboServer):
+        self.server = server
+
+    async def request(self, method: str, url: str, params=None, data=None, headers: dict = None) -> HttpResponse:
+        if self.server.latency:
+            await asyncio.sleep(self.server.latency)
+        return self.server.handle(method, url, params, data, headers)
+
+    async def close(self):
+        pass
@@ -0,0 +1,160 @@
+import hashlib
+import itertools
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from cobo_custody.testing.fake_assets import FakeCoin, format_amount, make_address
+
+# MPC transaction status codes used by the fake, 501 and 502 are final
+STATUS_PENDING = 101
+STATUS_SUCCESS = 501
+STATUS_FAILED = 502
+
+TRANSACTION_TYPE_DEPOSIT = 1
+TRANSACTION_TYPE_WITHDRAW = 2
+
+
+class FakeApiError(Exception):
+    """An error answer of the fake server, sent as ``{"success": false, ...}``.
+
+    The error codes are the fake's own, only their shape matches the API."""
+    INVALID_PARAMETER = 1000
+    NOT_FOUND = 1001
+    DUPLICATE_REQUEST_ID = 1002
+    INSUFFICIENT_BALANCE = 1003
+    UNSUPPORTED_COIN = 1004
+    INVALID_ADDRESS = 1005
+    INVALID_SIGNATURE = 1006
+    UNKNOWN_ENDPOINT = 1007
+
+    def __init__(self, error_code: int, error_message: str, status_code: int = 400):
+        super().__init__(f"{error_code} {error_message}")
+        self.error_code = error_code
+        self.error_message = error_message
+        self.status_code = status_code
+
+
+class FakeWallet(object):
+    """Addresses, balances and transactions of one fake MPC or Web3 wallet.
+
+    Amounts are integers in the coin's base unit.  A transfer takes the
+    amount and the fee off the sender when it is created and credits the
+    receiver, when it belongs to the wallet, once it is settled; a failed
+    transfer is refunded.
+    """
+
+    def __init__(self, name: str, coins: Dict[str, FakeCoin], clock: Callable[[], int], ids: Callable[[], str]):
+        self.name = name
+        self.coins = coins
+        self._clock = clock
+        self._ids = ids
+        self._address_seq = itertools.count(1)
+        self._address_ids = itertools.count(1)
+        self.addresses: Dict[str, List[dict]] = defaultdict(list)
+        self.owners: Dict[str, dict] = {}
+        self.balances: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.transactions: Dict[str, dict] = {}
+        self.by_request_id: Dict[str, dict] = {}
+
+    def coin(self, code: str) -> FakeCoin:
+        coin = self.coins.get(code)
+        if coin is None:
+            raise FakeApiError(FakeApiError.UNSUPPORTED_COIN, f"unsupported coin {code}")
+        return coin
+
+    def style(self, chain_code: str) -> str:
+        for coin in self.coins.values():
+            if coin.chain_code == chain_code:
+                return coin.address_style
+        raise FakeApiError(FakeApiError.UNSUPPORTED_COIN, f"unsupported chain {chain_code}")
+
+    def add_address(self, chain_code: str, address: str = None) -> dict:
+        if not address:
+            address = make_address(self.style(chain_code), f"{self.name}:{chain_code}:{next(self._address_seq)}")
+        known = self.owners.get(address.lower())
+        if known is not None:
+            return known
+        record = {"id": str(next(self._address_ids)), "address": address, "chain_code": chain_code,
+                  "memo": "", "hd_path": f"m/44/60/0/0/{len(self.addresses[chain_code])}", "encoding": 0,
+                  "description": ""}
+        self.addresses[chain_code].append(record)
+        self.owners[address.lower()] = record
+        return record
+
+    def owns(self, address: Optional[str]) -> bool:
+        return bool(address) and address.lower() in self.owners
+
+    def balance(self, coin: str, address: str) -> int:
+        return self.balances.get((coin, address.lower()), 0)
+
+    def credit(self, coin: str, address: str, amount: int):
+        self.balances[(coin, address.lower())] += amount
+
+    def balance_record(self, coin: str, address: str) -> dict:
+        fake_coin = self.coin(coin)
+        amount = self.balance(coin, address)
+        return {"coin": coin, "chain_code": fake_coin.chain_code, "display_code": coin, "description": coin,
+                "decimal": fake_coin.decimal, "address": self.owners[address.lower()]["address"],
+                "balance": str(amount), "abs_balance": format_amount(amount, fake_coin.decimal),
+                "can_deposit": True, "can_withdraw": True}
+
+    def create_transaction(self, coin: str, request_id: str, from_address: str, to_address: str, amount: int,
+                           gas_price: int = None, gas_limit: int = None, auto_fuel: bool = False,
+                           remark: str = "") -> dict:
+        fake_coin = self.coin(coin)
+        if not request_id:
+            raise FakeApiError(FakeApiError.INVALID_PARAMETER, "request_id is required")
+        if request_id in self.by_request_id:
+            raise FakeApiError(FakeApiError.DUPLICATE_REQUEST_ID, f"duplicate request_id {request_id}")
+        if not self.owns(from_address):
+            raise FakeApiError(FakeApiError.INVALID_ADDRESS, f"{from_address} is not an address of the wallet")
+        if amount <= 0:
+            raise FakeApiError(FakeApiError.INVALID_PARAMETER, "amount must be positive")
+        gas_price = gas_price or fake_coin.gas_price
+        gas_limit = gas_limit or fake_coin.gas_limit
+        fee = 0 if auto_fuel else gas_price * gas_limit
+        fee_coin = fake_coin.fee_coin_code
+        needed = {coin: amount}
+        needed[fee_coin] = needed.get(fee_coin, 0) + fee
+        for code, value in needed.items():
+            if self.balance(code, from_address) < value:
+                raise FakeApiError(FakeApiError.INSUFFICIENT_BALANCE, f"insufficient {code} balance")
+        for code, value in needed.items():
+            self.credit(code, from_address, -value)
+
+        now = self._clock()
+        record = {
+            "cobo_id": self._ids(), "request_id": request_id, "chain_code": fake_coin.chain_code,
+            "coin_detail": {"coin": coin, "chain_code": fake_coin.chain_code, "display_code": coin,
+                            "description": coin, "decimal": fake_coin.decimal},
+            "amount_detail": {"amount": str(amount), "abs_amount": format_amount(amount, fake_coin.decimal)},
+            "fee_detail": {"fee_coin": fee_coin, "gas_price": gas_price, "gas_limit": gas_limit,
+                           "fee_used": str(fee)},
+            "replace_cobo_id": "", "transaction_type": TRANSACTION_TYPE_WITHDRAW, "operation": 100,
+            "status": STATUS_PENDING, "failed_reason": "", "from_address": from_address, "to_address": to_address,
+            "tx_hash": "", "nonce": 0, "max_fee": 0, "gas_price": gas_price, "gas_limit": gas_limit,
+            "confirmed_num": 0, "created_timestamp": now, "updated_timestamp": now, "remark": remark or "",
+        }
+        self.transactions[record["cobo_id"]] = record
+        self.by_request_id[request_id] = record
+        return record
+
+    def settle(self, record: dict, success: bool = True, failed_reason: str = "failed by the fake server"):
+        if record["status"] != STATUS_PENDING:
+            return
+        coin = record["coin_detail"]["coin"]
+        amount = int(record["amount_detail"]["amount"])
+        fee = int(record["fee_detail"]["fee_used"])
+        if success:
+            if self.owns(record["to_address"]):
+                self.credit(coin, record["to_address"], amount)
+            record.update(status=STATUS_SUCCESS, confirmed_num=12,
+                          tx_hash="0x" + hashlib.sha256(record["cobo_id"].encode()).hexdigest())
+        else:
+            self.credit(coin, record["from_address"], amount)
+            self.credit(record["fee_detail"]["fee_coin"], record["from_address"], fee)
+            record.update(status=STATUS_FAILED, failed_reason=failed_reason)
+        record["updated_timestamp"] = self._clock()
+
+    def pending(self) -> List[dict]:
+        return [record for record in self.transactions.values() if record["status"] == STATUS_PENDING]
@@ -0,0 +1,60 @@
+import asyncio
+from typing import Optional
+from urllib.parse import urlencode
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+from cobo_custody.transport.api_transport import AsyncApiTransport, HttpResponse
+
+
+class AioHttpTransport(AsyncApiTransport):
+    """Non-blocking keep-alive transport backed by one ``aiohttp.ClientSession``.
+
+    The session is created lazily on first use so that it is bound to the
+    running event loop.  ``limit`` caps the total number of open connections,
+    ``limit_per_host`` the connections opened to a single host.
+    """
+
+    def __init__(self, limit: int = 100, limit_per_host: int = 0, keepalive_timeout: float = 15.0,
+                 timeout: Optional[float] = None):
+        if aiohttp is None:
+            raise ImportError("AioHttpTransport requires aiohttp, install it with `pip install cobo_custody[async]`")
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = timeout
+        self._session = None
+
+    def _get_session(self) -> "aiohttp.ClientSession":
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.limit,
+                                             limit_per_host=self.limit_per_host,
+                                             keepalive_timeout=self.keepalive_timeout)
+            self._session = aiohttp.ClientSession(connector=connector,
+                                                  timeout=aiohttp.ClientTimeout(total=self.timeout))
+        return self._session
+
+    async def request(self, method: str, url: str, params=None, data=None, headers: dict = None) -> HttpResponse:
+        headers = dict(headers or {})
+        if isinstance(data, dict):
+            # encode the form body the same way requests does
+            data = urlencode(data)
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+        try:
+            async with self._get_session().request(method, url, params=params, data=data, headers=headers) as resp:
+                content = await resp.read()
+                return HttpResponse(resp.status, resp.headers, content)
+        except asyncio.TimeoutError as e:
+            # a total ClientTimeout raises asyncio.TimeoutError, which is not the builtin one before Python 3.11
+            raise TimeoutError(str(e) or "request timed out") from e
+        except aiohttp.ClientConnectionError as e:
+            # surface connection failures as the builtin exception the retry policy knows about
+            raise ConnectionError(str(e)) from e
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
@@ -0,0 +1,34 @@
+from abc import abstractmethod, ABCMeta
+from dataclasses import dataclass
+from typing import Mapping
+
+
+@dataclass
+class HttpResponse:
+    status_code: int
+    headers: Mapping[str, str]
+    content: bytes
+
+
+class ApiTransport(metaclass=ABCMeta):
+
+    @abstractmethod
+    def request(self, method: str, url: str, params=None, data=None, headers: dict = None):
+        """Send a single HTTP request and return an object exposing
+        ``status_code``, ``headers`` and ``content``."""
+        pass
+
+    @abstractmethod
+    def close(self):
+        pass
+
+
+class AsyncApiTransport(metaclass=ABCMeta):
+
+    @abstractmethod
+    async def request(self, method: str, url: str, params=None, data=None, headers: dict = None) -> HttpResponse:
+        pass
+
+    @abstractmethod
+    async def close(self):
+        pass
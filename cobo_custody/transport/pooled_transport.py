@@ -0,0 +1,118 @@
+import threading
+from dataclasses import dataclass
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from cobo_custody.transport.api_transport import ApiTransport
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    requests: int
+    hits: int
+    new_connections: int
+    waits: int
+
+
+class _PoolCounter(object):
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._checkouts = 0
+        self._new_connections = 0
+        self._waits = 0
+
+    def checkout(self, waited: bool, connected: bool):
+        with self._lock:
+            self._checkouts += 1
+            if waited:
+                self._waits += 1
+            if not connected:
+                self._new_connections += 1
+
+    def snapshot(self) -> PoolStats:
+        with self._lock:
+            return PoolStats(requests=self._checkouts,
+                             hits=self._checkouts - self._new_connections,
+                             new_connections=self._new_connections,
+                             waits=self._waits)
+
+
+def _counted_pool_class(pool_class, counter: _PoolCounter):
+    class CountedPool(pool_class):
+
+        def _get_conn(self, timeout=None):
+            # every slot is checked out, so a blocking pool has to wait for a release
+            waited = self.block and self.pool is not None and self.pool.empty()
+            conn = super()._get_conn(timeout=timeout)
+            # fresh connections and ones reset after the peer closed them have no socket yet
+            counter.checkout(waited, getattr(conn, "sock", None) is not None)
+            return conn
+
+    CountedPool.__name__ = pool_class.__name__
+    return CountedPool
+
+
+class _CountedAdapter(HTTPAdapter):
+
+    def __init__(self, counter: _PoolCounter, **kwargs):
+        self._counter = counter
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _counted_pool_class(HTTPConnectionPool, self._counter),
+            "https": _counted_pool_class(HTTPSConnectionPool, self._counter),
+        }
+
+
+class PooledTransport(ApiTransport):
+    """Keep-alive transport backed by a single ``requests.Session``.
+
+    ``pool_connections`` is the number of hosts whose pools are kept alive,
+    ``pool_maxsize`` the number of connections kept per host.  With
+    ``pool_block`` enabled ``pool_maxsize`` is a hard per-host limit and
+    callers wait for a free connection instead of opening a new one.
+    """
+
+    def __init__(self, pool_connections: int = 4, pool_maxsize: int = 32, pool_block: bool = False,
+                 keep_alive: bool = True, timeout: Optional[float] = None):
+        self.timeout = timeout
+        self._counter = _PoolCounter()
+        self.session = requests.Session()
+        adapter = _CountedAdapter(self._counter,
+                                  pool_connections=pool_connections,
+                                  pool_maxsize=pool_maxsize,
+                                  pool_block=pool_block)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        if not keep_alive:
+            self.session.headers["Connection"] = "close"
+
+    def request(self, method: str, url: str, params=None, data=None, headers: dict = None) -> requests.Response:
+        return self.session.request(method, url, params=params, data=data, headers=headers, timeout=self.timeout)
+
+    def stats(self) -> PoolStats:
+        return self._counter.snapshot()
+
+    def close(self):
+        self.session.close()
+
+
+_default_transport = None
+_default_transport_lock = threading.Lock()
+
+
+def get_default_transport() -> PooledTransport:
+    """Return the process wide transport shared by every client that is
+    created without an explicit ``transport``."""
+    global _default_transport
+    if _default_transport is None:
+        with _default_transport_lock:
+            if _default_transport is None:
+                _default_transport = PooledTransport()
+    return _default_transport
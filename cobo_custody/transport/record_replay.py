@@ -0,0 +1,137 @@
+import json
+import threading
+from collections import defaultdict, deque
+from typing import Dict, Iterable, Tuple
+from urllib.parse import parse_qsl, urlencode, urlparse
+
+from cobo_custody.transport.api_transport import ApiTransport, AsyncApiTransport, HttpResponse
+
+# response headers kept in a cassette, enough to verify the recorded signature
+RECORDED_HEADERS = ("BIZ_TIMESTAMP", "BIZ_RESP_SIGNATURE", "Content-Type")
+
+CassetteKey = Tuple[str, str, str]
+
+
+class CassetteMiss(Exception):
+    """Raised by a replay transport for a request the cassette has no answer for."""
+
+
+def request_key(method: str, url: str, params=None, data=None, ignore_params: Iterable[str] = ()) -> CassetteKey:
+    """``(method, path, sorted query)`` of a request, minus the ``ignore_params``."""
+    query = params if method == "GET" else data
+    if isinstance(query, dict):
+        query = urlencode(query)
+    ignored = set(ignore_params)
+    items = sorted(item for item in parse_qsl(query or "", keep_blank_values=True) if item[0] not in ignored)
+    return method, urlparse(url).path, urlencode(items)
+
+
+class CassetteWriter(object):
+    """Appends request/response exchanges to a JSON lines cassette.
+
+    Responses are stored as the raw body together with the Cobo signature
+    headers, so a replay is verified against the same ``coboPub`` as the
+    recording.  Request signature headers are not stored.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8")
+
+    def record(self, method: str, url: str, params, data, response):
+        _, path, query = request_key(method, url, params, data)
+        headers = response.headers
+        entry = {"method": method, "path": path, "query": query, "status_code": response.status_code,
+                 "headers": {name: headers[name] for name in RECORDED_HEADERS if name in headers},
+                 "body": response.content.decode("utf-8")}
+        with self._lock:
+            self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class RecordingTransport(ApiTransport):
+    """Passes requests on to ``transport`` and records every exchange to the cassette at ``path``."""
+
+    def __init__(self, transport: ApiTransport, path: str):
+        self.transport = transport
+        self.cassette = CassetteWriter(path)
+
+    def request(self, method: str, url: str, params=None, data=None, headers: dict = None):
+        response = self.transport.request(method, url, params=params, data=data, headers=headers)
+        self.cassette.record(method, url, params, data, response)
+        return response
+
+    def close(self):
+        self.cassette.close()
+        self.transport.close()
+
+
+class AsyncRecordingTransport(AsyncApiTransport):
+    """asyncio counterpart of ``RecordingTransport``."""
+
+    def __init__(self, transport: AsyncApiTransport, path: str):
+        self.transport = transport
+        self.cassette = CassetteWriter(path)
+
+    async def request(self, method: str, url: str, params=None, data=None, headers: dict = None) -> HttpResponse:
+        response = await self.transport.request(method, url, params=params, data=data, headers=headers)
+        self.cassette.record(method, url, params, data, response)
+        return response
+
+    async def close(self):
+        self.cassette.close()
+        await self.transport.close()
+
+
+class ReplayTransport(ApiTransport):
+    """Answers requests from a cassette written by ``RecordingTransport``,
+    without any network access.
+
+    Requests are matched on method, path and params; params listed in
+    ``ignore_params`` (e.g. a time based ``request_id``) are left out of the
+    match.  Repeated identical requests get the recorded answers in order
+    and the last one again once they run out, so recorded polling loops
+    replay faithfully.  An unknown request raises ``CassetteMiss``.
+    """
+
+    def __init__(self, path: str, ignore_params: Iterable[str] = ()):
+        self.ignore_params = tuple(ignore_params)
+        self._lock = threading.Lock()
+        self._answers: Dict[CassetteKey, deque] = defaultdict(deque)
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    key = request_key(entry["method"], entry["path"], entry["query"], entry["query"],
+                                      self.ignore_params)
+                    self._answers[key].append(HttpResponse(entry["status_code"], entry["headers"],
+                                                           entry["body"].encode("utf-8")))
+
+    def request(self, method: str, url: str, params=None, data=None, headers: dict = None) -> HttpResponse:
+        key = request_key(method, url, params, data, self.ignore_params)
+        with self._lock:
+            answers = self._answers.get(key)
+            if not answers:
+                raise CassetteMiss(f"no recorded answer for {key[0]} {key[1]}?{key[2]}")
+            return answers.popleft() if len(answers) > 1 else answers[0]
+
+    def close(self):
+        pass
+
+
+class AsyncReplayTransport(AsyncApiTransport):
+    """asyncio counterpart of ``ReplayTransport``."""
+
+    def __init__(self, path: str, ignore_params: Iterable[str] = ()):
+        self._replay = ReplayTransport(path, ignore_params)
+
+    async def request(self, method: str, url: str, params=None, data=None, headers: dict = None) -> HttpResponse:
+        return self._replay.request(method, url, params=params, data=data, headers=headers)
+
+    async def close(self):
+        pass
@@ -10,8 +10,10 @@ setup(
     license="Cobo Copyright Reserved",
     python_requires=">=3.7",
     url="https://github.com/CoboGlobal/cobo-python-api",
-    packages=['cobo_custody', 'cobo_custody.model','cobo_custody.signer', 'cobo_custody.client', 'cobo_custody.error', 'cobo_custody.config'],
+    packages=['cobo_custody', 'cobo_custody.model','cobo_custody.signer', 'cobo_custody.client', 'cobo_custody.error', 'cobo_custody.config',
+              'cobo_custody.transport', 'cobo_custody.metrics', 'cobo_custody.service', 'cobo_custody.testing'],
     include_package_data=True,
-    install_requires=["ecdsa==0.17.0", "requests"]
+    install_requires=["ecdsa==0.17.0", "requests"],
+    extras_require={"async": ["aiohttp"], "crypto": ["coincurve"], "json": ["orjson"]},
     # zip_safe=False,
 )
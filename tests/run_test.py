@@ -5,25 +5,58 @@ import argparse
 from cobo_custody.config import DEV_ENV
 from testcase.test_client import ClientTest
 from testcase.test_mpc_client import MPCClientTest
+from testcase.test_pooled_transport import PooledTransportTest
+from testcase.test_crypto_backend import CryptoBackendTest
+from testcase.test_local_verifier import LocalVerifierTest
+from testcase.test_paginator import PaginatorTest
+from testcase.test_batch_executor import BatchExecutorTest
+from testcase.test_rate_limiter import RateLimiterTest
+from testcase.test_retry import RetryPolicyTest
+from testcase.test_metrics import MetricsTest
+from testcase.test_response_cache import ResponseCacheTest
+from testcase.test_single_flight import SingleFlightTest
+from testcase.test_request_batcher import RequestBatcherTest
+from testcase.test_response_decoding import ResponseDecodingTest
+from testcase.test_records import RecordsTest
+from testcase.test_transaction_sync import TransactionSyncTest
+from testcase.test_address_index import AddressIndexTest
+from testcase.test_prepared_request import PreparedRequestTest
+from testcase.test_fake_server import FakeServerTest
+from testcase.test_fund_sweep import FundSweepTest
+from testcase.test_fee_estimator import FeeEstimatorTest
+from testcase.test_fee_top_up import FeeTopUpOrchestratorTest
+from testcase.test_transaction_watcher import TransactionWatcherTest
+from testcase.test_address_pool import AddressPoolTest
+from testcase.test_aiohttp_transport import AioHttpTransportTest
 
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser()
-    parser.add_argument("--api_secret", type=str, required=True)
-    parser.add_argument("--mpc_api_secret", type=str, required=True)
+    # without secrets the client tests run offline against the fake server
+    parser.add_argument("--api_secret", type=str)
+    parser.add_argument("--mpc_api_secret", type=str)
 
     args = parser.parse_args()
 
-    ClientTest.api_secret = args.api_secret
-    ClientTest.env = DEV_ENV
+    if args.api_secret:
+        ClientTest.api_secret = args.api_secret
+        ClientTest.env = DEV_ENV
 
-    MPCClientTest.mpc_api_secret = args.mpc_api_secret
-    MPCClientTest.env = DEV_ENV
+    if args.mpc_api_secret:
+        MPCClientTest.mpc_api_secret = args.mpc_api_secret
+        MPCClientTest.env = DEV_ENV
 
     loader = unittest.TestLoader()
     suite = unittest.TestSuite()
 
-    for testcase in (ClientTest, MPCClientTest):
+    for testcase in (ClientTest, MPCClientTest, PooledTransportTest, CryptoBackendTest, LocalVerifierTest,
+                     PaginatorTest,
+                     BatchExecutorTest, RateLimiterTest, RetryPolicyTest,
+                     MetricsTest, ResponseCacheTest, SingleFlightTest, RequestBatcherTest,
+                     ResponseDecodingTest, RecordsTest, TransactionSyncTest,
+                     AddressIndexTest, PreparedRequestTest, FakeServerTest, FundSweepTest,
+                     FeeEstimatorTest, FeeTopUpOrchestratorTest, TransactionWatcherTest, AddressPoolTest,
+                     AioHttpTransportTest):
         suite.addTests(loader.loadTestsFromTestCase(testcase))
     runner = unittest.TextTestRunner(verbosity=3)
     runner.run(suite)
@@ -0,0 +1,135 @@
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+from urllib.parse import parse_qs, urlparse
+
+from cobo_custody.client.api_response import ApiResponse
+from cobo_custody.client.client import Client
+from cobo_custody.client.mpc_client import MPCClient
+from cobo_custody.client.web3_client import Web3Client
+from cobo_custody.config import Env
+from cobo_custody.service.address_index import CUSTODY, MPC, WEB3, AddressIndex
+from cobo_custody.signer.local_signer import LocalSigner, generate_new_key
+from cobo_custody.transport.api_transport import ApiTransport, HttpResponse
+
+
+class AddressTransport(ApiTransport):
+    """Serves the address endpoints from ``mpc_addresses`` and ``web3_addresses``."""
+
+    def __init__(self):
+        self.mpc_addresses = []
+        self.web3_addresses = []
+        self.paths = []
+
+    def request(self, method: str, url: str, params=None, data=None, headers: dict = None) -> HttpResponse:
+        path = urlparse(url).path
+        query = {key: values[0] for key, values in parse_qs(params).items()}
+        self.paths.append(path)
+        if path == "/v1/custody/mpc/list_addresses/":
+            start = int(query.get("start_id", -1))
+            records = [{"id": index, "address": address} for index, address in enumerate(self.mpc_addresses)
+                       if index > start][:int(query["limit"])]
+            result = {"addresses": records}
+        elif path == "/v1/custody/web3_list_wallet_address/":
+            index, length = int(query["page_index"]), int(query["page_length"])
+            records = [{"address": address} for address in self.web3_addresses[index * length:(index + 1) * length]]
+            result = {"addresses": records, "total": len(self.web3_addresses)}
+        elif path == "/v1/custody/address_info/":
+            result = {"coin": query["coin"], "address": query["address"]} if query["address"] == "0xnew" else None
+            if result is None:
+                payload = {"success": False, "error_code": 12015, "error_message": "", "error_id": ""}
+                return HttpResponse(200, {}, json.dumps(payload).encode())
+        elif path == "/v1/custody/internal_address_info/":
+            result = {"is_internal_address": query["address"] == "0xother"}
+        else:
+            result = query["address"].startswith("0x")
+        return HttpResponse(200, {}, json.dumps({"success": True, "result": result}).encode())
+
+    def close(self):
+        pass
+
+
+class AddressIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.transport = AddressTransport()
+        args = (LocalSigner(generate_new_key()[0]), Env(host="http://127.0.0.1", coboPub=""))
+        self.client = Client(*args, transport=self.transport)
+        self.mpc_client = MPCClient(*args, transport=self.transport)
+        self.web3_client = Web3Client(*args, transport=self.transport)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "addresses.db")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def index(self) -> AddressIndex:
+        return AddressIndex(self.path, self.client, self.mpc_client, self.web3_client)
+
+    def test_incremental_refresh_survives_restart(self):
+        self.transport.mpc_addresses = [f"0xm{index}" for index in range(5)]
+        self.transport.web3_addresses = [f"0xw{index}" for index in range(3)]
+        index = self.index()
+        self.assertEqual(index.refresh_mpc("ETH", limit=2), 5)
+        self.assertEqual(index.refresh_web3("ETH", page_length=2), 3)
+        index.close()
+
+        self.transport.mpc_addresses.append("0xm5")
+        self.transport.web3_addresses.append("0xw3")
+        self.transport.paths.clear()
+        index = self.index()
+        self.assertEqual(index.refresh_mpc("ETH", limit=2), 1)
+        self.assertEqual(index.refresh_web3("ETH", page_length=2), 1)
+        # only the tail is read again: the new MPC page, the empty one ending it and the last Web3 page
+        self.assertEqual(len(self.transport.paths), 3)
+        self.assertEqual(index.count(network="ETH"), 10)
+        self.assertEqual((index.count(MPC, "ETH"), index.count(WEB3, "ETH"), index.count(CUSTODY)), (6, 4, 0))
+
+    def test_local_answers_and_fallback(self):
+        self.transport.mpc_addresses = ["0xmpc"]
+        index = self.index()
+        index.refresh_mpc("ETH")
+        index.add_new_addresses("XRP", ApiResponse(True, {"coin": "XRP", "addresses": ["r1|100", "r2|200"]}, None))
+        index.add_new_addresses("ETH", ApiResponse(True, {"coin": "ETH", "address": "0xdeposit"}, None))
+
+        self.transport.paths.clear()
+        self.assertTrue(index.verify_deposit_address("ETH", "0xdeposit"))
+        self.assertTrue(index.verify_deposit_address("XRP", "r2", memo="200"))
+        self.assertTrue(index.is_loop_address("XRP", "r1", memo="100"))
+        self.assertTrue(index.is_valid_address("ETH", "0xmpc"))
+        self.assertEqual(self.transport.paths, [])
+
+        # an MPC address of chain ETH is not a custody deposit address of coin ETH
+        self.assertFalse(index.verify_deposit_address("ETH", "0xmpc"))
+        self.transport.paths.clear()
+
+        self.assertFalse(index.verify_deposit_address("ETH", "0xunknown"))
+        self.assertTrue(index.verify_deposit_address("ETH", "0xnew"))
+        self.assertTrue(index.contains(CUSTODY, "ETH", "0xnew"))
+        self.assertTrue(index.is_loop_address("ETH", "0xother"))
+        self.assertFalse(index.is_loop_address("ETH", "0xforeign"))
+        self.assertFalse(index.is_valid_address("ETH", "bad"))
+        self.assertEqual(len(self.transport.paths), 5)
+
+    def test_shared_database_and_missing_clients(self):
+        with sqlite3.connect(self.path) as conn:
+            conn.execute("CREATE TABLE address (id INTEGER PRIMARY KEY, street TEXT)")
+            conn.execute("INSERT INTO address (street) VALUES ('main street')")
+        conn.close()
+        index = AddressIndex(self.path)
+        self.addCleanup(index.close)
+        index.add(MPC, "ETH", ["0xmpc"])
+        self.assertTrue(index.is_valid_address("ETH", "0xmpc"))
+        with self.assertRaises(ValueError):
+            index.is_valid_address("ETH", "0xother")
+        with self.assertRaises(ValueError):
+            index.verify_deposit_address("ETH", "0xother")
+        with sqlite3.connect(self.path) as conn:
+            self.assertEqual(conn.execute("SELECT street FROM address").fetchall(), [("main street",)])
+        conn.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
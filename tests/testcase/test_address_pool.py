@@ -0,0 +1,108 @@
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from cobo_custody.client.api_response import ApiResponse
+from cobo_custody.client.client import Client
+from cobo_custody.client.mpc_client import MPCClient
+from cobo_custody.client.web3_client import Web3Client
+from cobo_custody.error.api_error import ApiException
+from cobo_custody.service.address_index import AddressIndex
+from cobo_custody.service.address_pool import CUSTODY, AddressPool
+from cobo_custody.signer.local_signer import LocalSigner, generate_new_key
+from cobo_custody.testing.fake_server import FakeCoboServer
+
+CUSTODY_PATH = "/v1/custody/new_addresses/"
+MPC_PATH = "/v1/custody/mpc/generate_addresses/"
+WEB3_PATH = "/v1/custody/web3_add_addresses/"
+
+
+class AddressPoolTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = FakeCoboServer()
+        signer = LocalSigner(generate_new_key()[0])
+        self.client = Client(signer, self.server.env, transport=self.server.transport())
+        self.mpc_client = MPCClient(signer, self.server.env, transport=self.server.transport())
+        self.web3_client = Web3Client(signer, self.server.env, transport=self.server.transport())
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "pool.db")
+
+    def pool(self, **kwargs) -> AddressPool:
+        pool = AddressPool(self.path, self.client, self.mpc_client, self.web3_client, **kwargs)
+        self.addCleanup(pool.close)
+        return pool
+
+    def test_take_refills_in_background(self):
+        pool = self.pool(low_water=5, batch_size=10)
+        addresses = [pool.take_custody("BTC") for _ in range(6)]
+        self.assertEqual(len(set(addresses)), 6)
+        self.assertTrue(all(self.server.owns_custody_address("BTC", address) for address in addresses))
+        pool.close()
+        # the empty pool filled 10, dropping below 5 triggered one more batch
+        self.assertEqual(self.server.calls[CUSTODY_PATH], 2)
+        self.assertEqual(pool.size(CUSTODY, "BTC"), 14)
+
+    def test_state_survives_restart(self):
+        pool = self.pool(low_water=0, batch_size=10)
+        first = pool.take_mpc("GETH")
+        pool.close()
+
+        restarted = self.pool(low_water=0, batch_size=10)
+        self.assertEqual(restarted.size("mpc", "GETH"), 9)
+        rest = [restarted.take_mpc("GETH") for _ in range(9)]
+        self.assertNotIn(first, rest)
+        self.assertEqual(len(set(rest)), 9)
+        self.assertEqual(self.server.calls[MPC_PATH], 1)
+
+    def test_prefill_and_index(self):
+        index = AddressIndex()
+        self.addCleanup(index.close)
+        pool = self.pool(low_water=5, batch_size=10, address_index=index)
+        self.assertEqual(pool.prefill("web3", "GETH"), 20)
+        self.assertEqual(self.server.calls[WEB3_PATH], 2)
+        address = pool.take_web3("GETH")
+        self.assertTrue(index.contains("web3", "GETH", address))
+
+    def test_concurrent_takes_are_unique(self):
+        pool = self.pool(low_water=20, batch_size=50)
+        taken = []
+        lock = threading.Lock()
+
+        def take():
+            for _ in range(25):
+                address = pool.take_custody("BTC")
+                with lock:
+                    taken.append(address)
+
+        threads = [threading.Thread(target=take) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(set(taken)), 200)
+
+    def test_errors(self):
+        pool = self.pool(low_water=0, batch_size=10)
+        self.server.fail_next(CUSTODY_PATH, status_code=400, error_code=1000)
+        with self.assertRaises(ApiException):
+            pool.take_custody("BTC")
+        self.assertTrue(pool.take_custody("BTC"))
+        with self.assertRaises(ValueError):
+            pool.take("vault", "BTC")
+
+    def test_empty_batch(self):
+        pool = self.pool(low_water=0, batch_size=10)
+        empty = ApiResponse(True, {"addresses": ""}, None)
+        with mock.patch.object(self.client, "batch_new_deposit_address", return_value=empty):
+            with self.assertRaises(RuntimeError):
+                pool.take_custody("BTC")
+            with self.assertRaises(RuntimeError):
+                pool.prefill(CUSTODY, "BTC")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import asyncio
+import socket
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+from cobo_custody.client.async_client import AsyncMPCClient
+from cobo_custody.client.retry import RetryPolicy
+from cobo_custody.config import Env
+from cobo_custody.signer.local_signer import LocalSigner, generate_new_key
+from cobo_custody.testing.fake_server import FakeCoboServer
+
+try:
+    from cobo_custody.transport.aiohttp_transport import AioHttpTransport
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+GETH_ADDRESS = "0x00000000000000000000000000000000000000bb"
+TO_ADDRESS = "0x00000000000000000000000000000000000000aa"
+
+
+class _FakeServerHandler(BaseHTTPRequestHandler):
+    """Serves a ``FakeCoboServer`` over HTTP, sleeping ``delay`` seconds before answering."""
+    protocol_version = "HTTP/1.1"
+    fake = None
+    delay = 0
+    received = 0
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        self.answer("GET", url.path, url.query, None)
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0))).decode()
+        self.answer("POST", self.path, None, body)
+
+    def answer(self, method: str, path: str, params, data):
+        type(self).received += 1
+        if self.delay:
+            time.sleep(self.delay)
+        headers = {key: value for key, value in self.headers.items()}
+        response = self.fake.handle(method, path, params, data, headers)
+        try:
+            self.send_response(response.status_code)
+            for key, value in response.headers.items():
+                self.send_header(key, value)
+            self.send_header("Content-Length", str(len(response.content)))
+            self.end_headers()
+            self.wfile.write(response.content)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the client timed out
+
+    def log_message(self, format, *args):
+        pass
+
+
+@unittest.skipIf(aiohttp is None, "aiohttp is not installed")
+class AioHttpTransportTest(unittest.TestCase):
+
+    def setUp(self):
+        self.fake = FakeCoboServer()
+        self.fake.mpc.add_address("GETH", GETH_ADDRESS)
+        self.fake.mpc.credit("GETH", GETH_ADDRESS, 10 ** 18)
+        handler = type("Handler", (_FakeServerHandler,), {"fake": self.fake})
+        self.handler = handler
+        self.http = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self.http.daemon_threads = True
+        threading.Thread(target=self.http.serve_forever, daemon=True).start()
+        self.addCleanup(self.http.server_close)
+        self.addCleanup(self.http.shutdown)
+        self.env = Env(host="http://127.0.0.1:%d" % self.http.server_address[1], coboPub=self.fake.env.coboPub)
+        self.signer = LocalSigner(generate_new_key()[0])
+
+    def run_client(self, coroutine_fn, **kwargs):
+        async def run():
+            async with AsyncMPCClient(self.signer, self.env, **kwargs) as client:
+                return await coroutine_fn(client)
+
+        return asyncio.run(run())
+
+    def test_get_and_post(self):
+        async def calls(client):
+            balances = await asyncio.gather(*(client.get_balance(GETH_ADDRESS, coin="GETH") for _ in range(5)))
+            created = await client.create_transaction("GETH", "aiohttp-1", 100, from_addr=GETH_ADDRESS,
+                                                      to_addr=TO_ADDRESS)
+            return balances, created
+
+        balances, created = self.run_client(calls)
+        self.assertTrue(all(response.success for response in balances))
+        self.assertTrue(created.success, created)
+        self.assertIn("aiohttp-1", self.fake.mpc.by_request_id)
+
+    def test_total_timeout_is_retried(self):
+        self.handler.delay = 0.2
+        with self.assertRaises(TimeoutError):
+            self.run_client(lambda client: client.get_supported_chains(),
+                            transport=AioHttpTransport(timeout=0.05),
+                            retry_policy=RetryPolicy(max_attempts=2, backoff_base=0.001))
+        self.assertEqual(self.handler.received, 2)
+
+    def test_connection_errors(self):
+        with socket.socket() as unused:
+            unused.bind(("127.0.0.1", 0))
+            port = unused.getsockname()[1]
+        self.env = Env(host="http://127.0.0.1:%d" % port, coboPub=self.fake.env.coboPub)
+        with self.assertRaises(ConnectionError):
+            self.run_client(lambda client: client.get_supported_chains())
@@ -0,0 +1,50 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from cobo_custody.client.api_response import ApiResponse
+from cobo_custody.client.batch_executor import AsyncBatchExecutor, BatchExecutor
+
+
+class BatchExecutorTest(unittest.TestCase):
+
+    def test_execute_in_order(self):
+        lock = threading.Lock()
+        running = [0, 0]
+
+        def get_balance(address: str) -> ApiResponse:
+            with lock:
+                running[0] += 1
+                running[1] = max(running)
+            time.sleep(0.01)
+            with lock:
+                running[0] -= 1
+            if address == "bad":
+                raise ConnectionError(address)
+            return ApiResponse(True, {"address": address}, None)
+
+        addresses = ["a%d" % i for i in range(20)] + ["bad", "z"]
+        with BatchExecutor(max_workers=4) as executor:
+            results = executor.map(get_balance, [{"address": address} for address in addresses])
+        self.assertEqual([r.result["address"] for r in results[:20]], addresses[:20])
+        self.assertIsInstance(results[20], ConnectionError)
+        self.assertEqual(results[21].result["address"], "z")
+        self.assertLessEqual(running[1], 4)
+
+    def test_execute_async(self):
+        async def get_balance(address: str) -> ApiResponse:
+            await asyncio.sleep(0.001)
+            if address == "bad":
+                raise ConnectionError(address)
+            return ApiResponse(True, {"address": address}, None)
+
+        results = asyncio.run(AsyncBatchExecutor(concurrency=3).map(
+            get_balance, [{"address": "a"}, {"address": "bad"}, {"address": "b"}]))
+        self.assertEqual(results[0].result["address"], "a")
+        self.assertIsInstance(results[1], ConnectionError)
+        self.assertEqual(results[2].result["address"], "b")
+
+
+if __name__ == '__main__':
+    unittest.main()
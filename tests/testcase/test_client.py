@@ -2,7 +2,8 @@ import unittest
 import time
 from cobo_custody.client import Client
 from cobo_custody.model.enums import SortFlagEnum
-from cobo_custody.signer.local_signer import LocalSigner
+from cobo_custody.signer.local_signer import LocalSigner, generate_new_key
+from cobo_custody.testing.fake_server import FakeCoboServer
 
 from parameterized import param, parameterized
 from hashlib import sha256
@@ -11,12 +12,34 @@ from hashlib import sha256
 class ClientTest(unittest.TestCase):
     api_secret = ""
     env = None
+    transport = None
 
     @classmethod
     def setUpClass(cls):
+        if cls.env is None:
+            cls.use_fake_server()
         cls.client = Client(signer=LocalSigner(cls.api_secret),
                             env=cls.env,
-                            debug=False)
+                            debug=False,
+                            transport=cls.transport)
+
+    @classmethod
+    def use_fake_server(cls):
+        # without an env the tests run offline against a fake server seeded with the data they expect
+        server = FakeCoboServer()
+        server.add_custody_address("BTC", "38kcymiNQXk8WTWX9tPLRZP9wxvXPXcsFy")
+        server.add_custody_address("BTC", "3ApTsekq5XpUtM5CzAKqntHkvoSpYdCDHw")
+        server.custody_deposit("COBO_ETH", 10 ** 18, address="0xefeff29688deaa32c20cdb4fc54d8285a31ada4e",
+                               txid="0x36cec6c56310172325d0c4ac342447b3b93aa248289fea2e2a6740857a6a59a0",
+                               record_id="20231206130534000116223000007648")
+        server.custody_deposit("XLM", 10 ** 8)
+        server.custody_deposit("TETH", 10 ** 18)
+        server.custody_withdraw("COBO_ETH", 1, "0xE410157345be56688F43FF0D9e4B2B38Ea8F7828",
+                                request_id="IntegrationTest-848427217479639409")
+        server.stakings["1"] = 10 ** 18
+        cls.api_secret = generate_new_key()[0]
+        cls.env = server.env
+        cls.transport = server.transport()
 
     # account and address
     def test_get_account_info(self):
@@ -0,0 +1,53 @@
+import hashlib
+import itertools
+import unittest
+
+import ecdsa
+from ecdsa.util import sigdecode_der, sigencode_der
+
+from cobo_custody.signer.crypto_backend import available_backends, get_backend
+from cobo_custody.signer.local_signer import LocalSigner, LocalVerifier, generate_new_key
+
+
+class CryptoBackendTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.backends = [get_backend(name) for name in available_backends()]
+        cls.api_secret, cls.api_key = generate_new_key()
+
+    def test_ecdsa_always_available(self):
+        self.assertEqual(available_backends()[-1], "ecdsa")
+
+    def test_public_key(self):
+        for backend in self.backends:
+            signer = LocalSigner(self.api_secret, backend=backend)
+            self.assertEqual(signer.get_public_key(), self.api_key, backend.name)
+
+    def test_cross_verify(self):
+        message = "GET|/v1/custody/org_info/|1700000000000000|coin=BTC&amount=1"
+        for sign_backend, verify_backend in itertools.product(self.backends, repeat=2):
+            signature = LocalSigner(self.api_secret, backend=sign_backend).sign(message)
+            verifier = LocalVerifier(self.api_key, backend=verify_backend)
+            self.assertTrue(verifier.verify(message, signature), (sign_backend.name, verify_backend.name))
+            self.assertFalse(verifier.verify(message + "x", signature), (sign_backend.name, verify_backend.name))
+
+    def test_der_encoding(self):
+        order = ecdsa.SECP256k1.order
+        for backend in self.backends:
+            signature = bytes.fromhex(LocalSigner(self.api_secret, backend=backend).sign("content"))
+            r, s = sigdecode_der(signature, order)
+            self.assertEqual(sigencode_der(r, s, order), signature, backend.name)
+
+    def test_verify_high_s(self):
+        order = ecdsa.SECP256k1.order
+        data = hashlib.sha256(b"content").digest()
+        key = ecdsa.SigningKey.from_string(bytes.fromhex(self.api_secret), curve=ecdsa.SECP256k1)
+        r, s = sigdecode_der(key.sign(data, hashfunc=hashlib.sha256, sigencode=sigencode_der), order)
+        high_s = sigencode_der(r, max(s, order - s), order).hex()
+        for backend in self.backends:
+            self.assertTrue(LocalVerifier(self.api_key, backend=backend).verify("content", high_s), backend.name)
+
+
+if __name__ == '__main__':
+    unittest.main()
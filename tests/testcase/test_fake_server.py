@@ -0,0 +1,114 @@
+import asyncio
+import os
+import tempfile
+import unittest
+
+from cobo_custody.client import Client
+from cobo_custody.client.async_client import AsyncMPCClient
+from cobo_custody.client.mpc_client import MPCClient
+from cobo_custody.client.retry import RetryPolicy
+from cobo_custody.signer.local_signer import LocalSigner, generate_new_key
+from cobo_custody.testing.fake_server import FakeCoboServer
+from cobo_custody.testing.fake_wallet import STATUS_FAILED, STATUS_PENDING, STATUS_SUCCESS, FakeApiError
+from cobo_custody.transport.record_replay import CassetteMiss, RecordingTransport, ReplayTransport
+
+GETH_ADDRESS = "0x6a060efe0ff887f4e24dc2d2098020abf28bcce4"
+TO_ADDRESS = "0xEEACb7a5e53600c144C0b9839A834bb4b39E540c"
+
+
+class FakeServerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = FakeCoboServer()
+        self.server.mpc.add_address("GETH", GETH_ADDRESS)
+        self.server.mpc.credit("GETH", GETH_ADDRESS, 10 ** 18)
+        self.signer = LocalSigner(generate_new_key()[0])
+        self.client = MPCClient(self.signer, self.server.env, transport=self.server.transport())
+
+    def balance(self, address: str = GETH_ADDRESS) -> int:
+        return int(self.client.get_balance(address, coin="GETH").result["coin_data"][0]["balance"])
+
+    def test_responses_are_signed(self):
+        response = Client(self.signer, self.server.env, transport=self.server.transport()).get_account_info()
+        self.assertTrue(response.success)
+        other = FakeCoboServer()
+        with self.assertRaises(Exception):
+            Client(self.signer, other.env, transport=self.server.transport()).get_account_info()
+
+    def test_request_signature_checked(self):
+        server = FakeCoboServer(api_keys=[generate_new_key()[1]])
+        response = MPCClient(self.signer, server.env, transport=server.transport()).get_supported_chains()
+        self.assertFalse(response.success)
+        self.assertEqual(response.exception.errorCode, FakeApiError.INVALID_SIGNATURE)
+
+    def test_transfer_and_settle(self):
+        response = self.client.create_transaction("GETH", "transfer-1", 100, from_addr=GETH_ADDRESS,
+                                                  to_addr=TO_ADDRESS)
+        self.assertTrue(response.success)
+        fee = self.server.coin("GETH").fee
+        self.assertEqual(self.balance(), 10 ** 18 - 100 - fee)
+        duplicate = self.client.create_transaction("GETH", "transfer-1", 100, from_addr=GETH_ADDRESS,
+                                                   to_addr=TO_ADDRESS)
+        self.assertEqual(duplicate.exception.errorCode, FakeApiError.DUPLICATE_REQUEST_ID)
+
+        transaction, = self.client.transactions_by_request_ids("transfer-1").result["transactions"]
+        self.assertEqual(transaction["status"], STATUS_PENDING)
+        self.server.settle("transfer-1")
+        transaction, = self.client.transactions_by_request_ids("transfer-1").result["transactions"]
+        self.assertEqual(transaction["status"], STATUS_SUCCESS)
+        self.assertTrue(transaction["tx_hash"])
+
+    def test_failed_transfer_is_refunded(self):
+        self.client.create_transaction("GETH", "transfer-2", 100, from_addr=GETH_ADDRESS, to_addr=TO_ADDRESS)
+        self.server.settle("transfer-2", success=False)
+        transaction, = self.client.transactions_by_request_ids("transfer-2").result["transactions"]
+        self.assertEqual(transaction["status"], STATUS_FAILED)
+        self.assertEqual(self.balance(), 10 ** 18)
+
+    def test_insufficient_balance(self):
+        response = self.client.create_transaction("GETH", "transfer-3", 10 ** 19, from_addr=GETH_ADDRESS,
+                                                  to_addr=TO_ADDRESS)
+        self.assertEqual(response.exception.errorCode, FakeApiError.INSUFFICIENT_BALANCE)
+
+    def test_confirm_after(self):
+        self.server.confirm_after = 0
+        self.client.create_transaction("GETH", "transfer-4", 100, from_addr=GETH_ADDRESS, to_addr=TO_ADDRESS)
+        transaction, = self.client.transactions_by_request_ids("transfer-4").result["transactions"]
+        self.assertEqual(transaction["status"], STATUS_SUCCESS)
+
+    def test_fail_next_with_retry(self):
+        self.server.fail_next("/v1/custody/mpc/get_supported_chains/", times=2)
+        client = MPCClient(self.signer, self.server.env, transport=self.server.transport(),
+                           retry_policy=RetryPolicy(max_attempts=3, backoff_base=0.001))
+        self.assertTrue(client.get_supported_chains().success)
+        self.assertEqual(self.server.calls["/v1/custody/mpc/get_supported_chains/"], 3)
+
+    def test_async_transport(self):
+        async def run():
+            client = AsyncMPCClient(self.signer, self.server.env, transport=self.server.async_transport())
+            responses = await asyncio.gather(*(client.get_balance(GETH_ADDRESS, coin="GETH") for _ in range(5)))
+            return [response.success for response in responses]
+
+        self.assertEqual(asyncio.run(run()), [True] * 5)
+
+    def test_record_and_replay(self):
+        fd, path = tempfile.mkstemp(suffix=".jsonl")
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        recorder = RecordingTransport(self.server.transport(), path)
+        client = MPCClient(self.signer, self.server.env, transport=recorder)
+        client.create_transaction("GETH", "recorded-1", 100, from_addr=GETH_ADDRESS, to_addr=TO_ADDRESS)
+        for _ in range(2):
+            client.transactions_by_request_ids("recorded-1")
+            self.server.settle("recorded-1")
+        recorder.close()
+
+        replayed = MPCClient(self.signer, self.server.env, transport=ReplayTransport(path, ["request_id"]))
+        response = replayed.create_transaction("GETH", "replayed-1", 100, from_addr=GETH_ADDRESS,
+                                               to_addr=TO_ADDRESS)
+        self.assertEqual(response.result["request_id"], "recorded-1")
+        statuses = [replayed.transactions_by_request_ids("recorded-1").result["transactions"][0]["status"]
+                    for _ in range(3)]
+        self.assertEqual(statuses, [STATUS_PENDING, STATUS_SUCCESS, STATUS_SUCCESS])
+        with self.assertRaises(CassetteMiss):
+            replayed.get_supported_chains()
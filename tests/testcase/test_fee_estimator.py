@@ -0,0 +1,121 @@
+import time
+import unittest
+from unittest import mock
+
+from cobo_custody.client.mpc_client import MPCClient
+from cobo_custody.service.fee_estimator import FeeEstimator, FeeRequest, amount_bucket
+from cobo_custody.service.fund_sweep import FundSweep
+from cobo_custody.signer.local_signer import LocalSigner, generate_new_key
+from cobo_custody.testing.fake_server import FakeCoboServer
+
+ESTIMATE_PATH = "/v1/custody/mpc/estimate_fee/"
+TO_ADDRESS = "0x00000000000000000000000000000000000000aa"
+
+
+class FeeEstimatorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = FakeCoboServer()
+        self.mpc_client = MPCClient(LocalSigner(generate_new_key()[0]), self.server.env,
+                                    transport=self.server.transport())
+        self.estimator = FeeEstimator(self.mpc_client, ttl=10)
+        self.addCleanup(self.estimator.close)
+
+    def calls(self) -> int:
+        return self.server.calls[ESTIMATE_PATH]
+
+    def test_amount_bucket(self):
+        self.assertEqual(amount_bucket(12345), 13000)
+        self.assertEqual(amount_bucket(13000), 13000)
+        self.assertEqual(amount_bucket(7), 7)
+        self.assertEqual(amount_bucket(10 ** 18 - 1), 10 ** 18)
+        self.assertEqual(amount_bucket(12345, digits=1), 20000)
+        self.assertIsNone(amount_bucket(None))
+
+    def test_estimate_is_cached(self):
+        first = self.estimator.estimate("GETH", 12100, TO_ADDRESS)
+        second = self.estimator.estimate("GETH", 12900, TO_ADDRESS)
+        self.assertTrue(first.success)
+        self.assertIs(first, second)
+        self.assertEqual(self.calls(), 1)
+        self.estimator.estimate("GETH", 14000, TO_ADDRESS)
+        self.assertEqual(self.calls(), 2)
+
+    def test_estimate_many_shares_work(self):
+        requests = [FeeRequest("GETH", f"0x{i:040x}", TO_ADDRESS, 10 ** 6 + 1 + i) for i in range(20)]
+        requests += [FeeRequest("GETH_USDT", f"0x{i:040x}", TO_ADDRESS, 500) for i in range(5)]
+        results = self.estimator.estimate_many(requests)
+        self.assertEqual(len(results), 25)
+        self.assertTrue(all(result.success for result in results))
+        self.assertEqual(results[-1].result["fee_coin"], "GETH")
+        self.assertEqual(self.calls(), 2)
+
+    def test_per_address_coins(self):
+        estimator = FeeEstimator(self.mpc_client, per_address_coins=["BTC"])
+        self.addCleanup(estimator.close)
+        estimator.estimate_many([FeeRequest("BTC", address, None, 1000) for address in ("3a", "3b", "3a")])
+        self.assertEqual(self.calls(), 2)
+
+    def test_estimated_amount(self):
+        estimator = FeeEstimator(self.mpc_client, per_address_coins=["BTC"])
+        self.addCleanup(estimator.close)
+        with mock.patch.object(self.mpc_client, "estimate_fee", wraps=self.mpc_client.estimate_fee) as estimate:
+            estimator.estimate("BTC", 12345, TO_ADDRESS, from_address="3a")
+            estimator.estimate("GETH", 12345, TO_ADDRESS, from_address="0xa")
+        # a sender's own estimate never asks for more than it sends, shared ones carry no sender
+        self.assertEqual(estimate.call_args_list[0][1]["amount"], 12345)
+        self.assertEqual(estimate.call_args_list[0][1]["from_address"], "3a")
+        self.assertEqual(estimate.call_args_list[1][1]["amount"], 13000)
+        self.assertIsNone(estimate.call_args_list[1][1]["from_address"])
+
+    def test_per_address_amounts_are_exact(self):
+        estimator = FeeEstimator(self.mpc_client, per_address_coins=["BTC"])
+        self.addCleanup(estimator.close)
+        with mock.patch.object(self.mpc_client, "estimate_fee", wraps=self.mpc_client.estimate_fee) as estimate:
+            estimator.estimate("BTC", 12100, TO_ADDRESS, from_address="3a")
+            estimator.estimate("BTC", 12900, TO_ADDRESS, from_address="3a")
+        # a larger amount in the same bucket does not reuse the smaller estimate
+        self.assertEqual([call[1]["amount"] for call in estimate.call_args_list], [12100, 12900])
+
+    def test_size_is_bounded(self):
+        estimator = FeeEstimator(self.mpc_client, per_address_coins=["BTC"], max_size=3)
+        self.addCleanup(estimator.close)
+        for i in range(5):
+            estimator.estimate("BTC", 1000, TO_ADDRESS, from_address=f"3{i}")
+        estimator.estimate("BTC", 1000, TO_ADDRESS, from_address="32")
+        self.assertEqual(len(estimator._entries), 3)
+        self.assertEqual(self.calls(), 5)
+        estimator.estimate("BTC", 1000, TO_ADDRESS, from_address="30")
+        self.assertEqual(self.calls(), 6)
+
+    def test_expired_estimate_is_fetched_again(self):
+        estimator = FeeEstimator(self.mpc_client, ttl=0.05)
+        self.addCleanup(estimator.close)
+        estimator.estimate("GETH", 100)
+        time.sleep(0.06)
+        estimator.estimate("GETH", 100)
+        self.assertEqual(self.calls(), 2)
+
+    def test_background_refresh(self):
+        estimator = FeeEstimator(self.mpc_client, ttl=10, refresh_after=0)
+        first = estimator.estimate("GETH", 100)
+        second = estimator.estimate("GETH", 100)
+        self.assertIs(first, second)
+        estimator.close()
+        self.assertEqual(self.calls(), 2)
+        self.assertIsNot(estimator.estimate("GETH", 100), first)
+
+    def test_errors_are_not_cached(self):
+        self.server.fail_next(ESTIMATE_PATH, status_code=400, error_code=1000)
+        self.assertFalse(self.estimator.estimate("GETH", 100).success)
+        self.assertTrue(self.estimator.estimate("GETH", 100).success)
+        self.assertEqual(self.calls(), 2)
+
+    def test_fund_sweep_shares_estimates(self):
+        sources = [self.server.mpc.add_address("GETH")["address"] for _ in range(10)]
+        for source in sources:
+            self.server.mpc.credit("GETH", source, 10 ** 6)
+        with FundSweep(self.mpc_client, fee_estimator=self.estimator) as sweep:
+            report = sweep.sweep("GETH", TO_ADDRESS, "run-1")
+        self.assertEqual(len(report.swept), 10)
+        self.assertEqual(self.calls(), 1)
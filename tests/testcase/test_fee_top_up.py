@@ -0,0 +1,128 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+from cobo_custody.client.mpc_client import MPCClient
+from cobo_custody.service.fee_top_up import FAILED, SUBMITTED, TOPPING_UP, FeeTopUpOrchestrator, TopUpJob, Transfer
+from cobo_custody.service.fund_sweep import FundSweep
+from cobo_custody.signer.local_signer import LocalSigner, generate_new_key
+from cobo_custody.testing.fake_server import FakeCoboServer
+
+TO_ADDRESS = "0x00000000000000000000000000000000000000aa"
+POLL_PATH = "/v1/custody/mpc/transactions_by_request_ids/"
+
+
+class FeeTopUpOrchestratorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = FakeCoboServer()
+        self.wallet = self.server.mpc
+        self.wallet.add_address("GETH", TO_ADDRESS)
+        self.fee_address = self.wallet.add_address("GETH")["address"]
+        self.wallet.credit("GETH", self.fee_address, 10 ** 18)
+        self.token_fee = self.server.coin("GETH_USDT").fee
+        self.mpc_client = MPCClient(LocalSigner(generate_new_key()[0]), self.server.env,
+                                    transport=self.server.transport())
+        self.orchestrator = FeeTopUpOrchestrator(self.mpc_client, poll_interval=0.01, max_poll_interval=0.05,
+                                                 timeout=5)
+        self.addCleanup(self.orchestrator.close)
+
+    def job(self, index: int, top_up: bool = True) -> TopUpJob:
+        source = self.wallet.add_address("GETH")["address"]
+        self.wallet.credit("GETH_USDT", source, 100)
+        if not top_up:
+            self.wallet.credit("GETH", source, self.token_fee)
+        return TopUpJob(Transfer("GETH_USDT", f"transfer-{index}", source, TO_ADDRESS, 100),
+                        Transfer("GETH", f"top-up-{index}", self.fee_address, source, self.token_fee)
+                        if top_up else None)
+
+    def test_transfers_wait_for_their_top_up(self):
+        self.server.confirm_after = 0
+        self.orchestrator.poll_interval = 0.2
+        jobs = [self.job(i) for i in range(5)] + [self.job(5, top_up=False)]
+        self.orchestrator.run(jobs)
+
+        self.assertEqual([job.status for job in jobs], [SUBMITTED] * 6)
+        self.assertTrue(all(job.cobo_id for job in jobs))
+        # every top-up was confirmed by the first combined poll
+        self.assertEqual(self.server.calls[POLL_PATH], 1)
+        self.server.settle()
+        self.assertEqual(self.wallet.balance("GETH_USDT", TO_ADDRESS), 600)
+
+    def test_released_as_soon_as_confirmed(self):
+        jobs = [self.job(0), self.job(1)]
+        runner = threading.Thread(target=self.orchestrator.run, args=(jobs,))
+        runner.start()
+        self.addCleanup(runner.join)
+        self.wait_for(lambda: all(job.status == TOPPING_UP for job in jobs))
+        self.assertEqual(len(self.wallet.transactions), 2)
+
+        self.server.settle("top-up-0")
+        self.wait_for(lambda: jobs[0].status == SUBMITTED)
+        self.assertEqual(jobs[1].status, TOPPING_UP)
+        self.server.settle("top-up-1")
+        runner.join(5)
+        self.assertEqual(jobs[1].status, SUBMITTED)
+
+    def test_failed_top_up(self):
+        jobs = [self.job(0), self.job(1)]
+        self.server.confirm_after = 0
+        self.wallet.create_transaction("GETH", "top-up-1", self.fee_address, TO_ADDRESS, 1)
+        self.server.settle("top-up-1")
+        self.orchestrator.run(jobs)
+        self.assertEqual(jobs[0].status, SUBMITTED)
+        self.assertEqual(jobs[1].status, FAILED)
+        self.assertIn("duplicate", jobs[1].reason)
+
+        job = self.job(2)
+        self.server.confirm_after = None
+        runner = threading.Thread(target=self.orchestrator.run, args=([job],))
+        runner.start()
+        self.wait_for(lambda: job.status == TOPPING_UP)
+        self.server.settle("top-up-2", success=False)
+        runner.join(5)
+        self.assertEqual(job.status, FAILED)
+        self.assertIn("fee top-up failed", job.reason)
+
+    def test_slow_submit_after_confirmation(self):
+        self.server.confirm_after = 0
+        job = self.job(0)
+        submit = FeeTopUpOrchestrator._submit
+
+        def slow_submit(orchestrator, job):
+            time.sleep(0.1)
+            submit(orchestrator, job)
+
+        with mock.patch.object(FeeTopUpOrchestrator, "_submit", slow_submit):
+            self.orchestrator.run([job])
+        self.assertEqual(job.status, SUBMITTED)
+        self.assertEqual(job.reason, "")
+
+    def test_timeout(self):
+        self.orchestrator.timeout = 0.05
+        job = self.job(0)
+        self.orchestrator.run([job])
+        self.assertEqual(job.status, FAILED)
+        self.assertEqual(job.reason, "fee top-up not confirmed")
+        self.assertEqual(self.wallet.balance("GETH_USDT", job.transfer.from_address), 100)
+
+    def test_fund_sweep_waits_for_top_ups(self):
+        self.server.confirm_after = 0
+        sources = [self.wallet.add_address("GETH")["address"] for _ in range(3)]
+        for source in sources:
+            self.wallet.credit("GETH_USDT", source, 100)
+        with FundSweep(self.mpc_client, top_up_orchestrator=self.orchestrator) as sweep:
+            report = sweep.sweep("GETH_USDT", TO_ADDRESS, "run-1", fee_from_address=self.fee_address)
+        self.assertEqual(len(report.swept), 3)
+        self.assertFalse(report.awaiting_top_up)
+        self.server.settle()
+        self.assertEqual(self.wallet.balance("GETH_USDT", TO_ADDRESS), 300)
+
+    @staticmethod
+    def wait_for(condition, timeout: float = 5):
+        deadline = time.monotonic() + timeout
+        while not condition():
+            if time.monotonic() > deadline:
+                raise AssertionError("condition not reached")
+            time.sleep(0.005)
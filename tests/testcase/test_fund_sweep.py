@@ -0,0 +1,103 @@
+import unittest
+
+from cobo_custody.client.mpc_client import MPCClient
+from cobo_custody.service.fund_sweep import AWAITING_TOP_UP, FundSweep
+from cobo_custody.signer.local_signer import LocalSigner, generate_new_key
+from cobo_custody.testing.fake_server import FakeCoboServer
+
+TO_ADDRESS = "0x00000000000000000000000000000000000000aa"
+CREATE_PATH = "/v1/custody/mpc/create_transaction/"
+ESTIMATE_PATH = "/v1/custody/mpc/estimate_fee/"
+
+
+class FundSweepTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = FakeCoboServer()
+        self.wallet = self.server.mpc
+        self.to_address = self.wallet.add_address("GETH", TO_ADDRESS)["address"]
+        self.fee_address = self.wallet.add_address("GETH")["address"]
+        self.sources = [self.wallet.add_address("GETH")["address"] for _ in range(6)]
+        mpc_client = MPCClient(LocalSigner(generate_new_key()[0]), self.server.env, transport=self.server.transport())
+        self.sweep = FundSweep(mpc_client, max_workers=4)
+        self.addCleanup(self.sweep.close)
+        self.eth_fee = self.server.coin("GETH").fee
+        self.token_fee = self.server.coin("GETH_USDT").fee
+
+    def fund(self, coin: str, amounts):
+        for address, amount in zip(self.sources, amounts):
+            self.wallet.credit(coin, address, amount)
+
+    def test_sweep_native_coin(self):
+        self.fund("GETH", [10 ** 6 * (i + 1) for i in range(5)] + [self.eth_fee])
+        report = self.sweep.sweep("GETH", TO_ADDRESS, "run-1")
+
+        self.assertEqual(len(report.swept), 5)
+        self.assertEqual(len(report.skipped), 1)
+        self.assertEqual(report.skipped[0].from_address, self.sources[5])
+        self.assertEqual(report.swept_amount, 15 * 10 ** 6 - 5 * self.eth_fee)
+        for address in self.sources[:5]:
+            self.assertEqual(self.wallet.balance("GETH", address), 0)
+        self.assertEqual(self.server.calls[ESTIMATE_PATH], 6)
+        self.server.settle()
+        self.assertEqual(self.wallet.balance("GETH", TO_ADDRESS), report.swept_amount)
+
+    def test_sweep_target_amount(self):
+        self.fund("GETH", [10 ** 6, 3 * 10 ** 6, 2 * 10 ** 6])
+        report = self.sweep.sweep("GETH", TO_ADDRESS, "run-1", amount=4 * 10 ** 6)
+
+        self.assertEqual(report.swept_amount, 4 * 10 ** 6)
+        self.assertEqual([t.from_address for t in report.swept], [self.sources[1], self.sources[2]])
+        self.assertEqual(report.plan.shortfall, 0)
+        self.assertEqual(self.wallet.balance("GETH", self.sources[0]), 10 ** 6)
+
+        report = self.sweep.sweep("GETH", TO_ADDRESS, "run-2", amount=10 ** 9)
+        self.assertGreater(report.plan.shortfall, 0)
+
+    def test_request_ids_are_deterministic(self):
+        self.fund("GETH", [10 ** 6, 10 ** 6])
+        first = self.sweep.plan("GETH", TO_ADDRESS, "run-1")
+        second = self.sweep.plan("GETH", TO_ADDRESS, "run-1")
+        other = self.sweep.plan("GETH", TO_ADDRESS, "run-2")
+        self.assertEqual([t.request_id for t in first.transfers], [t.request_id for t in second.transfers])
+        self.assertNotEqual(first.transfers[0].request_id, other.transfers[0].request_id)
+
+        self.sweep.execute(first)
+        self.wallet.credit("GETH", self.sources[0], 10 ** 6)
+        report = self.sweep.execute(second)
+        self.assertEqual(len(report.failed), 2)
+        self.assertEqual(len(self.wallet.transactions), 2)
+
+    def test_token_sweep_tops_up_fees(self):
+        self.wallet.credit("GETH", self.fee_address, 10 ** 18)
+        self.fund("GETH_USDT", [500, 400, 300])
+        self.wallet.credit("GETH", self.sources[0], self.token_fee)
+        report = self.sweep.sweep("GETH_USDT", TO_ADDRESS, "run-1", fee_from_address=self.fee_address)
+
+        self.assertEqual(report.plan.fee_coin, "GETH")
+        self.assertEqual([t.from_address for t in report.swept], [self.sources[0]])
+        self.assertEqual([t.status for t in report.awaiting_top_up], [AWAITING_TOP_UP] * 2)
+        self.assertEqual(self.wallet.balance("GETH_USDT", self.sources[1]), 400)
+
+        self.server.settle()
+        report = self.sweep.sweep("GETH_USDT", TO_ADDRESS, "run-1", fee_from_address=self.fee_address)
+        self.assertEqual(report.swept_amount, 700)
+        self.assertFalse(report.awaiting_top_up)
+
+    def test_token_sweep_without_fee_address(self):
+        self.fund("GETH_USDT", [500])
+        report = self.sweep.sweep("GETH_USDT", TO_ADDRESS, "run-1")
+        self.assertFalse(report.swept)
+        self.assertIn("insufficient GETH", report.skipped[0].reason)
+
+    def test_failures_are_reported(self):
+        self.fund("GETH", [10 ** 6, 2 * 10 ** 6, 3 * 10 ** 6])
+        self.server.fail_next(ESTIMATE_PATH, status_code=400, error_code=1000)
+        self.server.fail_next(CREATE_PATH, status_code=400, error_code=1000)
+        report = self.sweep.sweep("GETH", TO_ADDRESS, "run-1")
+
+        self.assertEqual(len(report.skipped), 1)
+        self.assertIn("fee estimate failed", report.skipped[0].reason)
+        self.assertEqual(len(report.failed), 1)
+        self.assertEqual(len(report.swept), 1)
+        self.assertEqual(report.summary()["failed"], 1)
@@ -0,0 +1,41 @@
+import hashlib
+import unittest
+
+from cobo_custody.signer.local_signer import (LocalSigner, generate_new_key, get_verifier, verify_ecdsa_signature,
+                                              verify_response_signature)
+
+
+class LocalVerifierTest(unittest.TestCase):
+
+    def setUp(self):
+        api_secret, self.api_key = generate_new_key()
+        self.signer = LocalSigner(api_secret)
+
+    def test_verifier_is_built_once_per_key(self):
+        get_verifier.cache_clear()
+        verifier = get_verifier(self.api_key)
+        for _ in range(3):
+            self.assertTrue(verify_ecdsa_signature("content", self.signer.sign("content"), self.api_key))
+        self.assertIs(get_verifier(self.api_key), verifier)
+        self.assertEqual(get_verifier.cache_info().misses, 1)
+
+        other_key = generate_new_key()[1]
+        self.assertIsNot(get_verifier(other_key), verifier)
+        self.assertFalse(verify_ecdsa_signature("content", self.signer.sign("content"), other_key))
+
+    def test_response_signature(self):
+        content, timestamp = b'{"success": true, "result": {}}', "1700000000000"
+        signature = self.signer.sign(f"{content.decode()}|{timestamp}")
+        self.assertTrue(verify_response_signature(content, timestamp, signature, self.api_key))
+        self.assertFalse(verify_response_signature(content, "1700000000001", signature, self.api_key))
+        self.assertFalse(verify_response_signature(content, timestamp, "not hex", self.api_key))
+
+    def test_verify_digest(self):
+        signature = self.signer.sign("content")
+        digest = hashlib.sha256(b"content").digest()
+        self.assertTrue(get_verifier(self.api_key).verify_digest(digest, signature))
+        self.assertFalse(get_verifier(self.api_key).verify_digest(digest, signature[:-2]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import json
+import unittest
+
+from cobo_custody.client.mpc_client import MPCClient
+from cobo_custody.config import Env
+from cobo_custody.metrics.in_memory import Histogram, InMemoryMetrics
+from cobo_custody.metrics.prometheus import PrometheusExporter
+from cobo_custody.signer.local_signer import LocalSigner, generate_new_key
+from cobo_custody.transport.api_transport import ApiTransport, HttpResponse
+
+
+class StaticTransport(ApiTransport):
+
+    def __init__(self, payload: dict):
+        self.content = json.dumps(payload).encode()
+
+    def request(self, method: str, url: str, params=None, data=None, headers: dict = None) -> HttpResponse:
+        return HttpResponse(200, {}, self.content)
+
+    def close(self):
+        pass
+
+
+class MetricsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.metrics = InMemoryMetrics()
+        self.signer = LocalSigner(generate_new_key()[0])
+        self.env = Env(host="http://127.0.0.1", coboPub="")
+
+    def client(self, payload: dict) -> MPCClient:
+        return MPCClient(self.signer, self.env, transport=StaticTransport(payload), metrics=self.metrics)
+
+    def test_histogram(self):
+        histogram = Histogram(buckets=(1, 2, 3))
+        for value in (0.5, 1.5, 1.7, 2.5, 10):
+            histogram.observe(value)
+        self.assertEqual(histogram.cumulative_counts(), [1, 3, 4, 5])
+        self.assertEqual(histogram.quantile(0.5), 2)
+        self.assertEqual(histogram.quantile(1), float("inf"))
+
+    def test_records_phases_and_errors(self):
+        client = self.client({"success": True, "result": {"coin_data": []}})
+        for _ in range(3):
+            client.get_balance(address="0xabc", coin="ETH")
+        failing = self.client({"success": False, "error_code": 12009, "error_message": "error", "error_id": "x"})
+        failing.get_balance(address="0xabc", coin="ETH")
+
+        summary = self.metrics.summary()["GET /v1/custody/mpc/get_balance/"]
+        self.assertEqual(summary["count"], 4)
+        self.assertEqual(set(summary["phases"]), {"clean", "canonicalize", "nonce", "sign", "http", "verify",
+                                                       "parse"})
+        self.assertEqual(self.metrics.errors[("GET", "/v1/custody/mpc/get_balance/", "12009")], 1)
+        self.assertEqual(self.metrics.request_bytes[("GET", "/v1/custody/mpc/get_balance/")],
+                         4 * len("address=0xabc&coin=ETH"))
+
+    def test_prometheus(self):
+        self.client({"success": True, "result": {}}).get_supported_chains()
+        text = PrometheusExporter(self.metrics).render()
+        self.assertIn('cobo_request_duration_seconds_count{method="GET",path="/v1/custody/mpc/get_supported_chains/"} 1',
+                      text)
+        self.assertIn('le="+Inf"', text)
+        self.assertIn('phase="sign"', text)
+
+
+if __name__ == '__main__':
+    unittest.main()
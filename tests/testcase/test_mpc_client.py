@@ -1,19 +1,35 @@
 import unittest
 import time
 
-from cobo_custody.signer.local_signer import LocalSigner
+from cobo_custody.signer.local_signer import LocalSigner, generate_new_key
+from cobo_custody.testing.fake_server import FakeCoboServer
 from cobo_custody.client.mpc_client import MPCClient
 
 
 class MPCClientTest(unittest.TestCase):
     mpc_api_secret = ""
     env = None
+    transport = None
 
     @classmethod
     def setUpClass(cls):
+        if cls.env is None:
+            cls.use_fake_server()
         cls.mpc_client = MPCClient(signer=LocalSigner(cls.mpc_api_secret),
                                    env=cls.env,
-                                   debug=False)
+                                   debug=False,
+                                   transport=cls.transport)
+
+    @classmethod
+    def use_fake_server(cls):
+        # without an env the tests run offline against a fake server seeded with the data they expect
+        server = FakeCoboServer()
+        for address in ("0x6a060efe0ff887f4e24dc2d2098020abf28bcce4", "0x3ede1e59a3f3a66de4260df7ba3029b515337e5c"):
+            server.mpc.add_address("GETH", address)
+            server.mpc.credit("GETH", address, 10 ** 18)
+        cls.mpc_api_secret = generate_new_key()[0]
+        cls.env = server.env
+        cls.transport = server.transport()
 
     def test_get_supported_chains(self):
         response = self.mpc_client.get_supported_chains()
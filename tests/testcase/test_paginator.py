@@ -0,0 +1,111 @@
+import asyncio
+import unittest
+
+from cobo_custody.client.api_response import ApiResponse
+from cobo_custody.client.paginator import (IdPager, OffsetPager, PageIndexPager, StartEndIdPager, TimePager,
+                                           aiter_pages, iter_pages)
+from cobo_custody.error.api_error import ApiError, ApiException, PaginationError
+
+
+class FakeEndpoint(object):
+    """Serves ids 1..total the way the Cobo list endpoints page through them."""
+
+    def __init__(self, total: int = 23, page_size: int = 5):
+        self.ids = list(range(1, total + 1))
+        self.page_size = page_size
+        self.calls = []
+
+    def request(self, method: str, path: str, params: dict) -> ApiResponse:
+        self.calls.append(params)
+        ids = self.ids
+        if params.get("max_id") is not None:
+            ids = [i for i in reversed(ids) if i < int(params["max_id"])]
+        elif params.get("min_id") is not None:
+            ids = [i for i in ids if i > int(params["min_id"])]
+        else:
+            ids = list(reversed(ids))
+        if "page_index" in params:
+            start = params["page_index"] * params["page_length"]
+            ids = self.ids[start:start + params["page_length"]]
+            return ApiResponse(True, {"total": len(self.ids), "coin_data": [{"id": i} for i in ids]}, None)
+        if "offset" in params:
+            ids = self.ids[params["offset"]:params["offset"] + self.page_size]
+        return ApiResponse(True, [{"id": str(i)} for i in ids[:self.page_size]], None)
+
+    async def async_request(self, method: str, path: str, params: dict) -> ApiResponse:
+        return self.request(method, path, params)
+
+
+class PaginatorTest(unittest.TestCase):
+
+    def ids(self, records):
+        return [int(record["id"]) for record in records]
+
+    def test_id_descending(self):
+        endpoint = FakeEndpoint()
+        records = iter_pages(endpoint.request, "GET", "/", {"max_id": None}, IdPager())
+        self.assertEqual(self.ids(records), list(range(23, 0, -1)))
+
+    def test_id_ascending(self):
+        endpoint = FakeEndpoint()
+        records = iter_pages(endpoint.request, "GET", "/", {"min_id": "3"}, IdPager(), prefetch=False)
+        self.assertEqual(self.ids(records), list(range(4, 24)))
+
+    def test_page_index(self):
+        endpoint = FakeEndpoint(total=12)
+        records = iter_pages(endpoint.request, "GET", "/", {"page_index": 0, "page_length": 5},
+                             PageIndexPager(items_key="coin_data"))
+        self.assertEqual(self.ids(records), list(range(1, 13)))
+        self.assertEqual([call["page_index"] for call in endpoint.calls], [0, 1, 2])
+
+    def test_offset(self):
+        endpoint = FakeEndpoint(total=11)
+        records = iter_pages(endpoint.request, "GET", "/", {"offset": 0}, OffsetPager())
+        self.assertEqual(self.ids(records), list(range(1, 12)))
+
+    def test_start_end_id(self):
+        pager = StartEndIdPager(items_key="addresses")
+        page = {"addresses": [{"id": "7"}, {"id": "8"}]}
+        self.assertEqual(pager.next_params({"sort": 1}, page, page["addresses"]), {"sort": 1, "start_id": "8"})
+        self.assertEqual(pager.next_params({"sort": 0}, page, page["addresses"]), {"sort": 0, "end_id": "7"})
+
+    def test_time_skips_boundary(self):
+        pager = TimePager(items_key="transactions")
+        first = {"transactions": [{"cobo_id": "a", "created_timestamp": 1}, {"cobo_id": "b", "created_timestamp": 2}]}
+        params = pager.next_params({"order": "asc"}, first, pager.records({}, first))
+        self.assertEqual(params["start_time"], 2)
+        second = {"transactions": [{"cobo_id": "b", "created_timestamp": 2}, {"cobo_id": "c", "created_timestamp": 2}]}
+        self.assertEqual(pager.records(params, second), [{"cobo_id": "c", "created_timestamp": 2}])
+
+    def test_time_pages_through_ties(self):
+        times = {"a": 1, "b": 2, "c": 2, "d": 2, "e": 3}
+
+        def request(method, path, params):
+            ids = [i for i in sorted(times) if times[i] >= (params.get("start_time") or 0)][:params["limit"]]
+            return ApiResponse(True, {"transactions": [{"cobo_id": i, "created_timestamp": times[i]} for i in ids]},
+                               None)
+
+        pages = iter_pages(request, "GET", "/", {"order": "asc", "limit": 4}, TimePager("transactions"), False)
+        self.assertEqual([record["cobo_id"] for record in pages], ["a", "b", "c", "d", "e"])
+        # with a page of three the window never moves past the three records at timestamp 2
+        with self.assertRaises(PaginationError):
+            list(iter_pages(request, "GET", "/", {"order": "asc", "limit": 3}, TimePager("transactions"), False))
+
+    def test_error(self):
+        def request(method, path, params):
+            return ApiResponse(False, None, ApiError(12000, "error", "id"))
+
+        with self.assertRaises(ApiException):
+            list(iter_pages(request, "GET", "/", {}, IdPager()))
+
+    def test_async(self):
+        endpoint = FakeEndpoint()
+
+        async def collect():
+            return [record async for record in aiter_pages(endpoint.async_request, "GET", "/", {}, IdPager())]
+
+        self.assertEqual(self.ids(asyncio.run(collect())), list(range(23, 0, -1)))
+
+
+if __name__ == '__main__':
+    unittest.main()
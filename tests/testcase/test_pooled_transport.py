@@ -0,0 +1,57 @@
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from cobo_custody.transport.pooled_transport import PooledTransport
+
+
+class _EchoHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = self.path.encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class PooledTransportTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _EchoHandler)
+        cls.url = "http://127.0.0.1:%d/ping" % cls.server.server_address[1]
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def test_reuses_connection(self):
+        transport = PooledTransport()
+        for _ in range(5):
+            response = transport.request("GET", self.url, params="a=1")
+            self.assertEqual(response.content, b"/ping?a=1")
+        stats = transport.stats()
+        transport.close()
+        self.assertEqual(stats.requests, 5)
+        self.assertEqual(stats.new_connections, 1)
+        self.assertEqual(stats.hits, 4)
+
+    def test_no_keep_alive(self):
+        transport = PooledTransport(keep_alive=False)
+        for _ in range(3):
+            transport.request("GET", self.url)
+        stats = transport.stats()
+        transport.close()
+        self.assertEqual(stats.requests, 3)
+        self.assertEqual(stats.new_connections, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import json
+import unittest
+from unittest import mock
+from urllib.parse import urlparse
+
+from cobo_custody.client import prepared_request
+from cobo_custody.client.client import Client
+from cobo_custody.client.prepared_request import PreparedRequest
+from cobo_custody.client.retry import RetryPolicy
+from cobo_custody.config import Env
+from cobo_custody.signer.local_signer import LocalSigner, generate_new_key, verify_ecdsa_signature
+from cobo_custody.transport.api_transport import ApiTransport, HttpResponse
+
+PAYLOAD = json.dumps({"success": True, "result": {}}).encode()
+
+
+class FlakyTransport(ApiTransport):
+    """Fails the first ``failures`` calls with a connection error, then succeeds."""
+
+    def __init__(self, failures: int = 0):
+        self.failures = failures
+        self.calls = []
+
+    def request(self, method: str, url: str, params=None, data=None, headers: dict = None) -> HttpResponse:
+        self.calls.append((method, urlparse(url).path, params if method == "GET" else data, dict(headers)))
+        if len(self.calls) <= self.failures:
+            raise ConnectionError("connection reset")
+        return HttpResponse(200, {}, PAYLOAD)
+
+    def close(self):
+        pass
+
+
+class PreparedRequestTest(unittest.TestCase):
+
+    def setUp(self):
+        self.priv_key, self.pub_key = generate_new_key()
+
+    def client(self, transport: ApiTransport) -> Client:
+        return Client(LocalSigner(self.priv_key), Env(host="http://127.0.0.1", coboPub=""), transport=transport,
+                      retry_policy=RetryPolicy(backoff_base=0, jitter=False))
+
+    def test_canonical_form(self):
+        prepared = PreparedRequest("get", "/v1/custody/coin_info/", {"coin": "BTC", "amount": 1, "memo": None})
+        self.assertEqual(prepared.method, "GET")
+        self.assertEqual(prepared.params, {"coin": "BTC", "amount": 1})
+        self.assertEqual(prepared.query, "amount=1&coin=BTC")
+        self.assertEqual(prepared.key, ("GET", "/v1/custody/coin_info/", "amount=1&coin=BTC"))
+        self.assertEqual(prepared.signing_content("1"), "GET|/v1/custody/coin_info/|1|amount=1&coin=BTC")
+        self.assertEqual(set(prepared.take_timings()), {"clean", "canonicalize"})
+        self.assertEqual(prepared.take_timings(), {})
+
+    def test_retries_only_re_sign(self):
+        transport = FlakyTransport(failures=2)
+        with mock.patch.object(prepared_request, "canonical_query", wraps=prepared_request.canonical_query) as encode:
+            self.client(transport).withdraw("BTC", "addr", 100, request_id="r1")
+        self.assertEqual(encode.call_count, 1)
+
+        self.assertEqual(len(transport.calls), 3)
+        bodies = {body for _, _, body, _ in transport.calls}
+        self.assertEqual(bodies, {"address=addr&amount=100&coin=BTC&request_id=r1"})
+        nonces = {headers["Biz-Api-Nonce"] for _, _, _, headers in transport.calls}
+        self.assertEqual(len(nonces), 3)
+        for method, path, body, headers in transport.calls:
+            self.assertEqual(headers["Content-Type"], "application/x-www-form-urlencoded")
+            content = f"{method}|{path}|{headers['Biz-Api-Nonce']}|{body}"
+            self.assertTrue(verify_ecdsa_signature(content, headers["Biz-Api-Signature"], self.pub_key))
+
+    def test_get_sends_signed_query(self):
+        transport = FlakyTransport()
+        self.client(transport).get_transaction_history(coin="ETH", side="deposit", limit=5)
+        method, path, query, headers = transport.calls[0]
+        self.assertEqual(query, "coin=ETH&limit=5&side=deposit")
+        self.assertTrue(verify_ecdsa_signature(f"{method}|{path}|{headers['Biz-Api-Nonce']}|{query}",
+                                               headers["Biz-Api-Signature"], self.pub_key))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import asyncio
+import time
+import unittest
+
+import requests
+
+from cobo_custody.client.api_response import ApiResponse
+from cobo_custody.client.client import Client
+from cobo_custody.client.rate_limiter import RateLimiter, TokenBucket
+from cobo_custody.client.retry import RetryPolicy
+from cobo_custody.error.api_error import ApiError, HttpStatusError
+from cobo_custody.signer.local_signer import LocalSigner, generate_new_key
+from cobo_custody.testing.fake_server import FakeCoboServer
+
+
+class RateLimiterTest(unittest.TestCase):
+
+    def test_token_bucket_rate(self):
+        bucket = TokenBucket(rate=200, burst=5)
+        start = time.monotonic()
+        for _ in range(25):
+            bucket.acquire()
+        # the first 5 tokens are the burst, the other 20 arrive at 200/s
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+    def test_token_bucket_async(self):
+        bucket = TokenBucket(rate=200, burst=1)
+
+        async def run():
+            await asyncio.gather(*[bucket.acquire_async() for _ in range(11)])
+
+        start = time.monotonic()
+        asyncio.run(run())
+        self.assertGreaterEqual(time.monotonic() - start, 0.045)
+
+    def test_path_prefix(self):
+        limiter = RateLimiter(rate=10, path_rates={"/v1/custody/mpc/": (5, 1),
+                                                   "/v1/custody/mpc/babylon/": (1, 1)},
+                              rate_limit_error_codes=())
+        self.assertEqual(limiter.bucket("/v1/custody/mpc/get_balance/").max_rate, 5)
+        self.assertEqual(limiter.bucket("/v1/custody/mpc/babylon/withdraw/").max_rate, 1)
+        self.assertIs(limiter.bucket("/v1/custody/web3_withdraw/"), limiter.default_bucket)
+
+    def test_adaptive_backoff(self):
+        limiter = RateLimiter(rate=10, rate_limit_error_codes=())
+        bucket = limiter.default_bucket
+        limited = ApiResponse(False, None, ApiError(12345, "too many requests", "id"))
+        limiter.feedback("/v1/custody/org_info/", limited, status_code=429)
+        # the other in-flight requests rejected by the same limit do not halve it again
+        limiter.feedback("/v1/custody/org_info/", limited, status_code=429)
+        self.assertEqual(bucket.rate, 5)
+        bucket._cooldown_until = 0
+        limiter.feedback("/v1/custody/org_info/", limited, status_code=429)
+        self.assertEqual(bucket.rate, 2.5)
+        for _ in range(10):
+            limiter.feedback("/v1/custody/org_info/", ApiResponse(True, {}, None))
+        self.assertEqual(bucket.rate, 7.5)
+
+    def test_throttle_cooldown(self):
+        bucket = TokenBucket(rate=100, burst=1)
+        for _ in range(5):
+            bucket.throttle()
+        self.assertEqual(bucket.rate, 50)
+        time.sleep(0.03)
+        bucket.throttle()
+        self.assertEqual(bucket.rate, 25)
+
+    def test_rate_limit_codes(self):
+        limiter = RateLimiter(rate=10, rate_limit_error_codes=[12345])
+        self.assertTrue(limiter.is_rate_limited(None, 429))
+        self.assertFalse(limiter.is_rate_limited(ApiResponse(False, None, ApiError(429, "error", "id"))))
+        self.assertTrue(limiter.is_rate_limited(ApiResponse(False, None, ApiError(12345, "error", "id"))))
+        self.assertFalse(RateLimiter(rate_limit_error_codes=()).is_rate_limited(
+            ApiResponse(False, None, ApiError(12345, "error", "id"))))
+        with self.assertRaises(TypeError):
+            RateLimiter(rate=10)
+
+    def test_rate_limit_status_before_parsing(self):
+        server = FakeCoboServer()
+        limiter = RateLimiter(rate=10, rate_limit_error_codes=())
+        client = Client(LocalSigner(generate_new_key()[0]), server.env, transport=server.transport(),
+                        rate_limiter=limiter)
+        resp = requests.Response()
+        resp.status_code = 429
+        resp._content = b"<html>Too Many Requests</html>"
+        with self.assertRaises(ValueError):
+            client.handle_response("/v1/custody/org_info/", resp)
+        self.assertEqual(limiter.default_bucket.rate, 5)
+
+        limiter.default_bucket._cooldown_until = 0
+        client.retry_policy = RetryPolicy(retry_status_codes=(429, 503))
+        with self.assertRaises(HttpStatusError):
+            client.handle_response("/v1/custody/org_info/", resp)
+        self.assertEqual(limiter.default_bucket.rate, 2.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
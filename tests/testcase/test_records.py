@@ -0,0 +1,77 @@
+import asyncio
+import sys
+import unittest
+from decimal import Decimal
+
+from cobo_custody.model.records import Balance, MPCTransaction, Spendable, Transaction, ato_models, parse_amount, \
+    to_models
+
+
+class RecordsTest(unittest.TestCase):
+
+    def test_parse_amount(self):
+        self.assertEqual(parse_amount("1000000000000000000000"), 10 ** 21)
+        self.assertEqual(parse_amount(12), 12)
+        self.assertEqual(parse_amount("0.000123"), Decimal("0.000123"))
+        self.assertEqual(parse_amount(0.1), Decimal("0.1"))
+        self.assertIsNone(parse_amount(None))
+        self.assertIsNone(parse_amount(""))
+        self.assertRaises(ValueError, parse_amount, "abc")
+
+    def test_from_dict(self):
+        data = {"id": "1", "coin": "ETH", "amount": "1000000000000000000", "abs_amount": "1.0", "status": "success",
+                "tx_detail": {"txid": "0x1"}, "new_field": 1}
+        transaction = Transaction.from_dict(data)
+        self.assertEqual(transaction.amount, 10 ** 18)
+        self.assertEqual(transaction.abs_amount, Decimal("1.0"))
+        self.assertIsNone(transaction.memo)
+        self.assertEqual(transaction.tx_detail, {"txid": "0x1"})
+        self.assertEqual(transaction.extra, {"new_field": 1})
+        self.assertFalse(hasattr(transaction, "__dict__"))
+        self.assertIs(transaction.coin, sys.intern("ETH"))
+        self.assertEqual(Transaction.from_dict(transaction.to_dict()), transaction)
+
+        spendable = Spendable.from_dict({"tx_hash": "0x1", "vout_n": 0, "value": "546"})
+        self.assertEqual(spendable.value, 546)
+        self.assertIsNone(spendable.extra)
+        self.assertIn("value=546", repr(spendable))
+
+    def test_nested_amounts_and_hash(self):
+        data = {"cobo_id": "1", "amount_detail": {"amount": "1000000000000000000000", "abs_amount": "1000.0"},
+                "fee_detail": {"fee_coin": "ETH", "fee_used": "21000", "gas_price": 10}}
+        transaction = MPCTransaction.from_dict(data)
+        self.assertEqual(transaction.amount_detail, {"amount": 10 ** 21, "abs_amount": Decimal("1000.0")})
+        self.assertEqual(transaction.fee_detail, {"fee_coin": "ETH", "fee_used": 21000, "gas_price": 10})
+        self.assertEqual(data["amount_detail"]["amount"], "1000000000000000000000")
+
+        same = MPCTransaction.from_dict(data)
+        self.assertEqual(len({transaction, same, MPCTransaction.from_dict({"cobo_id": "2"})}), 2)
+        self.assertEqual({transaction: 1}[same], 1)
+
+    def test_to_models_is_lazy(self):
+        consumed = []
+
+        def records():
+            for index in range(3):
+                consumed.append(index)
+                yield {"coin": "ETH", "address": f"0x{index}", "balance": str(index)}
+
+        models = to_models(Balance, records())
+        self.assertEqual(consumed, [])
+        self.assertEqual(next(models).balance, 0)
+        self.assertEqual(consumed, [0])
+        self.assertEqual([balance.address for balance in models], ["0x1", "0x2"])
+
+    def test_ato_models(self):
+        async def records():
+            yield {"cobo_id": "1", "gas_price": "30000000000", "chain_code": "ETH"}
+
+        async def run():
+            return [transaction async for transaction in ato_models(MPCTransaction, records())]
+
+        transactions = asyncio.run(run())
+        self.assertEqual(transactions[0].gas_price, 30 * 10 ** 9)
+
+
+if __name__ == '__main__':
+    unittest.main()
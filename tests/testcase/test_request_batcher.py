@@ -0,0 +1,116 @@
+import asyncio
+import json
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs
+
+from cobo_custody.client.async_client import AsyncMPCClient
+from cobo_custody.client.client import Client
+from cobo_custody.client.mpc_client import MPCClient
+from cobo_custody.client.request_batcher import AsyncRequestBatcher, RequestBatcher, batcher_for
+from cobo_custody.config import Env
+from cobo_custody.error.api_error import ApiException
+from cobo_custody.signer.local_signer import LocalSigner, generate_new_key
+from cobo_custody.transport.api_transport import ApiTransport, AsyncApiTransport, HttpResponse
+
+
+def transactions_payload(query: str, items_key: str = None) -> bytes:
+    params = parse_qs(query)
+    ids = params["request_ids"][0].split(",")
+    records = [{"request_id": request_id, "status": params.get("status", [""])[0]}
+               for request_id in ids if request_id != "missing"]
+    return json.dumps({"success": True, "result": {items_key: records} if items_key else records}).encode()
+
+
+class IdsTransport(ApiTransport):
+
+    def __init__(self, items_key: str = None):
+        self.items_key = items_key
+        self.queries = []
+        self._lock = threading.Lock()
+
+    def request(self, method: str, url: str, params=None, data=None, headers: dict = None) -> HttpResponse:
+        with self._lock:
+            self.queries.append(params)
+        return HttpResponse(200, {}, transactions_payload(params, self.items_key))
+
+    def close(self):
+        pass
+
+
+class AsyncIdsTransport(AsyncApiTransport):
+
+    def __init__(self):
+        self.queries = []
+
+    async def request(self, method: str, url: str, params=None, data=None, headers: dict = None) -> HttpResponse:
+        self.queries.append(params)
+        await asyncio.sleep(0)
+        return HttpResponse(200, {}, transactions_payload(params, "transactions"))
+
+    async def close(self):
+        pass
+
+
+class RequestBatcherTest(unittest.TestCase):
+
+    def setUp(self):
+        self.signer = LocalSigner(generate_new_key()[0])
+        self.env = Env(host="http://127.0.0.1", coboPub="")
+
+    def test_collects_ids_into_one_request(self):
+        transport = IdsTransport()
+        client = Client(self.signer, self.env, transport=transport)
+        with batcher_for(client.get_transactions_by_request_ids, window=0.05) as batcher:
+            with ThreadPoolExecutor(8) as executor:
+                ids = ["r1", "r2", "r1", "missing", "r3"]
+                records = list(executor.map(batcher.get, ids))
+        self.assertEqual(len(transport.queries), 1)
+        self.assertEqual([record and record["request_id"] for record in records], ["r1", "r2", "r1", None, "r3"])
+
+    def test_max_batch_size_and_params(self):
+        transport = IdsTransport("transactions")
+        client = MPCClient(self.signer, self.env, transport=transport)
+        batcher = batcher_for(client.transactions_by_request_ids, max_batch_size=2, window=10, status=501)
+        futures = [batcher.submit(f"r{index}") for index in range(5)]
+        batcher.close()
+        self.assertEqual([future.result()["status"] for future in futures], ["501"] * 5)
+        self.assertEqual(sorted(len(parse_qs(query)["request_ids"][0].split(",")) for query in transport.queries),
+                         [1, 2, 2])
+
+    def test_errors_reach_every_caller(self):
+        def fetch(ids):
+            raise ConnectionError("down")
+
+        with RequestBatcher(fetch, "request_id") as batcher:
+            futures = [batcher.submit(request_id) for request_id in ("a", "b")]
+        for future in futures:
+            self.assertRaises(ConnectionError, future.result)
+
+        class ApiErrorTransport(IdsTransport):
+            def request(self, method, url, params=None, data=None, headers=None):
+                payload = {"success": False, "error_code": 12009, "error_message": "", "error_id": ""}
+                return HttpResponse(200, {}, json.dumps(payload).encode())
+
+        client = MPCClient(self.signer, self.env, transport=ApiErrorTransport())
+        with batcher_for(client.transactions_by_cobo_ids) as batcher:
+            future = batcher.submit("1")
+        self.assertRaises(ApiException, future.result)
+
+    def test_async_batcher(self):
+        transport = AsyncIdsTransport()
+        client = AsyncMPCClient(self.signer, self.env, transport=transport)
+
+        async def run():
+            async with batcher_for(client.transactions_by_request_ids, max_batch_size=3) as batcher:
+                self.assertIsInstance(batcher, AsyncRequestBatcher)
+                return await asyncio.gather(*(batcher.get(f"r{index}") for index in range(4)))
+
+        records = asyncio.run(run())
+        self.assertEqual([record["request_id"] for record in records], ["r0", "r1", "r2", "r3"])
+        self.assertEqual(len(transport.queries), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
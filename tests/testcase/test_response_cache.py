@@ -0,0 +1,142 @@
+import asyncio
+import json
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from cobo_custody.client.api_response import ApiResponse
+from cobo_custody.client.async_client import AsyncMPCClient
+from cobo_custody.client.mpc_client import MPCClient
+from cobo_custody.client.response_cache import ResponseCache
+from cobo_custody.config import Env
+from cobo_custody.signer.local_signer import LocalSigner, generate_new_key
+from cobo_custody.transport.api_transport import ApiTransport, AsyncApiTransport, HttpResponse
+
+
+class CountingTransport(ApiTransport):
+
+    def __init__(self, delay: float = 0):
+        self.delay = delay
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def request(self, method: str, url: str, params=None, data=None, headers: dict = None) -> HttpResponse:
+        with self._lock:
+            self.calls.append((method, url, params))
+        time.sleep(self.delay)
+        return HttpResponse(200, {}, json.dumps({"success": True, "result": {"url": url}}).encode())
+
+    def close(self):
+        pass
+
+
+class AsyncCountingTransport(AsyncApiTransport):
+
+    def __init__(self):
+        self.calls = []
+
+    async def request(self, method: str, url: str, params=None, data=None, headers: dict = None) -> HttpResponse:
+        self.calls.append((method, url, params))
+        await asyncio.sleep(0.05)
+        return HttpResponse(200, {}, json.dumps({"success": True, "result": {"url": url}}).encode())
+
+    async def close(self):
+        pass
+
+
+class ResponseCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.signer = LocalSigner(generate_new_key()[0])
+        self.env = Env(host="http://127.0.0.1", coboPub="")
+
+    def test_lru_and_ttl(self):
+        cache = ResponseCache(ttls={"/a/": 0.05}, max_size=2)
+        response = ApiResponse(True, {}, None)
+        for index in range(3):
+            cache.put(cache.make_key("/a/", {"i": index}), response, 0.05)
+        self.assertIsNone(cache.get(cache.make_key("/a/", {"i": 0})))
+        self.assertIs(cache.get(cache.make_key("/a/", {"i": 2})), response)
+        time.sleep(0.06)
+        self.assertIsNone(cache.get(cache.make_key("/a/", {"i": 2})))
+        stats = cache.stats()
+        self.assertEqual((stats.hits, stats.misses, stats.evictions, stats.size), (1, 2, 1, 1))
+
+    def test_key_is_canonical(self):
+        self.assertEqual(ResponseCache.make_key("/a/", {"b": 1, "a": 2, "c": None}),
+                         ResponseCache.make_key("/a/", {"a": 2, "b": 1}))
+
+    def test_client_caches_reference_endpoints_only(self):
+        transport = CountingTransport()
+        client = MPCClient(self.signer, self.env, transport=transport, cache=ResponseCache())
+        client.get_supported_coins("ETH")
+        client.get_supported_coins("ETH")
+        client.get_supported_coins("BTC")
+        client.get_balance("0x1")
+        client.get_balance("0x1")
+        self.assertEqual(len(transport.calls), 4)
+
+        client.cache.invalidate("/v1/custody/mpc/get_supported_coins/", {"chain_code": "ETH"})
+        client.get_supported_coins("ETH")
+        client.get_supported_coins("BTC")
+        self.assertEqual(len(transport.calls), 5)
+        client.cache.invalidate()
+        client.get_supported_coins("BTC")
+        self.assertEqual(len(transport.calls), 6)
+
+    def test_shared_cache_is_scoped_per_host_and_api_key(self):
+        transport = CountingTransport()
+        cache = ResponseCache()
+        other_signer = LocalSigner(generate_new_key()[0])
+        other_env = Env(host="http://127.0.0.2", coboPub="")
+        clients = [MPCClient(self.signer, self.env, transport=transport, cache=cache),
+                   MPCClient(other_signer, self.env, transport=transport, cache=cache),
+                   MPCClient(self.signer, other_env, transport=transport, cache=cache)]
+        for client in clients * 2:
+            client.get_supported_chains()
+        self.assertEqual(len(transport.calls), 3)
+        self.assertEqual(clients[2].get_supported_chains().result["url"],
+                         "http://127.0.0.2/v1/custody/mpc/get_supported_chains/")
+
+        cache.invalidate("/v1/custody/mpc/get_supported_chains/")
+        self.assertEqual(cache.stats().size, 0)
+        clients[0].get_wallet_supported_coins()
+        clients[0].get_wallet_supported_coins()
+        self.assertEqual(len(transport.calls), 5)
+
+    def test_failures_are_not_cached(self):
+        class FailingTransport(CountingTransport):
+            def request(self, method, url, params=None, data=None, headers=None):
+                super().request(method, url, params, data, headers)
+                payload = {"success": False, "error_code": 1, "error_message": "", "error_id": ""}
+                return HttpResponse(200, {}, json.dumps(payload).encode())
+
+        transport = FailingTransport()
+        client = MPCClient(self.signer, self.env, transport=transport, cache=ResponseCache())
+        client.get_supported_chains()
+        client.get_supported_chains()
+        self.assertEqual(len(transport.calls), 2)
+
+    def test_concurrent_misses_share_one_request(self):
+        transport = CountingTransport(delay=0.1)
+        client = MPCClient(self.signer, self.env, transport=transport, cache=ResponseCache())
+        with ThreadPoolExecutor(8) as executor:
+            results = list(executor.map(lambda _: client.get_supported_chains(), range(8)))
+        self.assertEqual(len(transport.calls), 1)
+        self.assertTrue(all(result is results[0] for result in results))
+
+    def test_async_client(self):
+        transport = AsyncCountingTransport()
+        client = AsyncMPCClient(self.signer, self.env, transport=transport, cache=ResponseCache())
+
+        async def run():
+            await asyncio.gather(*(client.get_supported_chains() for _ in range(5)))
+            return await client.get_supported_chains()
+
+        self.assertTrue(asyncio.run(run()).success)
+        self.assertEqual(len(transport.calls), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import json
+import unittest
+
+from cobo_custody.client import json_codec
+from cobo_custody.client.api_response import RawResponse
+from cobo_custody.client.client import Client
+from cobo_custody.config import Env
+from cobo_custody.signer.local_signer import LocalSigner, generate_new_key, verify_ecdsa_signature, \
+    verify_response_signature
+from cobo_custody.transport.api_transport import ApiTransport, HttpResponse
+
+
+class SignedTransport(ApiTransport):
+    """Answers every request with ``body`` signed the way the Cobo API signs responses."""
+
+    def __init__(self, signer: LocalSigner, body: bytes, tamper: bool = False):
+        self.signer = signer
+        self.body = body
+        self.tamper = tamper
+
+    def request(self, method: str, url: str, params=None, data=None, headers: dict = None) -> HttpResponse:
+        timestamp = "1700000000000"
+        signature = self.signer.sign("%s|%s" % (self.body.decode(), timestamp))
+        body = self.body.replace(b"ETH", b"BTC") if self.tamper else self.body
+        return HttpResponse(200, {"BIZ_TIMESTAMP": timestamp, "BIZ_RESP_SIGNATURE": signature}, body)
+
+    def close(self):
+        pass
+
+
+class ResponseDecodingTest(unittest.TestCase):
+
+    def setUp(self):
+        secret, pub = generate_new_key()
+        self.cobo_signer = LocalSigner(secret)
+        self.env = Env(host="http://127.0.0.1", coboPub=pub)
+        self.signer = LocalSigner(generate_new_key()[0])
+        payload = {"success": True, "result": {"coin": "ETH", "name": "以太坊", "amount": 10 ** 30}}
+        self.body = json.dumps(payload, ensure_ascii=False).encode()
+
+    def test_bytes_verification_matches_str_verification(self):
+        content = self.body.decode()
+        signature = self.cobo_signer.sign(f"{content}|123")
+        self.assertTrue(verify_ecdsa_signature(f"{content}|123", signature, self.env.coboPub))
+        self.assertTrue(verify_response_signature(self.body, "123", signature, self.env.coboPub))
+        self.assertFalse(verify_response_signature(self.body, "124", signature, self.env.coboPub))
+
+    def test_loads_matches_json(self):
+        self.assertEqual(json_codec.loads(self.body), json.loads(self.body.decode()))
+        self.assertTrue(json_codec.has_wide_integer(b'{"a": [1,\n -12345678901234567890]}'))
+        self.assertFalse(json_codec.has_wide_integer(b'{"cobo_id": "20231212111349000140669000006194", "t": 1}'))
+
+    def test_client_decodes_verified_bytes(self):
+        client = Client(self.signer, self.env, transport=SignedTransport(self.cobo_signer, self.body))
+        response = client.get_coin_info("ETH")
+        self.assertEqual(response.result["name"], "以太坊")
+        self.assertEqual(response.result["amount"], 10 ** 30)
+
+        client = Client(self.signer, self.env, transport=SignedTransport(self.cobo_signer, self.body, tamper=True))
+        self.assertRaises(Exception, client.get_coin_info, "ETH")
+
+    def test_raw_response(self):
+        client = Client(self.signer, self.env, transport=SignedTransport(self.cobo_signer, self.body),
+                        raw_response=True)
+        response = client.get_coin_info("ETH")
+        self.assertIsInstance(response, RawResponse)
+        self.assertTrue(response.success)
+        self.assertEqual(response.content, self.body)
+
+        client = Client(self.signer, self.env, transport=SignedTransport(self.cobo_signer, self.body, tamper=True),
+                        raw_response=True)
+        self.assertRaises(Exception, client.get_coin_info, "ETH")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import asyncio
+import unittest
+
+import requests
+
+from cobo_custody.client.api_response import ApiResponse
+from cobo_custody.client.retry import RetryPolicy
+from cobo_custody.error.api_error import ApiError
+
+
+class FlakySend(object):
+
+    def __init__(self, failures: int, exception: Exception = None, response: ApiResponse = None):
+        self.failures = failures
+        self.exception = exception or requests.exceptions.ConnectionError("connection reset")
+        self.response = response
+        self.calls = 0
+
+    def __call__(self) -> ApiResponse:
+        self.calls += 1
+        if self.calls <= self.failures:
+            if self.response is not None:
+                return self.response
+            raise self.exception
+        return ApiResponse(True, {"attempt": self.calls}, None)
+
+    async def send_async(self) -> ApiResponse:
+        return self()
+
+
+class RetryPolicyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.policy = RetryPolicy(max_attempts=3, backoff_base=0.001)
+
+    def test_get_retries(self):
+        send = FlakySend(failures=2)
+        self.assertEqual(self.policy.call("GET", {}, send).result, {"attempt": 3})
+
+    def test_gives_up(self):
+        send = FlakySend(failures=3)
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            self.policy.call("GET", {}, send)
+        self.assertEqual(send.calls, 3)
+
+    def test_post_needs_request_id(self):
+        send = FlakySend(failures=1)
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            self.policy.call("POST", {"coin": "BTC"}, send)
+        self.assertEqual(send.calls, 1)
+        send = FlakySend(failures=1)
+        self.assertTrue(self.policy.call("POST", {"coin": "BTC", "request_id": "r1"}, send).success)
+
+    def test_not_retryable_exception(self):
+        send = FlakySend(failures=1, exception=ValueError("bad"))
+        with self.assertRaises(ValueError):
+            self.policy.call("GET", {}, send)
+
+    def test_error_codes(self):
+        busy = ApiResponse(False, None, ApiError(429, "too many requests", "id"))
+        self.assertFalse(self.policy.call("GET", {}, FlakySend(failures=1, response=busy)).success)
+        policy = RetryPolicy(backoff_base=0.001, retry_error_codes=[429])
+        self.assertTrue(policy.call("GET", {}, FlakySend(failures=1, response=busy)).success)
+
+    def test_backoff(self):
+        policy = RetryPolicy(backoff_base=0.5, backoff_max=3, jitter=False)
+        self.assertEqual([policy.backoff(attempt) for attempt in range(1, 6)], [0.5, 1, 2, 3, 3])
+
+    def test_call_async(self):
+        send = FlakySend(failures=2, exception=ConnectionError("reset"))
+        response = asyncio.run(self.policy.call_async("GET", {}, send.send_async))
+        self.assertEqual(response.result, {"attempt": 3})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,170 @@
+import asyncio
+import json
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from cobo_custody.client.async_client import AsyncClient
+from cobo_custody.client.client import Client
+from cobo_custody.client.single_flight import AsyncSingleFlight, SingleFlight
+from cobo_custody.config import Env
+from cobo_custody.signer.local_signer import LocalSigner, generate_new_key
+from cobo_custody.transport.api_transport import ApiTransport, AsyncApiTransport, HttpResponse
+
+PAYLOAD = json.dumps({"success": True, "result": {}}).encode()
+
+
+class SlowTransport(ApiTransport):
+
+    def __init__(self):
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def request(self, method: str, url: str, params=None, data=None, headers: dict = None) -> HttpResponse:
+        with self._lock:
+            self.calls.append((method, url, params or data))
+        time.sleep(0.1)
+        return HttpResponse(200, {}, PAYLOAD)
+
+    def close(self):
+        pass
+
+
+class AsyncSlowTransport(AsyncApiTransport):
+
+    def __init__(self):
+        self.calls = []
+
+    async def request(self, method: str, url: str, params=None, data=None, headers: dict = None) -> HttpResponse:
+        self.calls.append((method, url, params or data))
+        await asyncio.sleep(0.05)
+        return HttpResponse(200, {}, PAYLOAD)
+
+    async def close(self):
+        pass
+
+
+class SingleFlightTest(unittest.TestCase):
+
+    def setUp(self):
+        self.signer = LocalSigner(generate_new_key()[0])
+        self.env = Env(host="http://127.0.0.1", coboPub="")
+
+    def test_identical_gets_share_one_request(self):
+        transport = SlowTransport()
+        client = Client(self.signer, self.env, transport=transport)
+        tx_ids = ["a", "a", "a", "b", "b", "a"]
+        with ThreadPoolExecutor(len(tx_ids)) as executor:
+            results = list(executor.map(client.get_transaction_details, tx_ids))
+        self.assertEqual(sorted(call[2] for call in transport.calls), ["id=a", "id=b"])
+        self.assertIs(results[0], results[1])
+        self.assertTrue(all(result.success for result in results))
+
+    def test_posts_and_disabled_coalescing_are_not_shared(self):
+        for client, calls in ((Client(self.signer, self.env, transport=SlowTransport()), 4),
+                              (Client(self.signer, self.env, transport=SlowTransport(), coalesce_requests=False), 6)):
+            with ThreadPoolExecutor(6) as executor:
+                for _ in range(3):
+                    executor.submit(client.get_transaction_details, "a")
+                    executor.submit(client.withdraw, "ETH", "0x1", 1, "r1")
+            self.assertEqual(len(client.transport.calls), calls)
+
+    def test_async_identical_gets_share_one_request(self):
+        transport = AsyncSlowTransport()
+        client = AsyncClient(self.signer, self.env, transport=transport)
+
+        async def run():
+            return await asyncio.gather(*(client.get_transaction_details(tx_id) for tx_id in ("a", "a", "b", "a")))
+
+        results = asyncio.run(run())
+        self.assertEqual(len(transport.calls), 2)
+        self.assertIs(results[0], results[3])
+
+    def test_single_flight_shares_exceptions(self):
+        flight = SingleFlight()
+        started = threading.Event()
+        calls = []
+
+        def fail():
+            calls.append(1)
+            started.set()
+            time.sleep(0.05)
+            raise ValueError("boom")
+
+        def follow():
+            started.wait()
+            return flight.do("k", fail)
+
+        with ThreadPoolExecutor(2) as executor:
+            futures = [executor.submit(flight.do, "k", fail), executor.submit(follow)]
+            for future in futures:
+                self.assertRaises(ValueError, future.result)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(flight.in_flight(), 0)
+
+    def test_async_single_flight_survives_cancelled_waiter(self):
+        flight = AsyncSingleFlight()
+
+        async def load():
+            await asyncio.sleep(0.05)
+            return 42
+
+        async def run():
+            leader = asyncio.ensure_future(flight.do("k", load))
+            await asyncio.sleep(0)
+            waiter = asyncio.ensure_future(flight.do("k", load))
+            await asyncio.sleep(0)
+            waiter.cancel()
+            return await leader
+
+        self.assertEqual(asyncio.run(run()), 42)
+        self.assertEqual(flight.in_flight(), 0)
+
+    def test_async_single_flight_survives_cancelled_leader(self):
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def load():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return 42
+
+        async def run():
+            leader = asyncio.ensure_future(asyncio.wait_for(flight.do("k", load), 0.01))
+            await asyncio.sleep(0)
+            waiter = asyncio.ensure_future(flight.do("k", load))
+            with self.assertRaises(asyncio.TimeoutError):
+                await leader
+            return await waiter
+
+        self.assertEqual(asyncio.run(run()), 42)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(flight.in_flight(), 0)
+
+    def test_async_single_flight_cancels_abandoned_call(self):
+        flight = AsyncSingleFlight()
+        cancelled = []
+
+        async def load():
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled.append(1)
+                raise
+
+        async def run():
+            caller = asyncio.ensure_future(flight.do("k", load))
+            await asyncio.sleep(0)
+            caller.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await caller
+            self.assertEqual(flight.in_flight(), 0)
+            await asyncio.sleep(0)
+
+        asyncio.run(run())
+        self.assertEqual(cancelled, [1])
+
+
+if __name__ == '__main__':
+    unittest.main()
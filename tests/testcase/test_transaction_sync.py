@@ -0,0 +1,112 @@
+import json
+import os
+import tempfile
+import unittest
+from urllib.parse import parse_qs, urlparse
+
+from cobo_custody.client.client import Client
+from cobo_custody.client.mpc_client import MPCClient
+from cobo_custody.config import Env
+from cobo_custody.service.checkpoint_store import FileCheckpointStore, SQLiteCheckpointStore
+from cobo_custody.service.transaction_sync import CustodyTransactionSource, MPCTransactionSource, TransactionSync
+from cobo_custody.signer.local_signer import LocalSigner, generate_new_key
+from cobo_custody.testing.fake_server import FakeCoboServer
+from cobo_custody.transport.api_transport import ApiTransport, HttpResponse
+
+
+class MPCTransactionsTransport(ApiTransport):
+    """Serves ``list_transactions`` and ``transactions_by_cobo_ids`` from a dict of transactions."""
+
+    def __init__(self):
+        self.transactions = {}
+        self.paths = []
+
+    def add(self, cobo_id: str, created: int, status: int):
+        self.transactions[cobo_id] = {"cobo_id": cobo_id, "created_timestamp": created, "status": status}
+
+    def request(self, method: str, url: str, params=None, data=None, headers: dict = None) -> HttpResponse:
+        path = urlparse(url).path
+        query = {key: values[0] for key, values in parse_qs(params).items()}
+        self.paths.append(path)
+        if path.endswith("/transactions_by_cobo_ids/"):
+            ids = query["cobo_ids"].split(",")
+            records = [self.transactions[cobo_id] for cobo_id in ids if cobo_id in self.transactions]
+        else:
+            start = int(query.get("start_time", 0))
+            records = sorted((record for record in self.transactions.values() if record["created_timestamp"] >= start),
+                             key=lambda record: record["created_timestamp"])[:int(query["limit"])]
+        payload = {"success": True, "result": {"transactions": [dict(record) for record in records]}}
+        return HttpResponse(200, {}, json.dumps(payload).encode())
+
+    def close(self):
+        pass
+
+
+class TransactionSyncTest(unittest.TestCase):
+
+    def setUp(self):
+        self.transport = MPCTransactionsTransport()
+        self.client = MPCClient(LocalSigner(generate_new_key()[0]), Env(host="http://127.0.0.1", coboPub=""),
+                                transport=self.transport)
+        self.source = MPCTransactionSource(self.client, limit=2)
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def sync(self, store) -> TransactionSync:
+        return TransactionSync(self.source, store, "mpc", batch_size=2)
+
+    def check_resume(self, store_factory):
+        for index, status in enumerate((501, 501, 101)):
+            self.transport.add(f"c{index}", 1000 + index, status)
+        emitted = [(record["cobo_id"], record["status"]) for record in self.sync(store_factory()).changes()]
+        self.assertEqual(emitted, [("c0", 501), ("c1", 501), ("c2", 101)])
+
+        # nothing changed: the boundary record comes back and is deduplicated
+        self.assertEqual(list(self.sync(store_factory()).changes()), [])
+
+        self.transport.transactions["c2"]["status"] = 501
+        self.transport.add("c3", 1003, 501)
+        self.transport.paths.clear()
+        emitted = [(record["cobo_id"], record["status"]) for record in self.sync(store_factory()).changes()]
+        self.assertEqual(emitted, [("c2", 501), ("c3", 501)])
+        self.assertIn("/v1/custody/mpc/transactions_by_cobo_ids/", self.transport.paths)
+        self.assertEqual(store_factory().pending_ids("mpc"), [])
+
+    def test_sqlite_store(self):
+        path = os.path.join(self.tmp.name, "sync.db")
+        self.check_resume(lambda: SQLiteCheckpointStore(path))
+
+    def test_file_store(self):
+        path = os.path.join(self.tmp.name, "sync.json")
+        self.check_resume(lambda: FileCheckpointStore(path))
+
+    def test_unconsumed_records_are_emitted_again(self):
+        for index in range(5):
+            self.transport.add(f"c{index}", 1000 + index, 501)
+        store = SQLiteCheckpointStore(":memory:")
+        changes = self.sync(store).changes()
+        self.assertEqual([next(changes)["cobo_id"] for _ in range(3)], ["c0", "c1", "c2"])
+        changes.close()
+        self.assertEqual([record["cobo_id"] for record in self.sync(store).changes()], ["c2", "c3", "c4"])
+
+    def test_custody_pending_refresh(self):
+        server = FakeCoboServer()
+        for index in range(6):
+            server.custody_deposit("BTC", 100, confirmed=False, record_id=str(10 + index))
+        client = Client(LocalSigner(generate_new_key()[0]), server.env, transport=server.transport())
+        sync = TransactionSync(CustodyTransactionSource(client, coin="BTC"), SQLiteCheckpointStore(":memory:"),
+                               "custody")
+        self.assertEqual(len(list(sync.changes())), 6)
+
+        server.settle_custody(server.custody_transactions["11"])
+        server.settle_custody(server.custody_transactions["14"], success=False)
+        emitted = [(record["id"], record["status"]) for record in sync.changes()]
+        self.assertEqual(sorted(emitted), [("11", "success"), ("14", "failed")])
+        # only the two records that left the pending list were looked up one by one
+        self.assertEqual(server.calls["/v1/custody/transaction/"], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
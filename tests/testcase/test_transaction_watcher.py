@@ -0,0 +1,142 @@
+import asyncio
+import time
+import unittest
+
+from cobo_custody.client.client import Client
+from cobo_custody.client.mpc_client import MPCClient
+from cobo_custody.service.transaction_watcher import CustodyWatchSource, MPCWatchSource, TransactionWatcher
+from cobo_custody.signer.local_signer import LocalSigner, generate_new_key
+from cobo_custody.testing.fake_server import FakeCoboServer
+
+TO_ADDRESS = "0x00000000000000000000000000000000000000aa"
+MPC_PATH = "/v1/custody/mpc/transactions_by_request_ids/"
+CUSTODY_PATH = "/v1/custody/transactions_by_request_ids/"
+
+
+class TransactionWatcherTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = FakeCoboServer()
+        self.wallet = self.server.mpc
+        self.source_address = self.wallet.add_address("GETH")["address"]
+        self.wallet.credit("GETH", self.source_address, 10 ** 18)
+        self.signer = LocalSigner(generate_new_key()[0])
+        self.mpc_client = MPCClient(self.signer, self.server.env, transport=self.server.transport())
+        self.watcher = TransactionWatcher(MPCWatchSource(self.mpc_client), batch_size=10, fast_interval=0)
+        self.addCleanup(self.watcher.stop)
+
+    def transfer(self, request_id: str):
+        self.wallet.create_transaction("GETH", request_id, self.source_address, TO_ADDRESS, 1)
+
+    def test_requests_are_polled_together(self):
+        for i in range(25):
+            self.transfer(f"tx-{i}")
+        futures = [self.watcher.watch(f"tx-{i}") for i in range(25)]
+        self.assertEqual(self.watcher.poll_once(), 25)
+        self.assertEqual(self.server.calls[MPC_PATH], 3)
+        self.assertEqual(self.watcher.pending, 25)
+
+        self.server.settle()
+        self.assertEqual(self.watcher.poll_once(), 25)
+        self.assertEqual(self.watcher.pending, 0)
+        self.assertEqual({future.result()["status"] for future in futures}, {501})
+
+    def test_callbacks_on_status_change(self):
+        changes, seen = [], []
+        self.watcher.on_change(lambda request_id, record, previous: seen.append(request_id))
+        self.transfer("tx-0")
+        self.transfer("tx-1")
+        self.watcher.watch("tx-0", lambda request_id, record, previous: changes.append((previous, record["status"])))
+        failed = self.watcher.watch("tx-1")
+
+        self.watcher.poll_once()
+        self.assertEqual(self.watcher.poll_once(), 0)
+        self.server.settle("tx-0")
+        self.server.settle("tx-1", success=False)
+        self.watcher.poll_once()
+        self.assertEqual(changes, [(None, 101), (101, 501)])
+        self.assertEqual(seen, ["tx-0", "tx-1", "tx-0", "tx-1"])
+        self.assertEqual(failed.result()["status"], 502)
+
+    def test_failing_listener(self):
+        def fail(request_id, record, previous):
+            raise RuntimeError("listener bug")
+
+        self.watcher.on_change(fail)
+        self.transfer("tx-0")
+        self.server.settle("tx-0")
+        future = self.watcher.watch("tx-0", fail)
+        with self.assertLogs("cobo_custody.service.transaction_watcher", "ERROR") as logs:
+            self.assertEqual(self.watcher.poll_once(), 1)
+        self.assertEqual(len(logs.records), 2)
+        self.assertEqual(future.result()["status"], 501)
+        self.assertEqual(self.watcher.pending, 0)
+
+    def test_due_soon_requests_ride_along(self):
+        watcher = TransactionWatcher(MPCWatchSource(self.mpc_client), fast_interval=0.05)
+        for i in range(2):
+            self.transfer(f"tx-{i}")
+            watcher.watch(f"tx-{i}")
+            time.sleep(0.03)
+        watcher.poll_once()
+        self.assertEqual(self.server.calls[MPC_PATH], 1)
+        self.assertEqual(watcher.poll_once(), 0)
+        self.assertEqual(self.server.calls[MPC_PATH], 1)
+
+    def test_adaptive_interval(self):
+        watcher = TransactionWatcher(MPCWatchSource(self.mpc_client), fast_interval=2, slow_interval=60)
+        self.assertEqual(watcher.interval(0), 2)
+        self.assertEqual(watcher.interval(100), 10)
+        self.assertEqual(watcher.interval(3600), 60)
+
+        self.transfer("tx-0")
+        watcher.watch("tx-0")
+        self.assertEqual(watcher.poll_once(), 0)
+        self.assertEqual(self.server.calls[MPC_PATH], 0)
+        self.assertAlmostEqual(watcher.next_due() - time.monotonic(), 2, delta=0.5)
+
+    def test_unknown_and_expired_requests(self):
+        watcher = TransactionWatcher(MPCWatchSource(self.mpc_client), fast_interval=0, max_age=0.02)
+        future = watcher.watch("never-created")
+        watcher.poll_once()
+        self.assertEqual(watcher.pending, 1)
+        time.sleep(0.03)
+        watcher.poll_once()
+        self.assertEqual(watcher.pending, 0)
+        self.assertIsInstance(future.exception(), TimeoutError)
+
+    def test_fetch_errors_are_retried(self):
+        self.transfer("tx-0")
+        self.server.settle("tx-0")
+        future = self.watcher.watch("tx-0")
+        self.server.fail_next(MPC_PATH, status_code=500)
+        with self.assertLogs("cobo_custody.service.transaction_watcher", "ERROR"):
+            self.watcher.poll_once()
+        self.assertFalse(future.done())
+        self.watcher.poll_once()
+        self.assertEqual(future.result()["status"], 501)
+
+    def test_custody_withdrawals(self):
+        self.server.custody_withdraw("GETH", 1, TO_ADDRESS, "withdraw-0", confirmed=False)
+        client = Client(self.signer, self.server.env, transport=self.server.transport())
+        watcher = TransactionWatcher(CustodyWatchSource(client), fast_interval=0)
+        future = watcher.watch("withdraw-0")
+        watcher.poll_once()
+        self.assertFalse(future.done())
+        self.server.settle("withdraw-0", wallet="custody")
+        watcher.poll_once()
+        self.assertEqual(future.result()["status"], "success")
+        self.assertEqual(self.server.calls[CUSTODY_PATH], 2)
+
+    def test_background_thread_and_asyncio(self):
+        self.transfer("tx-0")
+        self.watcher.fast_interval = 0.01
+        self.watcher.start()
+
+        async def wait():
+            return await asyncio.wait_for(asyncio.wrap_future(self.watcher.watch("tx-0")), 5)
+
+        self.server.settle("tx-0")
+        self.assertEqual(asyncio.run(wait())["status"], 501)
+        self.watcher.stop()
+        self.assertEqual(self.watcher.pending, 0)
@@ -3,7 +3,8 @@ import unittest
 import time
 
 from cobo_custody.client.web3_client import Web3Client
-from cobo_custody.signer.local_signer import LocalSigner
+from cobo_custody.signer.local_signer import LocalSigner, generate_new_key
+from cobo_custody.testing.fake_server import FakeCoboServer
 
 
 class Web3ClientTest(unittest.TestCase):
@@ -11,12 +12,32 @@ class Web3ClientTest(unittest.TestCase):
     web3_api_secret = ""
     env = None
     test_data = ""
+    transport = None
 
     @classmethod
     def setUpClass(cls):
+        if cls.env is None:
+            cls.use_fake_server()
         cls.web3_client = Web3Client(signer=LocalSigner(cls.web3_api_secret),
                                      env=cls.env,
-                                     debug=False)
+                                     debug=False,
+                                     transport=cls.transport)
+
+    @classmethod
+    def use_fake_server(cls):
+        # without an env the tests run offline against a fake server seeded with the data they expect
+        server = FakeCoboServer()
+        address = "0xd2176409a1ac767824921e45b7ee300745cb1e3f"
+        server.web3.add_address("GETH", "0xd387292d5be73c8b9d6d3a4dcdd49e00edf75b6a")
+        server.web3.add_address("ETH", address)
+        server.web3.credit("ETH", address, 10 ** 18)
+        server.web3.create_transaction("ETH", "1665303298935", address, address, 1)
+        server.web3_contract({"chain_code": "GETH", "request_id": "1664239624441", "wallet_addr": address,
+                              "contract_addr": "0xa4e8c3ec456107ea67d3075bf9e3df3a75823db0",
+                              "method_id": "0xa9059cbb"})
+        cls.web3_api_secret = generate_new_key()[0]
+        cls.env = server.env
+        cls.transport = server.transport()
 
     def test_get_web3_supported_chains(self):
         response = self.web3_client.get_web3_supported_chains()